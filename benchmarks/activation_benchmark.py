@@ -0,0 +1,71 @@
+"""
+Benchmark of updating the entities of a populated level on each simulation step: every entity (one group update)
+versus only the ones near the camera with the activation system, ticking the sleeping ones at a reduced rate or
+freezing them. Run it with:
+
+    python -m benchmarks.activation_benchmark
+"""
+import random
+import timeit
+
+from pygame.rect import Rect
+from pygame.sprite import Group
+from pygame.sprite import Sprite
+
+from src.activation import ActivationSystem
+from src.settings import RAW_DISPLAY_SIZE
+from src.settings import TILE_SIZE
+
+ENTITIES_COUNTS = [100, 1_000, 10_000]
+STEPS = 120
+STEP_DT = 1 / 60
+LEVEL_SIZE = (2000 * TILE_SIZE, 60 * TILE_SIZE)
+
+
+class Wanderer(Sprite):
+    """
+    Entity which paces back and forth, standing for an NPC's per step logic.
+    """
+
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__()
+
+        self.rect = Rect(x, y, TILE_SIZE, TILE_SIZE)
+        self.elapsed = 0.0
+
+    def update(self, *args, **kwargs) -> None:
+        self.elapsed += args[-1]
+        self.rect.x += 1 if int(self.elapsed) % 2 else -1
+
+
+def build_entities(entities_count: int, seed: int = 42):
+    random.seed(seed)
+
+    return [Wanderer(random.randrange(LEVEL_SIZE[0]), random.randrange(LEVEL_SIZE[1])) for _ in range(entities_count)]
+
+
+def main():
+    view_rect = Rect((LEVEL_SIZE[0] // 2, LEVEL_SIZE[1] // 2), RAW_DISPLAY_SIZE)
+    print(f"{'entities':>8} | {'all (ms)':>10} | {'reduced rate (ms)':>17} | {'frozen (ms)':>11}")
+
+    for entities_count in ENTITIES_COUNTS:
+        group = Group(*build_entities(entities_count))
+        all_time = timeit.timeit(lambda: group.update(STEP_DT), number=STEPS) / STEPS
+        activation_times = []
+
+        for sleep_tick_interval in (8, 0):
+            activation = ActivationSystem((TILE_SIZE, TILE_SIZE), view_rect, sleep_tick_interval=sleep_tick_interval)
+
+            for entity in build_entities(entities_count):
+                activation.add(entity)
+
+            activation_times.append(timeit.timeit(lambda: activation.update(view_rect, STEP_DT), number=STEPS) / STEPS)
+
+        print(
+            f"{entities_count:>8,} | {all_time * 1000:>10.3f} | {activation_times[0] * 1000:>17.3f} | "
+            f"{activation_times[1] * 1000:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark of the startup time of loading animation repositories: parsing the spritesheets (cold path) against
+reading their compiled packs (cached path). Run it with:
+
+    python -m benchmarks.animation_packs_benchmark
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+from src.animation_packs import load_animation_repository
+from src.animations import SpriteSheetParser
+
+SPRITESHEETS = ["hero"] * 36  # we ship dozens of spritesheets
+ROUNDS = 10
+
+
+def load_parsing() -> None:
+    for spritesheet_name in SPRITESHEETS:
+        spritesheet_parser = SpriteSheetParser()
+        spritesheet_parser.load_spritesheet(spritesheet_name)
+        spritesheet_parser.build_animation_repository()
+        spritesheet_parser.release_spritesheet()
+
+
+def load_packs(cache_dir: Path) -> None:
+    for spritesheet_name in SPRITESHEETS:
+        load_animation_repository(spritesheet_name, cache_dir=cache_dir)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_packs(Path(cache_dir))  # compiles the packs
+
+        cold_time = timeit.timeit(load_parsing, number=ROUNDS) / ROUNDS
+        cached_time = timeit.timeit(lambda: load_packs(Path(cache_dir)), number=ROUNDS) / ROUNDS
+
+    print(f"spritesheets: {len(SPRITESHEETS)}")
+    print(f"cold path (png + json parsing): {cold_time * 1000:.2f} ms")
+    print(f"cached path (compiled packs):   {cached_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark of the per frame cost of advancing many animators: one time based Animator per entity against a single
+AnimatorPool update. Run it with:
+
+    python -m benchmarks.animator_pool_benchmark
+"""
+import timeit
+
+from src.animations import Animator
+from src.animations import AnimatorPool
+from src.animations import SpriteSheetParser
+
+ANIMATORS_COUNTS = [100, 1_000, 5_000, 20_000]
+FRAMES = 100
+DT = 1 / 60
+
+
+def main():
+    spritesheet_parser = SpriteSheetParser()
+    spritesheet_parser.load_spritesheet("hero")
+    animation_repository = spritesheet_parser.build_animation_repository()
+    spritesheet_parser.release_spritesheet()
+
+    print(f"{'animators':>10} | {'Animator (ms/frame)':>20} | {'AnimatorPool (ms/frame)':>24}")
+
+    for count in ANIMATORS_COUNTS:
+        animators = [Animator("run", animation_repository, time_based=True) for _ in range(count)]
+        pool = AnimatorPool(animation_repository)
+
+        for _ in range(count):
+            pool.add("run")
+
+        def update_animators():
+            for animator in animators:
+                animator.update(DT)
+
+        animators_time = timeit.timeit(update_animators, number=FRAMES) / FRAMES
+        pool_time = timeit.timeit(lambda: pool.update(DT), number=FRAMES) / FRAMES
+
+        print(f"{count:>10} | {animators_time * 1000:>20.3f} | {pool_time * 1000:>24.3f}")
+
+
+if __name__ == "__main__":
+    main()
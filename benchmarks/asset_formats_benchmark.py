@@ -0,0 +1,60 @@
+"""
+Benchmark of the blit throughput of the game's images before and after converting them with the asset registry:
+map tiles (pytmx's own conversion vs the registry's) and hero frames (raw RGBA vs converted). Run it with:
+
+    python -m benchmarks.asset_formats_benchmark
+"""
+import os
+import timeit
+from typing import List
+
+import pygame
+import pytmx
+from pygame.surface import Surface
+
+from src.assets import AssetRegistry
+from src.assets import convert_for_display
+from src.settings import RAW_DISPLAY_SIZE
+from src.settings import ROOT_DIR
+from src.settings import WINDOW_SIZE
+
+BLITS = 20_000
+MAP_PATH = ROOT_DIR.joinpath("assets/maps/tiled-level-01.tmx")
+HERO_PATH = ROOT_DIR.joinpath("assets/spritesheets/hero.png")
+
+
+def blits_per_second(images: List[Surface], raw_display: Surface) -> float:
+    blits = [(images[i % len(images)], (i * 7 % 280, i * 13 % 180)) for i in range(BLITS)]
+
+    return BLITS / timeit.timeit(lambda: raw_display.blits(blits, doreturn=False), number=5) * 5
+
+
+def main():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    pygame.display.set_mode(WINDOW_SIZE, 0, 32)
+    raw_display = pygame.Surface(RAW_DISPLAY_SIZE).convert()
+
+    pytmx_tiles = [image for image in pytmx.load_pygame(str(MAP_PATH), pixelalpha=True).images if image is not None]
+    loader_map = pytmx.TiledMap(str(MAP_PATH), image_loader=AssetRegistry().tile_image_loader, pixelalpha=True)
+    loader_tiles = [image for image in loader_map.images if image is not None]
+
+    hero = pygame.image.load(HERO_PATH)
+    raw_frames = [
+        pygame.image.frombuffer(pygame.image.tobytes(hero.subsurface((x, 0, 16, 16)), "RGBA"), (16, 16), "RGBA")
+        for x in range(0, hero.get_width() - 15, 16)
+    ]
+    converted_frames = [convert_for_display(frame) for frame in raw_frames]
+
+    print(f"{'images':>24} | {'before (blits/s)':>16} | {'after (blits/s)':>16}")
+
+    for name, before, after in [
+        ("map tiles", pytmx_tiles, loader_tiles),
+        ("hero frames", raw_frames, converted_frames),
+    ]:
+        before_speed, after_speed = blits_per_second(before, raw_display), blits_per_second(after, raw_display)
+        print(f"{name:>24} | {before_speed:>16,.0f} | {after_speed:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark of the memory held by the tiles of levels sharing the same tileset: each level with its own copies
+(pytmx's loader) vs shared through the asset registry. Run it with:
+
+    python -m benchmarks.asset_registry_benchmark
+"""
+import os
+import timeit
+
+import pygame
+import pytmx
+
+from src.assets import ASSET_REGISTRY
+from src.assets import surface_memory_size
+from src.maps import TiledMap
+from src.settings import ROOT_DIR
+from src.settings import WINDOW_SIZE
+
+LEVELS = 8  # levels built from the same tileset
+MAP_PATH = ROOT_DIR.joinpath("assets/maps/tiled-level-01.tmx")
+
+
+def main():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    pygame.display.set_mode(WINDOW_SIZE, 0, 32)
+
+    def load_copies():
+        return [pytmx.load_pygame(str(MAP_PATH), pixelalpha=True) for _ in range(LEVELS)]
+
+    def load_shared():
+        return [TiledMap(MAP_PATH.name) for _ in range(LEVELS)]
+
+    copies_bytes = sum(surface_memory_size(image) for tmx_map in load_copies() for image in tmx_map.images if image)
+    shared_maps = load_shared()
+    shared_bytes = ASSET_REGISTRY.stats().bytes_referenced  # the unreferenced tileset may be evicted
+    copies_seconds = timeit.timeit(load_copies, number=3) / 3
+    shared_seconds = timeit.timeit(lambda: [tiled_map.release_assets() for tiled_map in load_shared()], number=3) / 3
+
+    for tiled_map in shared_maps:
+        tiled_map.release_assets()
+
+    print(f"{'tiles of ' + str(LEVELS) + ' levels':>24} | {'bytes':>12} | {'load (ms)':>10}")
+    print(f"{'own copies':>24} | {copies_bytes:>12,} | {copies_seconds * 1000:>10.1f}")
+    print(f"{'asset registry':>24} | {shared_bytes:>12,} | {shared_seconds * 1000:>10.1f}")
+    print(f"\nregistry: {ASSET_REGISTRY.stats()}")
+
+
+if __name__ == "__main__":
+    main()
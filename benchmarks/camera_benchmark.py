@@ -0,0 +1,54 @@
+"""
+Benchmark of the camera's world to screen transform for many rects: a new rect per apply_offset call, moving the
+rects in place and the bulk transform of an array of positions. Run it with:
+
+    python -m benchmarks.camera_benchmark
+"""
+import random
+import timeit
+
+import numpy as np
+from pygame.rect import Rect
+
+from src.camera import Camera
+from src.settings import TILE_SIZE
+
+RECTS_COUNT = 10_000
+REPEATS = 100
+LEVEL_SIZE = (480 * TILE_SIZE, 60 * TILE_SIZE)
+
+
+def main():
+    random.seed(42)
+    camera = Camera(*LEVEL_SIZE)
+    camera.update(Rect(LEVEL_SIZE[0] // 2, LEVEL_SIZE[1] // 2, TILE_SIZE, TILE_SIZE))
+
+    rects = [
+        Rect(random.randrange(LEVEL_SIZE[0]), random.randrange(LEVEL_SIZE[1]), TILE_SIZE, TILE_SIZE)
+        for _ in range(RECTS_COUNT)
+    ]
+    positions = np.array([rect.topleft for rect in rects])
+    screen_positions = np.empty_like(positions)
+
+    def apply_offset():
+        for rect in rects:
+            camera.apply_offset(rect)
+
+    def apply_offset_ip():
+        for rect in rects:
+            camera.apply_offset_ip(rect)
+
+    print(f"{RECTS_COUNT} rects")
+    print(f"{'transform':>24} | {'time (ms)':>10}")
+
+    for name, transform in [
+        ("apply_offset", apply_offset),
+        ("apply_offset_ip", apply_offset_ip),
+        ("world_to_screen", lambda: camera.world_to_screen(positions, out=screen_positions)),
+    ]:
+        transform_time = timeit.timeit(transform, number=REPEATS) / REPEATS
+        print(f"{name:>24} | {transform_time * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark of drawing many sprites on a large map: one blit per sprite (with a rect per sprite) versus the camera
+group which culls the off screen sprites and draws the visible ones with a single blits call. Run it with:
+
+    python -m benchmarks.camera_group_benchmark
+"""
+import random
+import timeit
+
+import pygame
+from pygame.sprite import Group
+from pygame.sprite import Sprite
+
+from src.rendering import CameraGroup
+from src.settings import RAW_DISPLAY_SIZE
+from src.settings import TILE_SIZE
+
+SPRITES_COUNTS = [100, 1_000, 5_000]
+FRAMES = 60
+LEVEL_SIZE = (480 * TILE_SIZE, 60 * TILE_SIZE)
+
+
+def build_sprites(sprites_count: int, seed: int = 42):
+    random.seed(seed)
+    image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    sprites = []
+
+    for _ in range(sprites_count):
+        sprite = Sprite()
+        sprite.image = image
+        sprite.rect = image.get_rect(topleft=(random.randrange(LEVEL_SIZE[0]), random.randrange(LEVEL_SIZE[1])))
+        sprites.append(sprite)
+
+    return sprites
+
+
+def main():
+    raw_display = pygame.Surface(RAW_DISPLAY_SIZE)
+    offset = (-LEVEL_SIZE[0] // 2, -LEVEL_SIZE[1] // 2)
+    print(f"{'sprites':>8} | {'blit per sprite (ms)':>20} | {'CameraGroup (ms)':>16}")
+
+    for sprites_count in SPRITES_COUNTS:
+        sprites = build_sprites(sprites_count)
+        group, camera_group = Group(*sprites), CameraGroup(*sprites)
+
+        def blit_per_sprite():
+            for sprite in group:
+                raw_display.blit(sprite.image, sprite.rect.move(offset))
+
+        blit_time = timeit.timeit(blit_per_sprite, number=FRAMES) / FRAMES
+        camera_group_time = timeit.timeit(lambda: camera_group.render_on(raw_display, offset), number=FRAMES) / FRAMES
+
+        print(f"{sprites_count:>8} | {blit_time * 1000:>20.3f} | {camera_group_time * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark of the per frame collision cost of CollidablesGroup against pygame's linear spritecollide.
+
+Collidables are spread over a level whose area grows with their count (same density as a tile-painted level), so
+the number of collidables near the player is kept constant. Run it with:
+
+    python -m benchmarks.collidables_benchmark
+"""
+import random
+import timeit
+
+from pygame.rect import Rect
+from pygame.sprite import Group
+from pygame.sprite import Sprite
+from pygame.sprite import spritecollide
+
+from src.collidables import Collidable
+from src.collidables import CollidablesGroup
+from src.settings import TILE_SIZE
+
+COLLIDABLES_COUNTS = [100, 1_000, 10_000, 100_000]
+COLLIDABLES_PER_ROW = 100  # level width in collidables (tiles)
+QUERIES = 1_000
+
+
+def build_level(count: int, seed: int = 42):
+    random.seed(seed)
+    grid, linear = CollidablesGroup(), Group()
+
+    for i in range(count):
+        x = (i % COLLIDABLES_PER_ROW) * TILE_SIZE * 2
+        y = (i // COLLIDABLES_PER_ROW) * TILE_SIZE * 2
+        Collidable(x, y, TILE_SIZE * random.randint(1, 2), TILE_SIZE, grid, linear)
+
+    return grid, linear
+
+
+def main():
+    player = Sprite()
+    player.rect = Rect(TILE_SIZE * 10 + 4, TILE_SIZE * 2 + 4, 16, 16)
+
+    print(f"{'collidables':>12} | {'grid (us/frame)':>16} | {'spritecollide (us/frame)':>25}")
+
+    for count in COLLIDABLES_COUNTS:
+        grid, linear = build_level(count)
+
+        # two queries per frame: one per axis (just like Player._move)
+        grid_time = timeit.timeit(lambda: (grid.collide(player.rect), grid.collide(player.rect)), number=QUERIES)
+        linear_time = timeit.timeit(
+            lambda: (spritecollide(player, linear, False), spritecollide(player, linear, False)),
+            number=QUERIES if count <= 10_000 else QUERIES // 10,
+        )
+        linear_time *= 1 if count <= 10_000 else 10
+
+        print(f"{count:>12} | {grid_time / QUERIES * 1e6:>16.2f} | {linear_time / QUERIES * 1e6:>25.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of the per step cost of the physics world for many bodies moving on a level. Run it with:
+
+    python -m benchmarks.physics_benchmark
+"""
+import random
+import timeit
+
+from src.collidables import Collidable
+from src.collidables import CollidablesGroup
+from src.physics import World
+from src.settings import SIMULATION_TICK_RATE
+from src.settings import TILE_SIZE
+
+BODIES_COUNTS = [10, 100, 500, 1_000]
+STEPS = 120
+LEVEL_WIDTH = 480 * TILE_SIZE
+
+
+def build_world(bodies_count: int, seed: int = 42) -> World:
+    random.seed(seed)
+    collidables = CollidablesGroup()
+    Collidable(0, 50 * TILE_SIZE, LEVEL_WIDTH, TILE_SIZE, collidables)  # floor
+
+    for x in range(0, LEVEL_WIDTH, 8 * TILE_SIZE):
+        Collidable(x, random.randint(10, 45) * TILE_SIZE, 3 * TILE_SIZE, TILE_SIZE, collidables)  # platforms
+
+    world = World(collidables)
+
+    for _ in range(bodies_count):
+        body = world.add_body(random.uniform(0, LEVEL_WIDTH), random.uniform(0, 40 * TILE_SIZE), 16, 16)
+        body.velocity_x = random.choice([-180, 180])
+
+    return world
+
+
+def main():
+    dt = 1 / SIMULATION_TICK_RATE
+    print(f"{'bodies':>8} | {'World.step (ms)':>16}")
+
+    for bodies_count in BODIES_COUNTS:
+        world = build_world(bodies_count)
+        step_time = timeit.timeit(lambda: world.step(dt), number=STEPS) / STEPS
+
+        print(f"{bodies_count:>8} | {step_time * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
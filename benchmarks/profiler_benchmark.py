@@ -0,0 +1,37 @@
+"""
+Benchmark of the overhead of the profiler on a tiny function: not profiled, profiled with the profiler disabled and
+profiled with the profiler enabled. Run it with:
+
+    python -m benchmarks.profiler_benchmark
+"""
+import timeit
+
+from src.profiler import PROFILER
+from src.profiler import profiled
+
+CALLS = 1_000_000
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+profiled_add = profiled("add")(add)
+
+
+def main():
+    print(f"{'function':>24} | {'ns per call':>12}")
+
+    for name, function in [("not profiled", add), ("profiled (disabled)", profiled_add)]:
+        call_time = timeit.timeit(lambda: function(1, 2), number=CALLS) / CALLS
+        print(f"{name:>24} | {call_time * 1e9:>12.1f}")
+
+    PROFILER.enable()
+    call_time = timeit.timeit(lambda: profiled_add(1, 2), number=CALLS) / CALLS
+    PROFILER.disable()
+
+    print(f"{'profiled (enabled)':>24} | {call_time * 1e9:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
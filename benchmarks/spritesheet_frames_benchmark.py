@@ -0,0 +1,78 @@
+"""
+Benchmark of the resident memory used by the animation repository of a large spritesheet when its frames are copied
+against when they are subsurface views of the spritesheet. Each mode runs in its own process so their resident
+memory (read from /proc, hence Linux only) doesn't mix. Run it with:
+
+    python -m benchmarks.spritesheet_frames_benchmark
+"""
+import json
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+import pygame
+
+from src.animations import SpriteSheetParser
+
+SHEET_SIZE = 4096  # px (square)
+FRAME_SIZE = 64  # px (square)
+
+
+def write_large_spritesheet(spritesheet_dir: Path) -> None:
+    frames_per_row = SHEET_SIZE // FRAME_SIZE
+    total_frames = frames_per_row * frames_per_row
+    frames = {
+        f"large-{i}": {
+            "frame": {
+                "x": i % frames_per_row * FRAME_SIZE,
+                "y": i // frames_per_row * FRAME_SIZE,
+                "w": FRAME_SIZE,
+                "h": FRAME_SIZE,
+            },
+            "duration": 100,
+        }
+        for i in range(total_frames)
+    }
+    meta = {"frameTags": [{"name": "all", "from": 0, "to": total_frames - 1, "direction": "forward"}]}
+
+    sheet = pygame.Surface((SHEET_SIZE, SHEET_SIZE), pygame.SRCALPHA)
+    sheet.fill((200, 100, 50, 255))
+    pygame.image.save(sheet, str(spritesheet_dir.joinpath("large.png")))
+    spritesheet_dir.joinpath("large.json").write_text(json.dumps({"frames": frames, "meta": meta}))
+
+
+def resident_memory() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * 4096  # resident pages
+
+
+def measure(spritesheet_dir: str, copy_frames: bool, results) -> None:
+    spritesheet_parser = SpriteSheetParser()
+    spritesheet_parser.load_spritesheet("large", spritesheet_dir)
+
+    before = resident_memory()
+    animation_repository = spritesheet_parser.build_animation_repository(copy_frames=copy_frames)
+    results[copy_frames] = resident_memory() - before
+
+    del animation_repository
+    spritesheet_parser.release_spritesheet()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as spritesheet_dir:
+        write_large_spritesheet(Path(spritesheet_dir))
+        results = multiprocessing.Manager().dict()
+
+        for copy_frames in (True, False):
+            process = multiprocessing.Process(target=measure, args=(spritesheet_dir, copy_frames, results))
+            process.start()
+            process.join()
+
+    print(f"spritesheet: {SHEET_SIZE}x{SHEET_SIZE} px, frames: {FRAME_SIZE}x{FRAME_SIZE} px")
+    print(f"copied frames:  {results[True] / 2 ** 20:.1f} MiB")
+    print(f"subsurfaces:    {results[False] / 2 ** 20:.1f} MiB")
+    print(f"difference:     {(results[True] - results[False]) / 2 ** 20:.1f} MiB (flipped images are copies in both)")
+
+
+if __name__ == "__main__":
+    main()
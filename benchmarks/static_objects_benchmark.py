@@ -0,0 +1,90 @@
+"""
+Benchmark of levels with many placed objects: one sprite per object (all of them in the camera group) versus static
+objects stored as records and promoted to sprites only near the camera. Compares the memory held by the objects and
+the cost of a frame (promotions plus the camera group draws) while the camera scrolls. Run it with:
+
+    python -m benchmarks.static_objects_benchmark
+"""
+import random
+import timeit
+import tracemalloc
+
+import pygame
+from pygame.rect import Rect
+
+from src.entities import StaticObjects
+from src.entities import StaticSprite
+from src.rendering import CameraGroup
+from src.settings import RAW_DISPLAY_SIZE
+from src.settings import TILE_SIZE
+
+OBJECTS_COUNTS = [1_000, 10_000, 50_000]
+FRAMES = 120
+LEVEL_SIZE = (2000 * TILE_SIZE, 60 * TILE_SIZE)
+
+
+def object_positions(objects_count: int, seed: int = 42):
+    random.seed(seed)
+
+    return [(random.randrange(LEVEL_SIZE[0]), random.randrange(LEVEL_SIZE[1])) for _ in range(objects_count)]
+
+
+def traced_memory(build) -> int:
+    tracemalloc.start()
+    built = build()  # noqa: F841 (kept alive while measuring)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size
+
+
+def main():
+    raw_display = pygame.Surface(RAW_DISPLAY_SIZE)
+    image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    view_rect = Rect((0, LEVEL_SIZE[1] // 2), RAW_DISPLAY_SIZE)
+    print(
+        f"{'objects':>8} | {'sprites (KiB)':>13} | {'records (KiB)':>13} | {'sprites (ms)':>12} | {'records (ms)':>12}"
+    )
+
+    for objects_count in OBJECTS_COUNTS:
+        positions = object_positions(objects_count)
+
+        def build_sprites():
+            group = CameraGroup()
+
+            for index, (x, y) in enumerate(positions):
+                StaticSprite(index, "decoration", Rect(x, y, TILE_SIZE, TILE_SIZE), image, group)
+
+            return group
+
+        def build_records():
+            group = CameraGroup()
+            static_objects = StaticObjects(group)
+
+            for x, y in positions:
+                static_objects.add("decoration", x, y, TILE_SIZE, TILE_SIZE, image)
+
+            return group, static_objects
+
+        sprites_memory, records_memory = traced_memory(build_sprites), traced_memory(build_records)
+        sprites_group, (records_group, static_objects) = build_sprites(), build_records()
+
+        def sprites_frame(frame: int):
+            offset = (-frame * 4, -view_rect.y)
+            sprites_group.render_on(raw_display, offset)
+
+        def records_frame(frame: int):
+            offset = (-frame * 4, -view_rect.y)
+            static_objects.update(view_rect.move(frame * 4, 0))
+            records_group.render_on(raw_display, offset)
+
+        sprites_time = timeit.timeit(lambda: [sprites_frame(frame) for frame in range(FRAMES)], number=1) / FRAMES
+        records_time = timeit.timeit(lambda: [records_frame(frame) for frame in range(FRAMES)], number=1) / FRAMES
+        print(
+            f"{objects_count:>8,} | {sprites_memory / 1024:>13,.0f} | {records_memory / 1024:>13,.0f} | "
+            f"{sprites_time * 1000:>12.3f} | {records_time * 1000:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,91 +2,266 @@
 Module with the main game loop.
 """
 
+import argparse
+import os
+from pathlib import Path
+from typing import Optional
+
 import pygame
-from pygame.sprite import Group
 from pygame.surface import Surface
 from pygame.time import Clock
-from pytmx.pytmx import TiledObjectGroup
 
-from src.animations import SpriteSheetParser
+from src.activation import ActivationSystem
+from src.animation_packs import load_animation_repository
 from src.camera import Camera
 from src.collidables import Collidable
+from src.collidables import CollidablesGroup
+from src.entities import EntityFactory
+from src.entities import StaticObjects
 from src.exit import exit_if_captured_quit
+from src.frame_timings import FrameTimings
+from src.headless import scripted_player_inputs
+from src.inputs import CapturedInput
 from src.inputs import capture_player_inputs
-from src.maps import TiledMap
+from src.inputs import merge_captured_inputs
+from src.levels import LevelManager
+from src.physics import World
 from src.player import Player
+from src.profiler import PROFILER
+from src.rendering import CameraGroup
+from src.rendering import DirtyRectRenderer
+from src.rendering import Presenter
+from src.replays import InputRecorder
+from src.replays import Replay
 from src.settings import CLEAR_DISPLAY_RGB
+from src.settings import DIRTY_RECT_RENDERING
 from src.settings import GAME_FPS
+from src.settings import MAX_SIMULATION_STEPS
+from src.settings import PROFILER_TRACE_PATH
 from src.settings import RAW_DISPLAY_SIZE
-from src.settings import TMX_OBJECT_COLLIDABLE_NAME
+from src.settings import SIMULATION_TICK_RATE
+from src.settings import TMX_OBJECT_DECORATION_TYPE
 from src.settings import TMX_OBJECT_PLAYER_NAME
 from src.settings import WINDOW_SIZE
 from src.settings import WINDOW_TITLE
+from src.timestep import FixedTimestep
 
 
-def main():
+def main(
+    headless: bool = False,
+    frames: Optional[int] = None,
+    recorder: Optional[InputRecorder] = None,
+    replay: Optional[Replay] = None,
+) -> FrameTimings:
     """
-    Entry point which runs the main game loop.
+    Entry point which runs the main game loop, forever or for the given number of frames.
+
+    When headless, the game runs without a window (SDL's dummy video driver) and without frame rate capping: the
+    player inputs come from a script, each frame runs exactly one simulation step and the per phase timings of the
+    frames are collected and returned.
+
+    With a recorder, the inputs, frame times and player positions of the frames are recorded. With a replay, they
+    are fed from the replay instead (until its end), without frame rate capping and with the timings collected: the
+    player positions are checked against the recorded ones.
     """
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+    if replay is not None:
+        frames = len(replay) if frames is None else min(frames, len(replay))
+
     pygame.init()
     game_clock = Clock()
-    dt = 0
+    timestep = FixedTimestep(SIMULATION_TICK_RATE, MAX_SIMULATION_STEPS)
+    frame_time = 0.0
+    timings = FrameTimings(enabled=headless or replay is not None)
+    player_inputs = scripted_player_inputs() if headless and replay is None else None
 
     # main screen
     game_screen: Surface = pygame.display.set_mode(WINDOW_SIZE, 0, 32)
     pygame.display.set_caption(WINDOW_TITLE)
 
-    # raw_display is the main blit Surface which is scaled later
-    raw_display = pygame.Surface(RAW_DISPLAY_SIZE)
+    # raw_display is the main blit Surface which is scaled later (straight into the screen by the presenter)
+    raw_display = pygame.Surface(RAW_DISPLAY_SIZE).convert()  # same pixel format as the screen
+    presenter = Presenter(game_screen, RAW_DISPLAY_SIZE)
 
     # maps
-    level_01 = TiledMap("tiled-level-01.tmx")
-    level_01_img = level_01.build_map()
+    level_manager = LevelManager()  # next levels can be preloaded in the background with level_manager.preload
+    level = level_manager.load("tiled-level-01.tmx")
+    level_01, level_01_renderer = level.tiled_map, level.map_renderer
+    dirty_renderer = DirtyRectRenderer(level_01_renderer, phase=timings.phase)  # same phases as full redraws
     camera = Camera(level_01.total_map_width, level_01.total_map_height)
 
-    # other spritesheets and animations
-    spritesheet_parser = SpriteSheetParser()
-
-    spritesheet_parser.load_spritesheet("hero")
-    player_animations = spritesheet_parser.build_animation_repository()
+    # other spritesheets and animations (loaded from their compiled packs when available)
+    player_animations = load_animation_repository("hero")
 
     # sprites and groups
-    collidables = Group()
-    all_sprites = Group()
+    collidables = CollidablesGroup()  # spatially indexed, filled once from the objects layer
+    world = World(collidables)  # dynamic bodies: moved and collided against the collidables
+    all_sprites = CameraGroup(layered=True)  # static objects are drawn behind the other sprites
+    static_objects = StaticObjects(all_sprites)  # promoted to sprites only near the camera
 
     # objects in objects layer: map parsing
-    tile_object: TiledObjectGroup
+    entity_factory = EntityFactory()
+    entity_factory.register(
+        TMX_OBJECT_PLAYER_NAME,
+        lambda tiled_object: Player(tiled_object.x, tiled_object.y, player_animations, world, all_sprites),
+    )
+    entity_factory.register_static(TMX_OBJECT_DECORATION_TYPE)
+    entities = entity_factory.build(level_01.tmx_map.objects, static_objects)
+    player = next(entity for entity in entities if isinstance(entity, Player))
+
+    # other entities (e.g., NPCs) are only fully updated near the camera, while the player is always updated
+    activation = ActivationSystem((level_01.tmx_map.tilewidth, level_01.tmx_map.tileheight), camera.view_rect)
 
-    for tile_object in level_01.tmx_map.objects:
-        if tile_object.name == TMX_OBJECT_PLAYER_NAME:
-            player = Player(tile_object.x, tile_object.y, player_animations, all_sprites)
+    for entity in entities:
+        if entity is not player:
+            activation.add(entity)
 
-        if tile_object.name == TMX_OBJECT_COLLIDABLE_NAME:
-            Collidable(tile_object.x, tile_object.y, tile_object.width, tile_object.height, collidables)
+    # collidable objects are merged into fewer, larger rects (cached per map file)
+    for collision_rect in level_01.collision_rects():
+        Collidable(collision_rect.x, collision_rect.y, collision_rect.width, collision_rect.height, collidables)
 
     # main game loop
-    while True:
-        raw_display.fill(CLEAR_DISPLAY_RGB)  # clears the display
-        raw_display.blit(level_01_img, camera.apply_offset(level_01_img.get_rect()))  # shifts by the camera offset
+    pending_input = CapturedInput()  # inputs not consumed by a simulation step yet
+    frame = 0
 
+    while frames is None or frame < frames:
         # input capturing
-        captured_input = capture_player_inputs()
-        exit_if_captured_quit(captured_input)
+        with timings.phase("input"):
+            if replay is not None:
+                new_input, frame_time = replay.frame(frame)  # frame time of the recorded frame
+            else:
+                new_input = next(player_inputs) if player_inputs is not None else capture_player_inputs()
+
+            captured_input = merge_captured_inputs(pending_input, new_input)
+
+            if captured_input.should_quit and recorder is not None:
+                recorder.close()
+
+            exit_if_captured_quit(captured_input)
+
+        # state update according to inputs: fixed simulation steps (physics don't depend on the rendering rate)
+        for _ in range(timestep.advance(frame_time)):
+            with timings.phase("player update"):
+                player.update(captured_input, timestep.step_dt)
+
+            with timings.phase("entities update"):
+                activation.update(camera.view_rect, timestep.step_dt, captured_input)
+
+            with timings.phase("physics step"):
+                world.step(timestep.step_dt)
+
+            with timings.phase("camera update"):
+                camera.update(player.rect)
+
+            with timings.phase("static objects"):
+                static_objects.update(camera.view_rect)  # promotes the objects near the camera, demotes the others
+
+            with timings.phase("map animations"):
+                changed_map_rects = level_01_renderer.animate(timestep.step_dt)  # only the changed animated tiles
+
+                if DIRTY_RECT_RENDERING:
+                    dirty_renderer.invalidate_map_rects(changed_map_rects)
+
+            captured_input = CapturedInput()  # inputs are events: only the first step consumes them
 
-        # state update according to inputs
-        player.update(captured_input, dt, collidables)
-        camera.update(player)
+        pending_input = captured_input
 
-        for sprite in all_sprites:
-            raw_display.blit(sprite.image, camera.apply_offset(sprite.rect))
+        # rendering: interpolated between the last two simulation steps
+        alpha = timestep.alpha
+        camera_offset = camera.interpolated_offset(alpha)
 
-        # scale to the final screen
-        scaled_display = pygame.transform.scale(raw_display, WINDOW_SIZE)
-        game_screen.blit(scaled_display, (0, 0))
+        if DIRTY_RECT_RENDERING:
+            with timings.phase("sprite blits"):
+                draws = all_sprites.visible_draws(RAW_DISPLAY_SIZE, camera_offset, alpha)  # only visible sprites
 
-        pygame.display.update()
-        dt = game_clock.tick(GAME_FPS) / 1000  # seconds since last frame (last clock tick)
+            dirty_rects = dirty_renderer.render_on(raw_display, camera_offset, draws)  # map blit and sprite blits
+        else:
+            with timings.phase("map blit"):
+                raw_display.fill(CLEAR_DISPLAY_RGB)  # clears the display
+                level_01_renderer.render_on(raw_display, camera_offset)  # only visible chunks, shifted by the camera
+
+            with timings.phase("sprite blits"):
+                all_sprites.render_on(raw_display, camera_offset, alpha)  # only visible sprites, in one blits call
+                level_01_renderer.render_foreground_on(raw_display, camera_offset)  # foreground parallax layers
+
+            dirty_rects = None
+
+        # scale to the final screen: only the dirty rects when there are any
+        with timings.phase("scale"):
+            if dirty_rects is None:
+                presenter.present(raw_display)
+                screen_rects = None  # the whole screen
+            else:
+                screen_rects = presenter.present_rects(raw_display, dirty_rects)
+
+        # profiler overlay: drawn over the frame, which then has to be fully presented (and redrawn next frame)
+        if PROFILER.overlay:
+            PROFILER.render_overlay_on(raw_display)
+            presenter.present(raw_display)
+            dirty_renderer.invalidate()
+            screen_rects = None
+
+        timings.end_frame()
+        PROFILER.end_frame()
+
+        if recorder is not None:
+            recorder.record(new_input, frame_time, player.rect.topleft)
+
+        if replay is not None:
+            replay.check(frame, player.rect.topleft)
+
+        frame += 1
+
+        if replay is not None:
+            if not headless:
+                pygame.display.update(screen_rects)  # as fast as possible: frame times come from the replay
+        elif headless:
+            frame_time = timestep.step_dt  # as fast as possible: one simulation step per frame
+        else:
+            pygame.display.update(screen_rects)
+            frame_time = game_clock.tick(GAME_FPS) / 1000  # seconds since last frame (last clock tick)
+
+    if recorder is not None:
+        recorder.close()
+
+    level_manager.shutdown()
+    pygame.quit()
+
+    return timings
 
 
 if __name__ == "__main__":
-    main()
+    arguments_parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    arguments_parser.add_argument("--headless", action="store_true", help="runs without a window and reports timings")
+    arguments_parser.add_argument("--frames", type=int, default=None, help="number of frames to run (default: forever)")
+    arguments_parser.add_argument("--record", type=Path, default=None, help="records the session to a file")
+    arguments_parser.add_argument("--replay", type=Path, default=None, help="replays a recorded session and reports")
+    arguments_parser.add_argument("--trace", type=Path, default=None, help="writes per frame timings to a csv file")
+    arguments_parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=PROFILER_TRACE_PATH,
+        default=None,
+        help=f"shows the profiler overlay and writes a chrome trace on exit (default: {PROFILER_TRACE_PATH})",
+    )
+    arguments = arguments_parser.parse_args()
+
+    if arguments.profile is not None:
+        PROFILER.enable(overlay=True, trace_path=arguments.profile)
+
+    session_recorder = InputRecorder(arguments.record) if arguments.record is not None else None
+    session_replay = Replay(arguments.replay) if arguments.replay is not None else None
+    frame_timings = main(arguments.headless, arguments.frames, session_recorder, session_replay)
+
+    if arguments.headless or session_replay is not None:
+        print(frame_timings.report())
+
+    if session_replay is not None:
+        drift_frame = session_replay.drift_frame
+        print("no drift" if drift_frame is None else f"drift: player position differs from frame {drift_frame}")
+
+    if arguments.trace is not None:
+        frame_timings.write_trace(arguments.trace)
@@ -0,0 +1,203 @@
+"""
+Module with the activation of entities: only the entities near the camera are updated on every simulation step.
+"""
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+
+from pygame.rect import Rect
+from pygame.sprite import Sprite
+
+from src.profiler import profiled
+from src.settings import ACTIVATION_MARGIN
+from src.settings import ACTIVATION_REGION_TILES
+from src.settings import ACTIVATION_SLEEP_TICK_INTERVAL
+
+Region = Tuple[int, int]  # (column, row) of a region of the level
+
+
+class ActivationSystem:
+    """
+    Partitions the level into regions of region_tiles map tiles and keeps each entity in the region of its rect. On
+    each simulation step, the entities in the regions within margin pixels of the camera view (initially, the given
+    view) are awake and updated, while the others are asleep:
+
+    - with a sleep tick interval, sleeping entities are updated once every that many steps, with the time elapsed
+      since their last update. Regions take turns (by their position) so that sleeping updates are spread over steps
+    - without one (0), sleeping entities are frozen: they aren't updated and, once woken up, they resume where they
+      were left off
+
+    Entities are updated with the given arguments followed by their elapsed time (dt), like Player.update. Entities
+    are told when they fall asleep and wake up through their optional methods:
+
+    - sleep, when sleeping entities are frozen: e.g., to freeze their physics bodies too
+    - slow, when sleeping entities are ticked: e.g., to put their physics bodies to sleep and step them on their own,
+      by their elapsed time, on their updates
+    - wake, in both cases
+
+    Which entities are updated only depends on the step, the camera views and the entities' positions, so replays
+    update them exactly the same way. The cost of a step depends on the awake entities (and, when ticking the
+    sleeping ones, on a fraction of them), not on the level's population.
+    """
+
+    _region_width: int
+    _region_height: int
+    _margin: int
+    _sleep_tick_interval: int
+    _regions: Dict[Region, List[Sprite]]  # entities of each region, in the order they entered it
+    _phase_regions: List[Set[Region]]  # regions whose sleeping entities are updated on each step of the interval
+    _entity_regions: Dict[Sprite, Region]
+    _last_steps: Dict[Sprite, int]  # step on which each entity was last updated (or added)
+    _awake_regions: FrozenSet[Region]
+    _step: int
+
+    def __init__(
+        self,
+        tile_size: Tuple[int, int],
+        view_rect: Rect,
+        region_tiles: int = ACTIVATION_REGION_TILES,
+        margin: int = ACTIVATION_MARGIN,
+        sleep_tick_interval: int = ACTIVATION_SLEEP_TICK_INTERVAL,
+    ) -> None:
+        self._region_width, self._region_height = tile_size[0] * region_tiles, tile_size[1] * region_tiles
+        self._margin = margin
+        self._sleep_tick_interval = sleep_tick_interval
+        self._regions = {}
+        self._phase_regions = [set() for _ in range(sleep_tick_interval)]
+        self._entity_regions = {}
+        self._last_steps = {}
+        self._awake_regions = self._regions_near(view_rect)
+        self._step = 0
+
+    def __len__(self) -> int:
+        return len(self._entity_regions)
+
+    @property
+    def step(self) -> int:
+        return self._step
+
+    @property
+    def awake_regions(self) -> FrozenSet[Region]:
+        return self._awake_regions
+
+    def region_of(self, rect: Rect) -> Region:
+        return rect.centerx // self._region_width, rect.centery // self._region_height
+
+    def is_awake(self, entity: Sprite) -> bool:
+        return self._entity_regions[entity] in self._awake_regions
+
+    def add(self, entity: Sprite) -> None:
+        """
+        Adds an entity, which falls asleep right away if its region isn't near the view.
+        """
+        self._last_steps[entity] = self._step
+        self._enter(entity, self.region_of(entity.rect))
+
+        if not self.is_awake(entity):
+            self._notify(entity, self._asleep_event)
+
+    def remove(self, entity: Sprite) -> None:
+        self._leave(entity)
+        del self._last_steps[entity]
+
+    @profiled("ActivationSystem.update")
+    def update(self, view_rect: Rect, dt: float, *args) -> None:
+        """
+        Runs a simulation step of dt seconds: wakes up the entities near the view (in world coordinates, e.g., the
+        camera's view rect) and puts the others to sleep, then updates the awake entities and the sleeping entities
+        whose turn it is.
+        """
+        awake_regions = self._regions_near(view_rect)
+
+        if awake_regions != self._awake_regions:
+            previous_awake_regions, self._awake_regions = self._awake_regions, awake_regions
+
+            for region in sorted(previous_awake_regions - awake_regions):
+                for entity in self._regions.get(region, ()):
+                    self._notify(entity, self._asleep_event)
+
+            for region in sorted(awake_regions - previous_awake_regions):
+                for entity in self._regions.get(region, ()):
+                    if not self._sleep_tick_interval:
+                        self._last_steps[entity] = self._step  # frozen time is skipped
+
+                    self._notify(entity, "wake")
+
+        updated_regions = sorted(region for region in awake_regions if region in self._regions)
+
+        if self._sleep_tick_interval:
+            updated_regions += sorted(self._phase_regions[self._step % self._sleep_tick_interval] - awake_regions)
+
+        entities = [entity for region in updated_regions for entity in self._regions[region]]
+        self._step += 1
+
+        for entity in entities:
+            entity.update(*args, (self._step - self._last_steps[entity]) * dt)
+            self._last_steps[entity] = self._step
+            self._move(entity)
+
+    def _move(self, entity: Sprite) -> None:
+        """
+        Moves an updated entity to the region of its rect, putting it to sleep or waking it up if needed.
+        """
+        region = self.region_of(entity.rect)
+        previous_region = self._entity_regions[entity]
+
+        if region == previous_region:
+            return
+
+        self._leave(entity)
+        self._enter(entity, region)
+
+        if (previous_region in self._awake_regions) != (region in self._awake_regions):
+            self._notify(entity, "wake" if region in self._awake_regions else self._asleep_event)
+
+    def _enter(self, entity: Sprite, region: Region) -> None:
+        if region not in self._regions:
+            self._regions[region] = []
+
+            if self._sleep_tick_interval:
+                self._phase_regions[sum(region) % self._sleep_tick_interval].add(region)
+
+        self._regions[region].append(entity)
+        self._entity_regions[entity] = region
+
+    def _leave(self, entity: Sprite) -> None:
+        region = self._entity_regions.pop(entity)
+        region_entities = self._regions[region]
+        region_entities.remove(entity)
+
+        if not region_entities:
+            del self._regions[region]
+
+            if self._sleep_tick_interval:
+                self._phase_regions[sum(region) % self._sleep_tick_interval].discard(region)
+
+    @property
+    def _asleep_event(self) -> str:
+        return "slow" if self._sleep_tick_interval else "sleep"
+
+    def _notify(self, entity: Sprite, event: str) -> None:
+        handler = getattr(entity, event, None)
+
+        if handler is not None:
+            handler()
+
+    def _regions_near(self, view_rect: Rect) -> FrozenSet[Region]:
+        """
+        Returns the regions within margin pixels of the view, whose entities are awake.
+        """
+        return frozenset(self._regions_of(view_rect.inflate(2 * self._margin, 2 * self._margin)))
+
+    def _regions_of(self, rect: Rect) -> Iterator[Region]:
+        """
+        Yields the regions overlapped by the rect.
+        """
+        right, bottom = max(rect.left, rect.right - 1), max(rect.top, rect.bottom - 1)
+
+        for column in range(rect.left // self._region_width, right // self._region_width + 1):
+            for row in range(rect.top // self._region_height, bottom // self._region_height + 1):
+                yield column, row
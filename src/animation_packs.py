@@ -0,0 +1,161 @@
+"""
+Module with compiled animation packs: an on-disk cache of animation repositories.
+
+A pack is a single binary file made of a small header, a compact json index of the frames and the raw RGBA pixel
+bytes of all the frames. The pack is memory-mapped when loaded so the frames' surfaces are built from slices of the
+mapped bytes, skipping the spritesheet png decoding, the Aseprite json parsing and the per frame blits. Frames own
+their pixels (the mapping is closed once they're built) and, once a display exists, they're converted to its pixel
+format (see src/assets.py) so that blitting them doesn't convert pixels.
+
+Packs are named after their spritesheet and a digest of its folder, so spritesheets with the same name in different
+folders get their own packs.
+
+Pack layout:
+
+    | magic (4 bytes) | version (uint16) | index length (uint32) | index (json) | pixels (RGBA bytes) |
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+
+import pygame
+
+from src.animations import AnimationRepository
+from src.animations import SpriteSheetParser
+from src.animations import build_image_frames
+from src.assets import convert_for_display
+from src.settings import ASSETS_CACHE_DIR
+from src.settings import ROOT_DIR
+from src.utils import folder_digest
+from src.utils import is_source_unchanged
+from src.utils import source_key
+
+PACK_MAGIC = b"PLAP"
+PACK_VERSION = 2
+PACK_HEADER = struct.Struct("<4sHI")
+PACK_PIXEL_FORMAT = "RGBA"
+
+
+def load_animation_repository(
+    spritesheet_name: str,
+    spritesheet_path: str = "assets/spritesheets/",
+    cache_dir: Path = ASSETS_CACHE_DIR,
+) -> AnimationRepository:
+    """
+    Loads the animation repository of a spritesheet from its compiled pack. If there's no pack yet or if it's stale
+    (the png or the json have changed), the spritesheet is parsed as usual and its pack is (re)written.
+    """
+    png_path = ROOT_DIR.joinpath(spritesheet_path, f"{spritesheet_name}.png")
+    json_path = ROOT_DIR.joinpath(spritesheet_path, f"{spritesheet_name}.json")
+    pack_path = animation_pack_path(spritesheet_name, spritesheet_path, cache_dir)
+
+    animation_repository = read_animation_pack(pack_path, png_path, json_path)
+
+    if animation_repository is None:
+        spritesheet_parser = SpriteSheetParser()
+        spritesheet_parser.load_spritesheet(spritesheet_name, spritesheet_path)
+
+        try:
+            animation_repository = spritesheet_parser.build_animation_repository()
+        finally:
+            spritesheet_parser.release_spritesheet()  # frames are copies
+
+        write_animation_pack(pack_path, animation_repository, png_path, json_path)
+
+    return animation_repository
+
+
+def animation_pack_path(
+    spritesheet_name: str,
+    spritesheet_path: str = "assets/spritesheets/",
+    cache_dir: Path = ASSETS_CACHE_DIR,
+) -> Path:
+    """
+    Path of the pack of a spritesheet: named after the spritesheet and a digest of its (resolved) folder.
+    """
+    return cache_dir.joinpath(f"{spritesheet_name}-{folder_digest(ROOT_DIR.joinpath(spritesheet_path))}.pack")
+
+
+def write_animation_pack(pack_path: Path, repository: AnimationRepository, png_path: Path, json_path: Path) -> None:
+    """
+    Compiles an animation repository into a pack file keyed by its source png and json files. The pack is written
+    to a temporary file first and then moved so that packs already mapped by other processes are never truncated.
+    """
+    index: Dict = {"sources": {"png": source_key(png_path), "json": source_key(json_path)}, "actions": {}}
+    pixels = bytearray()
+
+    for action_name, action_image_list in repository.items():
+        index["actions"][action_name] = []
+
+        for image_frames in action_image_list:
+            image = image_frames["image"]
+            index["actions"][action_name].append(
+                [image_frames["image_id"], len(pixels), image.get_width(), image.get_height(), image_frames["duration"]]
+            )
+            rgba_image = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            rgba_image.blit(image, (0, 0))  # images keyed out by a colorkey get their holes back as transparent
+            pixels += pygame.image.tobytes(rgba_image, PACK_PIXEL_FORMAT)
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode()
+    tmp_pack_path = pack_path.with_suffix(".tmp")
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(tmp_pack_path, "wb") as pack_file:
+        pack_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+        pack_file.write(index_bytes)
+        pack_file.write(pixels)
+
+    os.replace(tmp_pack_path, pack_path)
+
+
+def read_animation_pack(pack_path: Path, png_path: Path, json_path: Path) -> Optional[AnimationRepository]:
+    """
+    Loads an animation repository from a pack file. Returns None if the pack doesn't exist, has an unknown format,
+    is corrupt (e.g., truncated) or was compiled from different source files.
+    """
+    if not pack_path.exists() or pack_path.stat().st_size < PACK_HEADER.size:
+        return None
+
+    with open(pack_path, "rb") as pack_file, mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ) as pack:
+        try:
+            return _read_mapped_pack(pack, png_path, json_path)
+        except (ValueError, KeyError, TypeError, struct.error):  # json errors are ValueErrors
+            return None
+
+
+def _read_mapped_pack(pack: mmap.mmap, png_path: Path, json_path: Path) -> Optional[AnimationRepository]:
+    magic, version, index_length = PACK_HEADER.unpack_from(pack)
+
+    if magic != PACK_MAGIC or version != PACK_VERSION:
+        return None
+
+    index_offset, pixels_offset = PACK_HEADER.size, PACK_HEADER.size + index_length
+    index = json.loads(pack[index_offset:pixels_offset])
+
+    if not is_source_unchanged(index["sources"]["png"], png_path) or not is_source_unchanged(
+        index["sources"]["json"], json_path
+    ):
+        return None
+
+    animation_repository: AnimationRepository = {}
+
+    for action_name, action_frames in index["actions"].items():
+        animation_repository[action_name] = []
+
+        for image_id, offset, width, height, duration in action_frames:
+            image_start = pixels_offset + offset
+            image_end = image_start + width * height * 4
+
+            if image_end > len(pack):
+                return None  # truncated pack
+
+            image = pygame.image.frombytes(pack[image_start:image_end], (width, height), PACK_PIXEL_FORMAT)  # a copy
+            image = convert_for_display(image)
+
+            animation_repository[action_name] += [build_image_frames(image_id, image, duration)]
+
+    return animation_repository
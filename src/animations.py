@@ -2,52 +2,133 @@
 Module with animation utilities.
 """
 import json
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import TypedDict
 
+import numpy as np
 import pygame
 from pygame.surface import Surface
 
+from src.assets import ASSET_REGISTRY
+from src.assets import AssetHandle
+from src.assets import convert_for_display
+from src.profiler import profiled
 from src.settings import ROOT_DIR
 
-ImageFrames = TypedDict("ImageFrames", {"image_id": str, "image": Surface, "frames": int})
+FlippedImages = Dict[Tuple[bool, bool], Surface]  # key is (flip_x, flip_y): (False, False) is the image itself
+ImageFrames = TypedDict(
+    "ImageFrames",
+    {"image_id": str, "image": Surface, "frames": int, "duration": int, "flipped_images": FlippedImages},
+)
 AnimationRepository = Dict[str, List[ImageFrames]]  # main key is the action name for each animation frames
+DurationTable = List[int]  # cumulative durations (ms) of an action's images: the end time of each image
+
+
+def build_flipped_images(image: Surface) -> FlippedImages:
+    """
+    Precomputes all the flipped versions of an image (horizontally, vertically and both) so that orientation
+    changes never allocate surfaces while the game is running.
+    """
+    return {
+        (flip_x, flip_y): image if not flip_x and not flip_y else pygame.transform.flip(image, flip_x, flip_y)
+        for flip_x in (False, True)
+        for flip_y in (False, True)
+    }
+
+
+def build_image_frames(image_id: str, image: Surface, duration: int) -> ImageFrames:
+    """
+    Builds an animation repository entry for an image which is displayed during the given duration (ms).
+    """
+    return {
+        "image_id": image_id,
+        "image": image,
+        "frames": duration // 10,
+        "duration": duration,
+        "flipped_images": build_flipped_images(image),
+    }
+
+
+def build_duration_tables(animation_repository: AnimationRepository) -> Dict[str, DurationTable]:
+    """
+    Precomputes the cumulative durations of the images of each action. The image displayed after some elapsed time
+    is found with a bisect on the action's table.
+
+    Example: {"idle": [{"duration": 200}, {"duration": 100}, {"duration": 300}]} <--- {"idle": [200, 300, 600]}
+    """
+    return {
+        action_name: [*accumulate(image_frames["duration"] for image_frames in action_image_list)]
+        for action_name, action_image_list in animation_repository.items()
+    }
 
 
 class Animator:
     """
     Class used to generate sprite images according to an animation repository.
+
+    By default, the animation advances one frame per update and each image is displayed for its repository "frames".
+    In time based mode, the animation advances by the elapsed time given to each update and each image is displayed
+    for its repository "duration", so the animation speed doesn't depend on the frame rate.
     """
 
     _repository: AnimationRepository
+    _time_based: bool
+    _duration_tables: Dict[str, DurationTable]
+    _elapsed_time: float  # ms elapsed in the current action (time based mode), wrapped on each animation loop
     _image: Surface
+    _image_frames: ImageFrames
     _current_image_position: int
     _image_total_frames: int
     _image_frame_counter: int
     _animation_action: str
 
-    def __init__(self, initial_action: str, animation_repository: AnimationRepository) -> None:
+    def __init__(
+        self, initial_action: str, animation_repository: AnimationRepository, time_based: bool = False
+    ) -> None:
         self._repository = animation_repository
+        self._time_based = time_based
+        self._duration_tables = build_duration_tables(animation_repository) if time_based else {}
+        self._elapsed_time = 0
         self._animation_action = initial_action
         self._current_image_position = 0  # index inside action images list
         self._image_frame_counter = 0  # current frame position of the same image
         self._image_total_frames = self._fetch_current_image_total_frames()
-        self._image = self._repository[self._animation_action][0]["image"]
+        self._image_frames = self._repository[self._animation_action][0]
+        self._image = self._image_frames["image"]
 
     @property
     def image(self) -> Surface:
         return self._image
 
-    def update(self):
+    def image_for(self, flip_x: bool, flip_y: bool) -> Surface:
+        """
+        Returns the current image flipped on the given axes. Flipped images are precomputed by the repository so
+        this is just a lookup: no new surface is allocated.
+        """
+        return self._image_frames["flipped_images"][(flip_x, flip_y)]
+
+    @profiled("Animator.update")
+    def update(self, dt: Optional[float] = None):
         """
-        Called once per frame in order to advance the animation state to fetch next frames/images.
+        Called once per frame in order to advance the animation state to fetch next frames/images. In time based
+        mode, dt (seconds since the last update) is required.
         """
         action_image_list = self._repository[self._animation_action]
-        self._image = action_image_list[self._current_image_position]["image"]
 
-        self._advance_animation(action_image_list)
+        if self._time_based:
+            self._advance_animation_time(dt or 0)
+
+        self._image_frames = action_image_list[self._current_image_position]
+        self._image = self._image_frames["image"]
+
+        if not self._time_based:
+            self._advance_animation(action_image_list)
 
     def change_action(self, new_animation_action: str) -> None:
         """
@@ -57,6 +138,7 @@ class Animator:
         if new_animation_action != self._animation_action:
             self._animation_action = new_animation_action
             self._image_frame_counter = 0
+            self._elapsed_time = 0
             self._current_image_position = 0
             self._image_total_frames = self._fetch_current_image_total_frames()
 
@@ -90,18 +172,174 @@ class Animator:
 
             self._image_total_frames = self._fetch_current_image_total_frames()
 
+    def _advance_animation_time(self, dt: float) -> None:
+        """
+        Advances the elapsed time of the current action by dt seconds (wrapping it when the animation loops) and
+        finds the image displayed at that time with a bisect on the action's duration table.
+        """
+        duration_table = self._duration_tables[self._animation_action]
+        total_duration = duration_table[-1]
+
+        if total_duration <= 0:
+            return  # no durations at all: sticks to the first image
+
+        self._elapsed_time = (self._elapsed_time + dt * 1000) % total_duration
+        self._current_image_position = bisect_right(duration_table, self._elapsed_time)
+
+
+class AnimatorPool:
+    """
+    Holds the state of many time based animators of the same animation repository in contiguous numpy arrays (action
+    id, image position and elapsed time per animator) so that all of them are advanced by a single vectorized update
+    per frame. Each animated sprite keeps only a lightweight AnimatorHandle to its slot in the pool.
+    """
+
+    _action_ids: Dict[str, int]
+    _action_image_lists: List[List[ImageFrames]]
+    _duration_tables: np.ndarray  # (actions, max images) cumulative durations padded with inf
+    _total_durations: np.ndarray  # (actions,)
+
+    _actions: np.ndarray
+    _positions: np.ndarray
+    _elapsed_times: np.ndarray
+    _size: int  # slots in use, including freed ones
+    _free_slots: List[int]
+
+    def __init__(self, animation_repository: AnimationRepository, capacity: int = 1024) -> None:
+        duration_tables = build_duration_tables(animation_repository)
+        max_images = max(len(duration_table) for duration_table in duration_tables.values())
+
+        self._action_ids = {action_name: action_id for action_id, action_name in enumerate(animation_repository)}
+        self._action_image_lists = [*animation_repository.values()]
+        self._duration_tables = np.full((len(duration_tables), max_images), np.inf)
+        self._total_durations = np.zeros(len(duration_tables))
+
+        for action_id, duration_table in enumerate(duration_tables.values()):
+            self._duration_tables[action_id, : len(duration_table)] = duration_table
+            self._total_durations[action_id] = duration_table[-1]
+
+        self._actions = np.zeros(capacity, dtype=np.int32)
+        self._positions = np.zeros(capacity, dtype=np.int32)
+        self._elapsed_times = np.zeros(capacity, dtype=np.float64)
+        self._size = 0
+        self._free_slots = []
+
+    def __len__(self) -> int:
+        return self._size - len(self._free_slots)
+
+    def add(self, initial_action: str) -> "AnimatorHandle":
+        """
+        Reserves a slot in the pool for a new animator and returns its handle.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size == len(self._actions):
+                self._grow()
+
+            slot = self._size
+            self._size += 1
+
+        self._actions[slot] = self._action_ids[initial_action]
+        self._positions[slot] = 0
+        self._elapsed_times[slot] = 0
+
+        return AnimatorHandle(self, slot)
+
+    def remove(self, handle: "AnimatorHandle") -> None:
+        """
+        Frees the slot of an animator so that it can be reused by another one.
+        """
+        self._free_slots.append(handle.slot)
+
+    def update(self, dt: float) -> None:
+        """
+        Advances all the animators of the pool by dt seconds: the elapsed times are wrapped by their action's total
+        duration and the image positions are found with a vectorized bisect on the actions' duration tables.
+        """
+        actions = self._actions[: self._size]
+        total_durations = self._total_durations[actions]
+        elapsed_times = self._elapsed_times[: self._size] + dt * 1000
+
+        # actions without durations stick to their first image
+        without_durations = total_durations <= 0
+        np.remainder(elapsed_times, total_durations, out=elapsed_times, where=~without_durations)
+        elapsed_times[without_durations] = 0
+
+        positions = (self._duration_tables[actions] <= elapsed_times[:, None]).sum(axis=1)
+        positions[without_durations] = 0  # their 0 durations would be counted as elapsed images
+
+        self._elapsed_times[: self._size] = elapsed_times
+        self._positions[: self._size] = positions
+
+    def change_action(self, slot: int, new_animation_action: str) -> None:
+        """
+        Changes the action of an animator, resetting its state only if the new action is different than the current.
+        """
+        action_id = self._action_ids[new_animation_action]
+
+        if action_id != self._actions[slot]:
+            self._actions[slot] = action_id
+            self._positions[slot] = 0
+            self._elapsed_times[slot] = 0
+
+    def image_frames(self, slot: int) -> ImageFrames:
+        return self._action_image_lists[self._actions[slot]][self._positions[slot]]
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of the pool arrays.
+        """
+        self._actions = np.concatenate([self._actions, np.zeros_like(self._actions)])
+        self._positions = np.concatenate([self._positions, np.zeros_like(self._positions)])
+        self._elapsed_times = np.concatenate([self._elapsed_times, np.zeros_like(self._elapsed_times)])
+
+
+class AnimatorHandle:
+    """
+    Lightweight handle to an animator slot in an AnimatorPool. It exposes the same image API as the Animator, but
+    it's advanced by its pool's update instead of by itself.
+    """
+
+    __slots__ = ("_pool", "_slot")
+
+    _pool: AnimatorPool
+    _slot: int
+
+    def __init__(self, pool: AnimatorPool, slot: int) -> None:
+        self._pool = pool
+        self._slot = slot
+
+    @property
+    def slot(self) -> int:
+        return self._slot
+
+    @property
+    def image(self) -> Surface:
+        return self._pool.image_frames(self._slot)["image"]
+
+    def image_for(self, flip_x: bool, flip_y: bool) -> Surface:
+        return self._pool.image_frames(self._slot)["flipped_images"][(flip_x, flip_y)]
+
+    def change_action(self, new_animation_action: str) -> None:
+        self._pool.change_action(self._slot, new_animation_action)
+
 
 class SpriteSheetParser:
     """
     Utility class used to parse animations from spritesheets and their position json.
+
+    The spritesheet image is acquired from the asset registry (see src/assets.py) and must be released once the
+    parser is done with it: right after building repositories of copied frames or, for repositories of views, once
+    they're no longer used.
     """
 
-    _spritesheet_image: Surface
+    _spritesheet_handle: AssetHandle
     _spritesheet_json: Dict[str, Any]
 
     @property
     def spritesheet_image(self) -> Surface:
-        return self._spritesheet_image
+        return self._spritesheet_handle.surface
 
     @property
     def spritesheet_json(self) -> Dict:
@@ -114,10 +352,16 @@ class SpriteSheetParser:
         spritesheet_png_path = ROOT_DIR.joinpath(spritesheet_path, f"{spritesheet_name}.png")
         spritesheet_json_path = ROOT_DIR.joinpath(spritesheet_path, f"{spritesheet_name}.json")
 
-        self._spritesheet_image = pygame.image.load(spritesheet_png_path)
+        self._spritesheet_handle = ASSET_REGISTRY.acquire_image(spritesheet_png_path, rle=False)  # alpha for views
         self._spritesheet_json = self._load_json(spritesheet_json_path)
 
-    def build_animation_repository(self) -> AnimationRepository:
+    def release_spritesheet(self) -> None:
+        """
+        Releases the spritesheet image so that the asset registry can evict it.
+        """
+        self._spritesheet_handle.release()
+
+    def build_animation_repository(self, copy_frames: bool = True) -> AnimationRepository:
         """
         After having loaded a spritesheet png and its json, this method can be used to build an animation repository
         which is a dictionary in which each key is an animation action (defined by 'frameTags' name). As such, this
@@ -125,8 +369,16 @@ class SpriteSheetParser:
         into the animation repository dictionary under their action name (frameTags.name).
 
         This method is heavily dependent on Aseprite's json format, including the frameTags section.
+
+        If copy_frames is False, each image is a subsurface (a view) of the spritesheet instead of a copy of its frame:
+        no pixels are duplicated in memory, but changing an image changes the spritesheet (and vice versa).
+
+        Copied frames are converted to the display format (see src/assets.py) while views share the spritesheet's
+        format, which is converted once on load.
         """
         animation_repository: AnimationRepository = {}
+
+        spritesheet_rect = self.spritesheet_image.get_rect()
         meta_tags: List[Dict] = self._spritesheet_json["meta"]["frameTags"]
 
         # frameTags helper array parsing
@@ -141,18 +393,21 @@ class SpriteSheetParser:
             frames_duration = frame_metadata["duration"]
 
             rect = pygame.Rect(frame_x, frame_y, frame_width, frame_height)
-            image = pygame.Surface(rect.size, pygame.SRCALPHA)  # blank image surface
 
-            image.blit(self._spritesheet_image, (0, 0), rect)  # blit on top of the image surface
+            # frames lying outside the spritesheet can't be viewed: they're copied (only their visible part)
+            if copy_frames or not spritesheet_rect.contains(rect):
+                image = pygame.Surface(rect.size, pygame.SRCALPHA)  # blank image surface
+                image.blit(self.spritesheet_image, (0, 0), rect)  # blit on top of the image surface
+                image = convert_for_display(image)
+            else:
+                image = self.spritesheet_image.subsurface(rect)  # zero-copy view of the spritesheet
+
+            image_frames = build_image_frames(image_id, image, frames_duration)
 
             if animation_action_name not in animation_repository:
-                animation_repository[animation_action_name] = [
-                    {"image_id": image_id, "image": image, "frames": frames_duration // 10}
-                ]
+                animation_repository[animation_action_name] = [image_frames]
             else:
-                animation_repository[animation_action_name] += [
-                    {"image_id": image_id, "image": image, "frames": frames_duration // 10}
-                ]
+                animation_repository[animation_action_name] += [image_frames]
 
             current_frame += 1
 
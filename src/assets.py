@@ -0,0 +1,353 @@
+"""
+Module with the central registry of image assets. Images are converted once to the pixel format of the display so that
+blitting them never converts pixels on the fly:
+
+- opaque images are converted to the display format
+- opaque images with holes (each pixel fully opaque or fully transparent), like most pixel art tiles, are converted
+  to the display format with their holes keyed out by an RLE accelerated colorkey: the fastest path to blit them
+- images with translucent pixels are converted to the display format with per pixel alpha
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pygame
+from pygame.rect import Rect
+from pygame.surface import Surface
+from pytmx import TileFlags
+from pytmx.util_pygame import handle_transformation
+
+from src.settings import ASSETS_MEMORY_BUDGET
+from src.utils import SourceKey
+from src.utils import source_key
+
+AssetKey = Tuple[Hashable, ...]  # e.g., ("image", content hash, rle)
+COLORKEY_RGB = (255, 0, 255)  # keys out the holes of opaque images, unless the images use it
+
+
+def convert_for_display(surface: Surface, rle: bool = True) -> Surface:
+    """
+    Returns a copy of the surface converted to the display's pixel format (see the module's docstring). If rle is
+    False, images with holes keep per pixel alpha instead of a colorkey (e.g., images whose pixels are accessed
+    later). Surfaces which already have a colorkey keep it. Without a display, the surface is returned as it is.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+
+    colorkey = surface.get_colorkey()
+
+    if colorkey is not None:
+        converted = surface.convert()
+        converted.set_colorkey(colorkey, pygame.RLEACCEL if rle else 0)
+
+        return converted
+
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert()
+
+    alphas = pygame.surfarray.array_alpha(surface)
+
+    if alphas.min() == 255:
+        return surface.convert()
+
+    if not rle or np.any((alphas != 0) & (alphas != 255)):
+        return surface.convert_alpha()
+
+    colors = pygame.surfarray.array3d(surface)[alphas == 255]
+
+    if np.any(np.all(colors == COLORKEY_RGB, axis=1)):
+        return surface.convert_alpha()  # the colorkey would also key out opaque pixels
+
+    keyed = Surface(surface.get_size()).convert()
+    keyed.fill(COLORKEY_RGB)
+    keyed.blit(surface, (0, 0))  # holes keep the colorkey
+    keyed.set_colorkey(COLORKEY_RGB, pygame.RLEACCEL)
+
+    return keyed
+
+
+def surface_memory_size(surface: Surface) -> int:
+    """
+    Bytes of pixels held by a surface.
+    """
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+@dataclass(frozen=True)
+class AssetStats:
+    """
+    Counters of an asset registry: acquires served by resident assets (hits) or by loading them (misses), evicted
+    assets and bytes of the resident assets, referenced or not.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    resident_assets: int
+    bytes_resident: int
+    bytes_referenced: int
+
+
+class AssetEntry:
+    """
+    Resident asset of a registry and the number of handles which reference it.
+    """
+
+    __slots__ = ("surface", "memory_size", "references")
+
+    def __init__(self, surface: Surface) -> None:
+        self.surface = surface
+        self.memory_size = surface_memory_size(surface)
+        self.references = 0
+
+
+class AssetHandle:
+    """
+    Shared reference to an asset of a registry: the asset is never evicted while any of its handles is unreleased.
+    Releasing a handle more than once has no effect.
+    """
+
+    __slots__ = ("_registry", "_key", "_surface", "_released")
+
+    def __init__(self, registry: Optional["AssetRegistry"], key: Optional[AssetKey], surface: Surface) -> None:
+        self._registry = registry  # None for assets which aren't registered (e.g., loaded before the display exists)
+        self._key = key
+        self._surface = surface
+        self._released = False
+
+    @property
+    def surface(self) -> Surface:
+        return self._surface
+
+    @property
+    def released(self) -> bool:
+        return self._released
+
+    def release(self) -> None:
+        if self._released:
+            return
+
+        self._released = True
+
+        if self._registry is not None and self._key is not None:
+            self._registry.release(self._key)
+
+
+class AssetRegistry:
+    """
+    Registry of the game's image assets converted to the display format (see convert_for_display), so that each
+    image is decoded and converted only once and shared by everyone who uses it:
+
+    - images are deduplicated by canonical path and by content hash (e.g., copies of a tileset in two folders)
+    - acquiring an asset hands out a handle which references it: referenced assets are never evicted
+    - unreferenced assets stay resident (e.g., for the next level that uses them) while all resident assets fit the
+      memory budget, beyond which they're evicted least recently used first
+
+    Images acquired before the display exists are neither converted nor registered. Also works as pytmx's image
+    loader so that the tiles of tiled maps are converted and shared the same way.
+
+    Acquires are thread safe, as levels may be loaded in the background.
+    """
+
+    _memory_budget: int
+    _entries: "OrderedDict[AssetKey, AssetEntry]"  # least recently acquired first
+    _source_keys: Dict[Path, SourceKey]  # canonical path -> key of the file contents (see src/utils.py)
+    _bytes_resident: int
+    _hits: int
+    _misses: int
+    _evictions: int
+    _lock: Lock
+
+    def __init__(self, memory_budget: int = ASSETS_MEMORY_BUDGET) -> None:
+        self._memory_budget = memory_budget
+        self._entries = OrderedDict()
+        self._source_keys = {}
+        self._bytes_resident = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory_budget(self) -> int:
+        return self._memory_budget
+
+    def stats(self) -> AssetStats:
+        with self._lock:
+            return AssetStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                resident_assets=len(self._entries),
+                bytes_resident=self._bytes_resident,
+                bytes_referenced=sum(entry.memory_size for entry in self._entries.values() if entry.references),
+            )
+
+    def content_hash(self, file_path: Path) -> str:
+        """
+        Returns the sha256 of a file's contents. Files are only hashed again (once per canonical path) when their
+        mtime or size have changed.
+        """
+        canonical_path = Path(file_path).resolve()
+        stat = canonical_path.stat()
+
+        with self._lock:
+            key = self._source_keys.get(canonical_path)
+
+        if key is None or (key["mtime"], key["size"]) != (stat.st_mtime_ns, stat.st_size):
+            key = source_key(canonical_path)
+
+            with self._lock:
+                self._source_keys[canonical_path] = key
+
+        return str(key["sha256"])
+
+    def acquire(self, key: AssetKey, load: Callable[[], Surface]) -> AssetHandle:
+        """
+        Hands out a handle to the asset of a key, loading it first if it isn't resident.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._hits += 1
+
+                return self._reference(key, entry)
+
+        surface = load()  # outside the lock: other assets can be acquired meanwhile
+
+        with self._lock:
+            self._misses += 1
+            entry = self._entries.get(key)
+
+            if entry is None:  # unless another thread has loaded it meanwhile
+                entry = self._entries[key] = AssetEntry(surface)
+                self._bytes_resident += entry.memory_size
+
+            handle = self._reference(key, entry)
+            self._evict()
+
+            return handle
+
+    def acquire_image(self, image_path: Path, rle: bool = True) -> AssetHandle:
+        """
+        Hands out a handle to an image converted to the display format (see convert_for_display).
+        """
+        if pygame.display.get_surface() is None:
+            return AssetHandle(None, None, pygame.image.load(image_path))
+
+        def load_image() -> Surface:
+            return convert_for_display(pygame.image.load(image_path), rle)
+
+        return self.acquire(("image", self.content_hash(image_path), rle), load_image)
+
+    def load_image(self, image_path: Path, rle: bool = True) -> Surface:
+        """
+        Loads an image which is used for as long as the game runs: its handle is never released, so the image is
+        never evicted. Images used for a while should be acquired (see acquire_image) and released instead.
+        """
+        return self.acquire_image(image_path, rle).surface
+
+    def clear(self) -> None:
+        """
+        Evicts every unreferenced asset.
+        """
+        with self._lock:
+            self._evict(memory_budget=0)
+
+    def tile_image_loader(
+        self,
+        filename: str,
+        colorkey: Optional[str],
+        handles: Optional[List[AssetHandle]] = None,
+        tileset_handles: Optional[List[AssetHandle]] = None,
+        **kwargs,
+    ) -> Callable:
+        """
+        Image loader for pytmx.TiledMap: returns the function which pytmx calls to load each tile of a tileset image.
+        Tiles are registered on their own as tiles differ (e.g., opaque or with holes), keyed by the tileset contents,
+        their rect and their flags.
+
+        The handles of the tiles and of the tileset image are appended to the given lists so that the map can release
+        them: the tileset is only needed while its tiles are loaded, the tiles for as long as the map is used.
+        """
+        tileset_handle = self.acquire_image(Path(filename), rle=False)  # keeps alpha: tiles are analyzed one by one
+        tileset = tileset_handle.surface
+        tileset_hash = self.content_hash(Path(filename))
+        tiles_colorkey = pygame.Color(f"#{colorkey}") if colorkey else None
+
+        if tileset_handles is not None:
+            tileset_handles.append(tileset_handle)
+
+        def build_tile(rect: Optional[Rect], flags: Optional[TileFlags]) -> Surface:
+            tile = tileset.subsurface(rect) if rect else tileset
+
+            if flags:
+                tile = handle_transformation(tile, flags)
+
+            if tiles_colorkey is not None:
+                tile = tile.copy()
+                tile.set_colorkey(tiles_colorkey)
+
+            return convert_for_display(tile)
+
+        def load_tile(rect: Optional[Rect] = None, flags: Optional[TileFlags] = None) -> Surface:
+            if pygame.display.get_surface() is None:
+                return build_tile(rect, flags)
+
+            key = ("tile", tileset_hash, tuple(rect) if rect else None, tuple(flags) if flags else None, colorkey)
+            tile_handle = self.acquire(key, lambda: build_tile(rect, flags))
+
+            if handles is not None:
+                handles.append(tile_handle)
+
+            return tile_handle.surface
+
+        return load_tile
+
+    def _reference(self, key: AssetKey, entry: AssetEntry) -> AssetHandle:
+        entry.references += 1
+        self._entries.move_to_end(key)  # most recently acquired
+
+        return AssetHandle(self, key, entry.surface)
+
+    def release(self, key: AssetKey) -> None:
+        """
+        Drops a reference to the asset of a key: called by its handles when they're released (use those instead).
+        """
+        with self._lock:
+            entry = self._entries[key]
+            entry.references -= 1
+
+            if not entry.references:
+                self._evict()
+
+    def _evict(self, memory_budget: Optional[int] = None) -> None:
+        """
+        Evicts unreferenced assets, least recently acquired first, until the resident ones fit the memory budget.
+        """
+        memory_budget = self._memory_budget if memory_budget is None else memory_budget
+
+        if self._bytes_resident <= memory_budget:
+            return
+
+        for key in [key for key, entry in self._entries.items() if not entry.references]:
+            if self._bytes_resident <= memory_budget:
+                break
+
+            self._bytes_resident -= self._entries.pop(key).memory_size
+            self._evictions += 1
+
+
+ASSET_REGISTRY = AssetRegistry()  # registry of the game's assets
@@ -1,26 +1,152 @@
 """
 Module with camera implementation used to apply drawing offsets.
 """
+from typing import Optional
+from typing import Tuple
 
+import numpy as np
 from pygame.rect import Rect
 
-from src.player import Player
+from src.profiler import profiled
+from src.settings import CAMERA_DEADZONE_SIZE
+from src.settings import CAMERA_FOLLOW
+from src.settings import CAMERA_LOOKAHEAD_DISTANCE
 from src.settings import RAW_DISPLAY_SIZE
 from src.settings import SCROLLING_OFFSET_FRACTION
 
+CAMERA_FOLLOWS = ("lerp", "deadzone", "lookahead")
+
+
+class FollowStrategy:
+    """
+    Decides where the camera goes on each update: given the current camera offset, the target's rect and the view
+    size, returns the desired (unclamped) camera offset. The default strategy sticks to the target at the center of
+    the view.
+    """
+
+    def follow(self, offset: Tuple[float, float], target: Rect, view_size: Tuple[int, int]) -> Tuple[float, float]:
+        return -target.x + view_size[0] / 2, -target.y + view_size[1] / 2
+
+
+class LerpFollow(FollowStrategy):
+    """
+    Moves the camera a fraction of the way towards the target on each update (smooth scrolling). A fraction of 1 sticks
+    to the target.
+    """
+
+    _fraction: float
+
+    def __init__(self, fraction: float = SCROLLING_OFFSET_FRACTION) -> None:
+        self._fraction = fraction
+
+    def follow(self, offset: Tuple[float, float], target: Rect, view_size: Tuple[int, int]) -> Tuple[float, float]:
+        target_x, target_y = super().follow(offset, target, view_size)
+
+        return offset[0] + (target_x - offset[0]) * self._fraction, offset[1] + (target_y - offset[1]) * self._fraction
+
+
+class DeadzoneFollow(FollowStrategy):
+    """
+    Keeps the camera still while the target is inside a zone of the given size at the center of the view and only
+    moves it, just enough, when the target leaves the zone.
+    """
+
+    _width: int
+    _height: int
+
+    def __init__(self, deadzone_size: Tuple[int, int] = CAMERA_DEADZONE_SIZE) -> None:
+        self._width, self._height = deadzone_size
+
+    def follow(self, offset: Tuple[float, float], target: Rect, view_size: Tuple[int, int]) -> Tuple[float, float]:
+        offset_x, offset_y = offset
+        zone_left, zone_top = (view_size[0] - self._width) / 2, (view_size[1] - self._height) / 2
+        screen_x, screen_y = target.x + offset_x, target.y + offset_y  # target position on the view
+
+        if screen_x < zone_left:
+            offset_x += zone_left - screen_x
+        elif screen_x + target.width > zone_left + self._width:
+            offset_x -= screen_x + target.width - zone_left - self._width
+
+        if screen_y < zone_top:
+            offset_y += zone_top - screen_y
+        elif screen_y + target.height > zone_top + self._height:
+            offset_y -= screen_y + target.height - zone_top - self._height
+
+        return offset_x, offset_y
+
+
+class LookaheadFollow(LerpFollow):
+    """
+    Smoothly follows a point ahead of the target on its horizontal moving direction so that more of what comes next
+    is shown. The direction is kept while the target stands still.
+    """
+
+    _distance: int
+    _previous_x: Optional[int]
+    _direction: int
+
+    def __init__(self, distance: int = CAMERA_LOOKAHEAD_DISTANCE, fraction: float = SCROLLING_OFFSET_FRACTION) -> None:
+        super().__init__(fraction)
+
+        self._distance = distance
+        self._previous_x = None
+        self._direction = 0
+
+    def follow(self, offset: Tuple[float, float], target: Rect, view_size: Tuple[int, int]) -> Tuple[float, float]:
+        if self._previous_x is not None and target.x != self._previous_x:
+            self._direction = 1 if target.x > self._previous_x else -1
+
+        self._previous_x = target.x
+        offset_x, offset_y = super().follow(offset, target, view_size)
+
+        return offset_x - self._direction * self._distance * self._fraction, offset_y
+
+
+def build_follow_strategy(follow: str = CAMERA_FOLLOW) -> FollowStrategy:
+    """
+    Builds one of the CAMERA_FOLLOWS strategies with its default settings.
+    """
+    assert follow in CAMERA_FOLLOWS, f"Unknown camera follow: {follow}"
+
+    if follow == "deadzone":
+        return DeadzoneFollow()
+
+    if follow == "lookahead":
+        return LookaheadFollow()
+
+    return LerpFollow()
+
 
 class Camera:
     """
     Models a camera object which is used to apply offsets to sprites' rects in
     order to create a scrolling effect.
+
+    The camera is updated in place: its rects are never rebuilt. It follows any target rect according to its follow
+    strategy and is clamped so that nothing beyond its bounds (by default, the map) is shown.
     """
 
     _rect: Rect
+    _view_rect: Rect  # area of the world seen through the camera
+    _bounds: Rect
+    _follow: FollowStrategy
+    _previous_offset: Tuple[int, int]  # offset before the last update: used for interpolation
     _width: int
     _height: int
 
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        view_size: Tuple[int, int] = RAW_DISPLAY_SIZE,
+        follow: Optional[FollowStrategy] = None,
+        bounds: Optional[Rect] = None,
+    ) -> None:
         self._rect = Rect(0, 0, width, height)  # stores the offset
+        self._view_rect = Rect((0, 0), view_size)
+        self._bounds = Rect(bounds) if bounds is not None else Rect(0, 0, width, height)
+        self._follow = follow if follow is not None else build_follow_strategy()
+        self._previous_offset = self._rect.topleft
         self._width = width
         self._height = height
 
@@ -28,6 +154,22 @@ class Camera:
     def rect(self) -> Rect:
         return self._rect
 
+    @property
+    def view_rect(self) -> Rect:
+        return self._view_rect
+
+    @property
+    def bounds(self) -> Rect:
+        return self._bounds
+
+    @bounds.setter
+    def bounds(self, bounds: Rect) -> None:
+        self._bounds.update(bounds)
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        return self._rect.topleft
+
     @property
     def width(self) -> int:
         return self._width
@@ -39,19 +181,43 @@ class Camera:
     def apply_offset(self, rect: Rect) -> Rect:
         return rect.move(self._rect.topleft)
 
-    def update(self, target_rect: Player) -> None:
-        offset_x = (
-            self._rect.x + ((-target_rect.rect.x + RAW_DISPLAY_SIZE[0] / 2) - self._rect.x) * SCROLLING_OFFSET_FRACTION
-        )
-        offset_y = (
-            self._rect.y + ((-target_rect.rect.y + RAW_DISPLAY_SIZE[1] / 2) - self._rect.y) * SCROLLING_OFFSET_FRACTION
+    def apply_offset_ip(self, rect: Rect) -> None:
+        """
+        Moves the rect from world to screen coordinates in place.
+        """
+        rect.move_ip(self._rect.topleft)
+
+    def world_to_screen(self, positions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Transforms an array of world positions of shape (n, 2) into screen positions at once. If out is given
+        (e.g., the positions array itself), the result is written into it instead of a new array.
+        """
+        return np.add(positions, self._rect.topleft, out=out)
+
+    def interpolated_offset(self, alpha: float) -> Tuple[int, int]:
+        """
+        Returns the offset between the offsets before and after the last update, according to alpha (the fraction of a
+        simulation step that has elapsed since the last update).
+        """
+        previous_x, previous_y = self._previous_offset
+
+        return (
+            round(previous_x + (self._rect.x - previous_x) * alpha),
+            round(previous_y + (self._rect.y - previous_y) * alpha),
         )
 
-        # clamp offsets so that nothing beyond the map is shown
-        offset_x = min(0, offset_x)  # left
-        offset_y = min(0, offset_y)  # top
+    @profiled("Camera.update")
+    def update(self, target: Rect) -> None:
+        """
+        Moves the camera towards the target rect (according to the follow strategy) and clamps it to the bounds.
+        """
+        self._previous_offset = self._rect.topleft
+        view_width, view_height = self._view_rect.size
+        offset_x, offset_y = self._follow.follow(self._rect.topleft, target, (view_width, view_height))
 
-        offset_x = max(-(self.width - RAW_DISPLAY_SIZE[0]), offset_x)  # right
-        offset_y = max(-(self.height - RAW_DISPLAY_SIZE[1]), offset_y)  # bottom
+        # clamp offsets so that nothing beyond the bounds is shown
+        offset_x = max(-(self._bounds.right - view_width), min(-self._bounds.left, offset_x))
+        offset_y = max(-(self._bounds.bottom - view_height), min(-self._bounds.top, offset_y))
 
-        self._rect = Rect(offset_x, offset_y, self.width, self.height)
+        self._rect.topleft = int(offset_x), int(offset_y)  # truncated, not rounded
+        self._view_rect.topleft = -self._rect.x, -self._rect.y
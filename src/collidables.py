@@ -1,10 +1,21 @@
 """
 Module with sprites definitions.
 """
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
 from pygame.rect import Rect
 from pygame.sprite import AbstractGroup
+from pygame.sprite import Group
 from pygame.sprite import Sprite
 
+from src.settings import TILE_SIZE
+
+GridCell = Tuple[int, int]  # (column, row) of a cell inside the uniform grid
+
 
 class Collidable(Sprite):
     """
@@ -12,7 +23,145 @@ class Collidable(Sprite):
     """
 
     def __init__(self, x: int, y: int, width: int, height: int, *groups: AbstractGroup) -> None:
+        self.rect = Rect(x, y, width, height)  # set before joining the groups as they may index it
+        self.image = None
+
         super().__init__(*groups)
 
-        self.rect = Rect(x, y, width, height)
-        self.image = None
+
+class CollidablesGroup(Group):
+    """
+    Group of static collidables which are also indexed in a uniform grid (spatial hash) of cell_size cells. Hence,
+    collision queries only test the collidables registered in the cells overlapped by the queried rect instead of
+    testing every collidable of the group.
+
+    As the collidables are static, their rects must not be moved after being added to the group.
+    """
+
+    _cell_size: int
+    _cells: Dict[GridCell, List[Sprite]]
+
+    def __init__(self, *sprites: Sprite, cell_size: int = TILE_SIZE) -> None:
+        self._cell_size = cell_size
+        self._cells = {}
+
+        super().__init__(*sprites)
+
+    @property
+    def cell_size(self) -> int:
+        return self._cell_size
+
+    def add_internal(self, sprite: Sprite, layer=None) -> None:
+        super().add_internal(sprite, layer)
+
+        for cell in self._cells_of(sprite.rect):
+            self._cells.setdefault(cell, []).append(sprite)
+
+    def remove_internal(self, sprite: Sprite) -> None:
+        super().remove_internal(sprite)
+
+        for cell in self._cells_of(sprite.rect):
+            cell_sprites = self._cells[cell]
+            cell_sprites.remove(sprite)
+
+            if not cell_sprites:
+                del self._cells[cell]
+
+    def candidates(self, rect: Rect) -> List[Sprite]:
+        """
+        Returns the (unique) collidables registered in the cells overlapped by the rect. These are the only
+        collidables that may collide with the rect, but they are not guaranteed to collide with it.
+        """
+        found: Dict[int, Sprite] = {}  # keyed by id to remove duplicates of collidables spanning many cells
+
+        for cell in self._cells_of(rect):
+            for sprite in self._cells.get(cell, ()):
+                found[id(sprite)] = sprite
+
+        return [*found.values()]
+
+    def movement_candidates(self, rect: Rect, dx: float, dy: float) -> List[Sprite]:
+        """
+        Returns the collidables that may be hit by the rect when it's moved by (dx, dy), that is, the candidates of
+        the area swept by the movement. Any moving sprite can use this to fetch its nearby collidables once per frame.
+        """
+        return self.candidates(rect.union(rect.move(dx, dy)))
+
+    def collide(self, rect: Rect) -> List[Sprite]:
+        """
+        Returns the collidables that collide with the rect, just like pygame.sprite.spritecollide does but
+        only testing the nearby collidables.
+        """
+        return [sprite for sprite in self.candidates(rect) if rect.colliderect(sprite.rect)]
+
+    def _cells_of(self, rect: Rect) -> Iterator[GridCell]:
+        """
+        Yields all the grid cells overlapped by the rect.
+        """
+        first_column, first_row = rect.left // self._cell_size, rect.top // self._cell_size
+        last_column = (rect.right - 1) // self._cell_size if rect.width > 0 else first_column
+        last_row = (rect.bottom - 1) // self._cell_size if rect.height > 0 else first_row
+
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                yield column, row
+
+
+def sweep_x(rect: Rect, dx: int, candidates: List[Sprite]) -> Tuple[int, Optional[Sprite]]:
+    """
+    Sweeps the rect horizontally by dx against the candidates (continuous collision): returns how far the rect can
+    move before its time of impact and the collidable it hits first, if any. Thus, fast rects never tunnel through
+    thin collidables. Candidates that already overlap the rect are ignored so that it can move out of them.
+    """
+    hit = None
+
+    if dx > 0:
+        limit = rect.right + dx
+
+        for candidate in candidates:
+            other = candidate.rect
+            if other.top < rect.bottom and other.bottom > rect.top and rect.right <= other.left < limit:
+                limit, hit = other.left, candidate
+
+        return limit - rect.right, hit
+
+    if dx < 0:
+        limit = rect.left + dx
+
+        for candidate in candidates:
+            other = candidate.rect
+            if other.top < rect.bottom and other.bottom > rect.top and limit < other.right <= rect.left:
+                limit, hit = other.right, candidate
+
+        return limit - rect.left, hit
+
+    return 0, None
+
+
+def sweep_y(rect: Rect, dy: int, candidates: List[Sprite]) -> Tuple[int, Optional[Sprite]]:
+    """
+    Sweeps the rect vertically by dy against the candidates. See sweep_x.
+    """
+    hit = None
+
+    if dy > 0:
+        limit = rect.bottom + dy
+
+        for candidate in candidates:
+            other = candidate.rect
+            if other.left < rect.right and other.right > rect.left and rect.bottom <= other.top < limit:
+                limit, hit = other.top, candidate
+
+        return limit - rect.bottom, hit
+
+    if dy < 0:
+        limit = rect.top + dy
+
+        for candidate in candidates:
+            other = candidate.rect
+            if other.left < rect.right and other.right > rect.left and limit < other.bottom <= rect.top:
+                limit, hit = other.bottom, candidate
+
+        return limit - rect.top, hit
+
+    return 0, None
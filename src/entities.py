@@ -0,0 +1,247 @@
+"""
+Module with the entity factory which builds the entities of a level from the objects of its tmx objects layer, and
+with the compact storage of the level's static objects.
+"""
+from array import array
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from pygame.rect import Rect
+from pygame.sprite import AbstractGroup
+from pygame.sprite import Sprite
+from pygame.surface import Surface
+from pytmx import TiledObject
+
+from src.settings import STATIC_OBJECTS_CELL_SIZE
+from src.settings import STATIC_OBJECTS_MARGIN
+
+GridCell = Tuple[int, int]  # (column, row) of a cell inside the uniform grid
+EntityBuilder = Callable[[TiledObject], Optional[Sprite]]  # builds the live entity of a tmx object, if any
+
+STATIC_SPRITE_LAYER = -1  # promoted static objects are drawn behind the other sprites of layered groups
+
+
+class StaticSprite(Sprite):
+    """
+    Sprite of a static object promoted while it's near the camera.
+    """
+
+    index: int  # index of the static object's record
+    kind: str
+
+    def __init__(self, index: int, kind: str, rect: Rect, image: Optional[Surface], *groups: AbstractGroup) -> None:
+        self.index = index
+        self.kind = kind
+        self._layer = STATIC_SPRITE_LAYER  # read through Sprite.layer
+        self.rect = rect
+        self.image = image
+
+        super().__init__(*groups if image is not None else ())  # objects without images aren't drawn
+
+
+class StaticObjects:
+    """
+    Static objects of a level (e.g., decorations) stored as array backed records: their kind, rect and image take a
+    few bytes per object instead of a full sprite each. Records are indexed in a uniform grid of cell_size cells.
+
+    On each update, only the records in the cells near the camera view (within margin pixels) are promoted to
+    StaticSprites, which join the given groups, and the promoted records that are no longer near the view are demoted
+    (their sprites are killed). Promotions only change when the view reaches other cells, so levels with tens of
+    thousands of objects only iterate over the few nearby ones.
+    """
+
+    _groups: Tuple[AbstractGroup, ...]
+    _cell_size: int
+    _margin: int
+    _kinds: List[str]  # kind id -> kind
+    _kind_ids: Dict[str, int]
+    _images: List[Optional[Surface]]  # image id -> image, shared by the records
+    _image_ids: Dict[int, int]  # id of an image -> image id
+    _xs: "array[int]"
+    _ys: "array[int]"
+    _widths: "array[int]"
+    _heights: "array[int]"
+    _record_kinds: "array[int]"  # kind id of each record
+    _record_images: "array[int]"  # image id of each record
+    _cells: Dict[GridCell, "array[int]"]  # records registered in each cell
+    _promoted_cells: FrozenSet[GridCell]
+    _promoted: Dict[int, StaticSprite]  # record index -> promoted sprite
+
+    def __init__(
+        self,
+        *groups: AbstractGroup,
+        cell_size: int = STATIC_OBJECTS_CELL_SIZE,
+        margin: int = STATIC_OBJECTS_MARGIN,
+    ) -> None:
+        self._groups = groups
+        self._cell_size = cell_size
+        self._margin = margin
+        self._kinds = []
+        self._kind_ids = {}
+        self._images = [None]  # image id 0: no image
+        self._image_ids = {}
+        self._xs, self._ys = array("i"), array("i")
+        self._widths, self._heights = array("i"), array("i")
+        self._record_kinds, self._record_images = array("H"), array("H")
+        self._cells = {}
+        self._promoted_cells = frozenset()
+        self._promoted = {}
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    @property
+    def promoted_sprites(self) -> List[StaticSprite]:
+        return [*self._promoted.values()]
+
+    def add(self, kind: str, x: int, y: int, width: int, height: int, image: Optional[Surface] = None) -> int:
+        """
+        Stores the record of a static object. Returns its index. Objects added near the view are only promoted on the
+        next update that reaches other cells.
+        """
+        if kind not in self._kind_ids:
+            self._kind_ids[kind] = len(self._kinds)
+            self._kinds.append(kind)
+
+        image_id = 0
+
+        if image is not None:
+            if id(image) not in self._image_ids:
+                self._image_ids[id(image)] = len(self._images)
+                self._images.append(image)
+
+            image_id = self._image_ids[id(image)]
+
+        index = len(self._xs)
+        self._xs.append(x)
+        self._ys.append(y)
+        self._widths.append(width)
+        self._heights.append(height)
+        self._record_kinds.append(self._kind_ids[kind])
+        self._record_images.append(image_id)
+
+        for cell in self._cells_of(Rect(x, y, width, height)):
+            self._cells.setdefault(cell, array("i")).append(index)
+
+        return index
+
+    def kind_of(self, index: int) -> str:
+        return self._kinds[self._record_kinds[index]]
+
+    def rect_of(self, index: int) -> Rect:
+        return Rect(self._xs[index], self._ys[index], self._widths[index], self._heights[index])
+
+    def image_of(self, index: int) -> Optional[Surface]:
+        return self._images[self._record_images[index]]
+
+    def update(self, view_rect: Rect) -> None:
+        """
+        Promotes the records near the view (in world coordinates, e.g., the camera's view rect) and demotes the
+        promoted ones that are no longer near it. Records are promoted in index order, so that promotions are
+        deterministic.
+        """
+        near_rect = view_rect.inflate(2 * self._margin, 2 * self._margin)
+        near_cells = frozenset(cell for cell in self._cells_of(near_rect) if cell in self._cells)
+
+        if near_cells == self._promoted_cells:
+            return
+
+        near_indexes: Set[int] = set()
+
+        for cell in near_cells:
+            near_indexes.update(self._cells[cell])
+
+        for index in self._promoted.keys() - near_indexes:
+            self._promoted.pop(index).kill()
+
+        for index in sorted(near_indexes - self._promoted.keys()):
+            self._promoted[index] = StaticSprite(
+                index, self.kind_of(index), self.rect_of(index), self.image_of(index), *self._groups
+            )
+
+        self._promoted_cells = near_cells
+
+    def _cells_of(self, rect: Rect) -> Iterator[GridCell]:
+        """
+        Yields the grid cells overlapped by the rect.
+        """
+        cell_size = self._cell_size
+        right, bottom = max(rect.left, rect.right - 1), max(rect.top, rect.bottom - 1)
+
+        for column in range(rect.left // cell_size, right // cell_size + 1):
+            for row in range(rect.top // cell_size, bottom // cell_size + 1):
+                yield column, row
+
+
+class EntityFactory:
+    """
+    Builds the entities of a level from tmx objects, keyed by the object's name or, if its name isn't registered, by
+    its type.
+
+    Live entities (e.g., the player) are built by their registered builders. Static objects (e.g., decorations) are
+    stored as records of a StaticObjects store instead, which promotes them to sprites only near the camera. Tile
+    objects (objects with an image) which aren't registered are static objects too, while other unregistered objects
+    are left to whoever handles them (e.g., collidables).
+    """
+
+    _builders: Dict[str, EntityBuilder]
+    _static_keys: Set[str]
+
+    def __init__(self) -> None:
+        self._builders = {}
+        self._static_keys = set()
+
+    def register(self, key: str, builder: EntityBuilder) -> None:
+        """
+        Registers the builder of the live entities of a tmx object name or type.
+        """
+        self._builders[key] = builder
+
+    def register_static(self, key: str) -> None:
+        """
+        Registers a tmx object name or type whose objects are static objects.
+        """
+        self._static_keys.add(key)
+
+    def key_of(self, tiled_object: TiledObject) -> Optional[str]:
+        """
+        Returns the registered key of a tmx object (its name first, then its type), if any.
+        """
+        for key in (tiled_object.name, tiled_object.type):
+            if key is not None and (key in self._builders or key in self._static_keys):
+                return key
+
+        return None
+
+    def build(self, tiled_objects: Iterable[TiledObject], static_objects: StaticObjects) -> List[Sprite]:
+        """
+        Builds the entities of the tmx objects: returns the live entities and stores the static objects.
+        """
+        entities = []
+
+        for tiled_object in tiled_objects:
+            key = self.key_of(tiled_object)
+
+            if key in self._builders:
+                entity = self._builders[key](tiled_object)
+
+                if entity is not None:
+                    entities.append(entity)
+            elif key is not None or tiled_object.image is not None:
+                static_objects.add(
+                    key or tiled_object.name or tiled_object.type or "",
+                    int(tiled_object.x),
+                    int(tiled_object.y),
+                    int(tiled_object.width),
+                    int(tiled_object.height),
+                    tiled_object.image,
+                )
+
+        return entities
@@ -0,0 +1,105 @@
+"""
+Module with the collection of per phase frame timings.
+"""
+import csv
+from pathlib import Path
+from typing import ContextManager
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+from src.profiler import PROFILER
+from src.profiler import TimingScope
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameTimings:
+    """
+    Collects how long each phase of each frame took (e.g., input, player update, map blit) so that their percentiles
+    can be reported. A phase may run many times in a frame (e.g., one player update per simulation step): its
+    durations are summed up into the frame.
+
+    When disabled, phases are no-op scopes so the game loop can always be instrumented. Phases are also scopes of
+    the game profiler, whenever it's enabled.
+    """
+
+    _enabled: bool
+    _phases: Dict[str, List[float]]  # seconds of each frame, per phase
+    _frame_phases: Dict[str, float]  # seconds of the current frame, per phase
+    _frames: int
+
+    def __init__(self, enabled: bool = True) -> None:
+        self._enabled = enabled
+        self._phases = {}
+        self._frame_phases = {}
+        self._frames = 0
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """
+        Returns a context manager that measures the time spent inside it as part of the phase of the current frame.
+        """
+        return TimingScope(self._record_phase, name) if self._enabled else PROFILER.scope(name)
+
+    def add(self, name: str, seconds: float) -> None:
+        self._frame_phases[name] = self._frame_phases.get(name, 0) + seconds
+
+    def end_frame(self) -> None:
+        """
+        Stores the current frame timings. Phases that didn't run in the frame are stored as zero.
+        """
+        if not self._enabled:
+            return
+
+        for name in self._frame_phases:
+            if name not in self._phases:
+                self._phases[name] = [0.0] * self._frames  # phases that ran for the first time
+
+        for name, durations in self._phases.items():
+            durations.append(self._frame_phases.get(name, 0.0))
+
+        self._frame_phases = {}
+        self._frames += 1
+
+    def percentiles(self, name: str) -> Tuple[float, ...]:
+        """
+        Returns the p50, p95 and p99 durations (seconds) of a phase.
+        """
+        return tuple(np.percentile(self._phases[name], PERCENTILES))
+
+    def report(self) -> str:
+        """
+        Builds a table with the percentiles (ms) of every phase.
+        """
+        header = f"{'phase':>16} | " + " | ".join(f"{f'p{percentile} (ms)':>10}" for percentile in PERCENTILES)
+        lines = [f"frames: {self._frames}", header]
+
+        for name in self._phases:
+            lines.append(f"{name:>16} | " + " | ".join(f"{p * 1000:>10.3f}" for p in self.percentiles(name)))
+
+        return "\n".join(lines)
+
+    def write_trace(self, trace_path: Path) -> None:
+        """
+        Writes the per frame timings (ms) of every phase, plus their total, to a csv file: one row per frame.
+        """
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(trace_path, "w", newline="") as trace_file:
+            writer = csv.writer(trace_file)
+            writer.writerow(["frame", *self._phases, "total"])
+
+            for frame, durations in enumerate(zip(*self._phases.values())):
+                writer.writerow([frame, *(f"{d * 1000:.3f}" for d in durations), f"{sum(durations) * 1000:.3f}"])
+
+    def _record_phase(self, name: str, start: float, end: float) -> None:
+        self.add(name, end - start)
+
+        if PROFILER.enabled:
+            PROFILER.add(name, start, end)
@@ -0,0 +1,31 @@
+"""
+Module with the scripted player inputs used when the game runs headless (without a window).
+"""
+from itertools import cycle
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from src.inputs import CapturedInput
+
+# (frames to wait before the input, input): runs right, jumps, runs left, jumps, stops and idles
+INPUTS_SCRIPT: List[Tuple[int, CapturedInput]] = [
+    (0, CapturedInput(moving_right=True)),
+    (45, CapturedInput(has_jumped=True)),
+    (45, CapturedInput(moving_right_stop=True, moving_left=True)),
+    (30, CapturedInput(has_jumped=True)),
+    (60, CapturedInput(moving_left_stop=True)),
+    (60, CapturedInput()),
+]
+
+
+def scripted_player_inputs(inputs_script: List[Tuple[int, CapturedInput]] = INPUTS_SCRIPT) -> Iterator[CapturedInput]:
+    """
+    Yields one captured input per frame according to the inputs script, which is repeated forever. Frames without
+    scripted inputs yield an empty input.
+    """
+    for frames_to_wait, captured_input in cycle(inputs_script):
+        for _ in range(frames_to_wait):
+            yield CapturedInput()
+
+        yield captured_input
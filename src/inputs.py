@@ -2,6 +2,7 @@
 Module with with player input DTOs.
 """
 from dataclasses import dataclass
+from dataclasses import fields
 
 import pygame
 from pygame.constants import K_LEFT
@@ -56,3 +57,25 @@ def capture_player_inputs() -> CapturedInput:
                 captured_input.moving_left_stop = True
 
     return captured_input
+
+
+def merge_captured_inputs(first_input: CapturedInput, second_input: CapturedInput) -> CapturedInput:
+    """
+    Merges two captured inputs, the second one being the newer: the events of both are kept, but a direction pressed
+    or stopped in the newer input overrides what the older one did with that direction (e.g., a key pressed again
+    right after being released keeps moving). Used to keep the inputs captured on frames in which no simulation step
+    consumed them.
+    """
+    merged_input = CapturedInput(
+        **{
+            field.name: getattr(first_input, field.name) or getattr(second_input, field.name)
+            for field in fields(first_input)
+        }
+    )
+
+    for moving, moving_stop in (("moving_left", "moving_left_stop"), ("moving_right", "moving_right_stop")):
+        if getattr(second_input, moving) or getattr(second_input, moving_stop):
+            setattr(merged_input, moving, getattr(second_input, moving))
+            setattr(merged_input, moving_stop, getattr(second_input, moving_stop))
+
+    return merged_input
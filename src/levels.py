@@ -0,0 +1,161 @@
+"""
+Module with the levels streaming: levels are loaded in the background and kept in a bounded LRU cache.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict
+from typing import Optional
+
+from src.maps import ChunkedMapRenderer
+from src.maps import TiledMap
+from src.settings import LEVELS_CACHE_SIZE
+from src.settings import LEVELS_MEMORY_BUDGET
+
+
+@dataclass
+class Level:
+    """
+    Represents a loaded level: its parsed map and its map renderer with all chunks already rendered.
+    """
+
+    map_file_name: str
+    tiled_map: TiledMap
+    map_renderer: ChunkedMapRenderer
+
+    @property
+    def memory_size(self) -> int:
+        return self.map_renderer.memory_size
+
+    def release(self) -> None:
+        """
+        Releases the level's shared assets once it's unloaded.
+        """
+        self.tiled_map.release_assets()
+
+
+def load_level(map_file_name: str, assets_maps_folder: str = "assets/maps") -> Level:
+    """
+    Parses a level's tmx file (and its tiles) and renders all of its map chunks.
+    """
+    tiled_map = TiledMap(map_file_name, assets_maps_folder)
+    map_renderer = ChunkedMapRenderer(tiled_map)
+    map_renderer.prerender()
+
+    return Level(map_file_name, tiled_map, map_renderer)
+
+
+class LevelManager:
+    """
+    Loads levels on a background worker thread so that the game loop never stalls parsing tmx files or rendering
+    map chunks: levels are preloaded ahead of time and handed over once they're ready.
+
+    Loaded levels are kept in a LRU cache bounded by a number of levels and by a memory budget. The least recently
+    used levels are evicted first, but the most recently used level is never evicted. Evicted levels release their
+    shared assets (see src/assets.py).
+    """
+
+    _assets_maps_folder: str
+    _max_levels: int
+    _memory_budget: int
+    _executor: ThreadPoolExecutor
+    _loading: Dict[str, "Future[Level]"]
+    _levels: "OrderedDict[str, Level]"
+    _lock: Lock
+
+    def __init__(
+        self,
+        assets_maps_folder: str = "assets/maps",
+        max_levels: int = LEVELS_CACHE_SIZE,
+        memory_budget: int = LEVELS_MEMORY_BUDGET,
+    ) -> None:
+        self._assets_maps_folder = assets_maps_folder
+        self._max_levels = max_levels
+        self._memory_budget = memory_budget
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-loader")
+        self._loading = {}
+        self._levels = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def loaded_levels(self) -> int:
+        return len(self._levels)
+
+    @property
+    def memory_size(self) -> int:
+        return sum(level.memory_size for level in self._levels.values())
+
+    def preload(self, map_file_name: str) -> None:
+        """
+        Starts loading a level in the background, unless it's already loaded or loading.
+        """
+        with self._lock:
+            if map_file_name not in self._levels and map_file_name not in self._loading:
+                self._loading[map_file_name] = self._executor.submit(
+                    load_level, map_file_name, self._assets_maps_folder
+                )
+
+    def is_ready(self, map_file_name: str) -> bool:
+        """
+        Checks whether a level can be handed over without blocking.
+        """
+        with self._lock:
+            future = self._loading.get(map_file_name)
+
+            return map_file_name in self._levels or (future is not None and future.done())
+
+    def get(self, map_file_name: str) -> Optional[Level]:
+        """
+        Hands over a level if it's ready, otherwise returns None (never blocks the game loop).
+        """
+        if not self.is_ready(map_file_name):
+            return None
+
+        return self.load(map_file_name)
+
+    def load(self, map_file_name: str) -> Level:
+        """
+        Hands over a level, waiting for it to be loaded if needed (e.g., the first level of the game).
+        """
+        self.preload(map_file_name)
+
+        with self._lock:
+            future = self._loading.get(map_file_name)
+
+        if future is not None:
+            try:
+                level = future.result()  # raises the loading error, if any
+            except Exception:
+                with self._lock:
+                    self._loading.pop(map_file_name, None)  # failed loads are tried again
+
+                raise
+
+            with self._lock:
+                self._loading.pop(map_file_name, None)
+                self._levels[map_file_name] = level
+
+        with self._lock:
+            level = self._levels[map_file_name]
+            self._levels.move_to_end(map_file_name)  # most recently used
+            self._evict()
+
+        return level
+
+    def shutdown(self) -> None:
+        """
+        Stops the background worker, cancelling the levels that haven't started loading yet.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evict(self) -> None:
+        """
+        Evicts the least recently used levels until the cache fits its bounds, keeping the most recently used one.
+        """
+        while len(self._levels) > 1 and (
+            len(self._levels) > self._max_levels or self.memory_size > self._memory_budget
+        ):
+            _, level = self._levels.popitem(last=False)
+            level.release()
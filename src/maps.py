@@ -1,27 +1,186 @@
 """
 Module with some maps of the levels.
 """
+import json
+import os
+from functools import partial
+from pathlib import Path
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
 from typing import Tuple
 
+import pygame
 import pytmx
+from pygame.rect import Rect
 from pygame.surface import Surface
 
+from src.assets import ASSET_REGISTRY
+from src.assets import AssetHandle
+from src.profiler import profiled
+from src.settings import ASSETS_CACHE_DIR
 from src.settings import CLEAR_DISPLAY_RGB
+from src.settings import MAP_CHUNK_SIZE
 from src.settings import ROOT_DIR
+from src.settings import TMX_LAYER_PARALLAX_PROPERTY
+from src.settings import TMX_LAYER_REPEAT_X_PROPERTY
+from src.settings import TMX_OBJECT_COLLIDABLE_NAME
+from src.settings import TMX_TILE_SOLID_PROPERTY
+from src.utils import folder_digest
+from src.utils import is_source_unchanged
+from src.utils import source_key
+
+ChunkKey = Tuple[int, int]  # (column, row) of a chunk inside the chunk grid
+
+
+def mesh_rects(rects: Iterable[Rect]) -> List[Rect]:
+    """
+    Merges adjacent or overlapping rects into a small set of larger rects covering exactly the same area. Greedy
+    meshing is tried both horizontally and vertically and the smallest result is kept, unless the (deduplicated)
+    rects themselves are already fewer.
+    """
+    rects = _deduplicate([Rect(rect) for rect in rects if rect.width > 0 and rect.height > 0])
+    transposed_rects = [Rect(rect.y, rect.x, rect.height, rect.width) for rect in rects]
+    vertical_mesh = [Rect(rect.y, rect.x, rect.height, rect.width) for rect in _greedy_mesh(transposed_rects)]
+
+    return min(_greedy_mesh(rects), vertical_mesh, rects, key=len)
+
+
+def _deduplicate(rects: List[Rect]) -> List[Rect]:
+    return [*{tuple(rect): rect for rect in rects}.values()]
+
+
+def _greedy_mesh(rects: List[Rect]) -> List[Rect]:
+    """
+    Greedy meshing: the rects' edges split their area into a grid of cells which are then grouped, row by row, into
+    the widest and then tallest rects possible. The resulting rects don't overlap.
+    """
+    if not rects:
+        return []
+
+    xs = sorted({rect.left for rect in rects} | {rect.right for rect in rects})
+    ys = sorted({rect.top for rect in rects} | {rect.bottom for rect in rects})
+    x_index = {x: i for i, x in enumerate(xs)}
+    y_index = {y: j for j, y in enumerate(ys)}
+    columns, rows = len(xs) - 1, len(ys) - 1
+
+    # cells covered by any rect
+    covered = [[False] * columns for _ in range(rows)]
+
+    for rect in rects:
+        for j in range(y_index[rect.top], y_index[rect.bottom]):
+            for i in range(x_index[rect.left], x_index[rect.right]):
+                covered[j][i] = True
+
+    meshed_rects = []
+
+    for j in range(rows):
+        i = 0
+
+        while i < columns:
+            if not covered[j][i]:
+                i += 1
+                continue
+
+            # grows to the right, then downwards while the whole row span is covered
+            i_end = i
+            while i_end < columns and covered[j][i_end]:
+                i_end += 1
+
+            j_end = j + 1
+            while j_end < rows and all(covered[j_end][i:i_end]):
+                j_end += 1
+
+            for covered_row in covered[j:j_end]:
+                covered_row[i:i_end] = [False] * (i_end - i)
+
+            meshed_rects.append(Rect(xs[i], ys[j], xs[i_end] - xs[i], ys[j_end] - ys[j]))
+            i = i_end
+
+    return meshed_rects
+
+
+class TileAnimations:
+    """
+    Frame clocks of the animated tiles of a map (Tiled tile animations): one clock per animated gid, shared by all
+    the tiles of the map with that gid. The clocks only tell which frame each animated gid shows: redrawing the tiles
+    is up to the renderers.
+    """
+
+    _frames: Dict[int, List[Tuple[int, int]]]  # animated gid -> (frame gid, duration in ms) of its frames
+    _indexes: Dict[int, int]  # animated gid -> index of its current frame
+    _times: Dict[int, float]  # animated gid -> ms elapsed on its current frame
+    _current_gids: Dict[int, int]  # animated gid -> gid of its current frame
+
+    def __init__(self, tmx_map: pytmx.TiledMap) -> None:
+        self._frames = {
+            gid: [(frame.gid, max(1, frame.duration)) for frame in properties["frames"]]
+            for gid, properties in tmx_map.tile_properties.items()
+            if properties.get("frames")
+        }
+        self._indexes = {gid: 0 for gid in self._frames}
+        self._times = {gid: 0 for gid in self._frames}
+        self._current_gids = {gid: frames[0][0] for gid, frames in self._frames.items()}
+
+    @property
+    def gids(self) -> List[int]:
+        return [*self._frames]
+
+    @property
+    def current_gids(self) -> Dict[int, int]:
+        return self._current_gids
+
+    def update(self, dt: float) -> List[int]:
+        """
+        Advances all the clocks by dt seconds. Returns the animated gids whose frame has changed.
+        """
+        changed_gids = []
+
+        for gid, frames in self._frames.items():
+            index, time = self._indexes[gid], self._times[gid] + dt * 1000
+
+            while time >= frames[index][1]:
+                time -= frames[index][1]
+                index = (index + 1) % len(frames)
+
+            self._times[gid] = time
+
+            if index != self._indexes[gid]:
+                self._indexes[gid] = index
+                self._current_gids[gid] = frames[index][0]
+                changed_gids.append(gid)
+
+        return changed_gids
 
 
 class TiledMap:
 
+    _map_path: Path
     _total_map_width: int
     _total_map_height: int
     _tmx_map: pytmx.TiledMap  # parsed tmx data
+    _animations: TileAnimations
+    _asset_handles: List[AssetHandle]  # tiles shared through the asset registry
 
     def __init__(self, map_file_name: str, assets_maps_folder: str = "assets/maps") -> None:
-        tm = pytmx.load_pygame(ROOT_DIR.joinpath(assets_maps_folder, map_file_name), pixelalpha=True)
+        self._map_path = ROOT_DIR.joinpath(assets_maps_folder, map_file_name)
+        self._asset_handles = []
+        tileset_handles: List[AssetHandle] = []
+        image_loader = partial(
+            ASSET_REGISTRY.tile_image_loader, handles=self._asset_handles, tileset_handles=tileset_handles
+        )
+        tm = pytmx.TiledMap(str(self._map_path), image_loader=image_loader, pixelalpha=True)
+
+        for tileset_handle in tileset_handles:
+            tileset_handle.release()  # tiles are loaded: the registry may evict the tilesets
 
         self._total_map_width = tm.width * tm.tilewidth
         self._total_map_height = tm.height * tm.tileheight
         self._tmx_map = tm
+        self._animations = TileAnimations(tm)
 
     @property
     def total_map_width(self) -> int:
@@ -35,22 +194,443 @@ class TiledMap:
     def tmx_map(self) -> pytmx.TiledMap:
         return self._tmx_map
 
+    @property
+    def animations(self) -> TileAnimations:
+        return self._animations
+
+    @property
+    def tile_layers(self) -> List[pytmx.TiledTileLayer]:
+        """
+        Visible tile layers, in drawing order.
+        """
+        return [layer for layer in self._tmx_map.visible_layers if isinstance(layer, pytmx.TiledTileLayer)]
+
+    @property
+    def scrolling_layers(self) -> List[pytmx.TiledTileLayer]:
+        """
+        Visible tile layers which scroll along with the camera (no parallax).
+        """
+        return [layer for layer in self.tile_layers if layer_parallax(layer) == 1]
+
+    def release_assets(self) -> None:
+        """
+        Releases the map's tiles so that the asset registry can evict them (e.g., once the level is
+        unloaded). The map must not be rendered afterwards.
+        """
+        for asset_handle in self._asset_handles:
+            asset_handle.release()
+
+        self._asset_handles.clear()
+
+    @profiled("TiledMap.render_on")
     def render_on(self, raw_display: Surface) -> None:
-        for visible_layer in self._tmx_map.visible_layers:
-            # only visible layers
-            if isinstance(visible_layer, pytmx.TiledTileLayer):
-                for x, y, gid in visible_layer:
-                    tile: Surface = self._tmx_map.get_tile_image_by_gid(gid)
+        self.render_tiles_on(raw_display, Rect(0, 0, self._tmx_map.width, self._tmx_map.height))
+
+    def render_tiles_on(
+        self, surface: Surface, tiles_rect: Rect, layers: Optional[Iterable[pytmx.TiledTileLayer]] = None
+    ) -> None:
+        """
+        Renders only the tiles inside tiles_rect (in tile units, not pixels) on the given surface. The tile at
+        tiles_rect.topleft is blitted at the surface's (0, 0) position. By default, all the visible tile layers are
+        rendered. Animated tiles are rendered with their current frame.
+        """
+        tile_width, tile_height = self._tmx_map.tilewidth, self._tmx_map.tileheight
+        tiles_rect = tiles_rect.clip(Rect(0, 0, self._tmx_map.width, self._tmx_map.height))
+        current_gids = self._animations.current_gids
+
+        for visible_layer in self.tile_layers if layers is None else layers:
+            for y in range(tiles_rect.top, tiles_rect.bottom):
+                layer_row = visible_layer.data[y]
+
+                for x in range(tiles_rect.left, tiles_rect.right):
+                    gid = layer_row[x]
+                    tile: Surface = self._tmx_map.get_tile_image_by_gid(current_gids.get(gid, gid))
 
                     if tile is not None:
-                        raw_display.blit(
+                        surface.blit(
                             tile,
-                            (x * self._tmx_map.tilewidth, y * self._tmx_map.tileheight),
+                            ((x - tiles_rect.x) * tile_width, (y - tiles_rect.y) * tile_height),
                         )
 
+    def solid_tiles_rects(self, layer_name: str, solid_gids: Optional[FrozenSet[int]] = None) -> List[Rect]:
+        """
+        Returns the rects (in map pixels) of the solid tiles of a tile layer. Solid tiles are the ones whose gid is
+        in solid_gids or, if no gids are given, the ones with the solid property set in the tileset.
+        """
+        tile_width, tile_height = self._tmx_map.tilewidth, self._tmx_map.tileheight
+        layer = self._tmx_map.get_layer_by_name(layer_name)
+        solid_tiles_rects = []
+
+        for x, y, gid in layer.iter_data():
+            if gid == 0:
+                continue
+
+            if solid_gids is not None:
+                is_solid = gid in solid_gids
+            else:
+                is_solid = bool((self._tmx_map.get_tile_properties_by_gid(gid) or {}).get(TMX_TILE_SOLID_PROPERTY))
+
+            if is_solid:
+                solid_tiles_rects.append(Rect(x * tile_width, y * tile_height, tile_width, tile_height))
+
+        return solid_tiles_rects
+
+    def collision_rects(
+        self,
+        object_name: str = TMX_OBJECT_COLLIDABLE_NAME,
+        solid_layer_name: Optional[str] = None,
+        solid_gids: Optional[FrozenSet[int]] = None,
+        cache_dir: Path = ASSETS_CACHE_DIR,
+    ) -> List[Rect]:
+        """
+        Returns the collision geometry of the map: the rects of the objects named object_name plus, optionally, the
+        solid tiles of a tile layer, merged into a minimal set of larger rects (see mesh_rects).
+
+        The result is cached on disk per map file and is recomputed only if the tmx file or the arguments change.
+        """
+        cache_path = self.collision_rects_cache_path(cache_dir)
+        arguments = [object_name, solid_layer_name, sorted(solid_gids) if solid_gids is not None else None]
+
+        if cache_path.exists():
+            with open(cache_path) as cache_file:
+                cache = json.load(cache_file)
+
+            if cache["arguments"] == arguments and is_source_unchanged(cache["source"], self._map_path):
+                return [Rect(rect) for rect in cache["rects"]]
+
+        rects = [
+            Rect(tile_object.x, tile_object.y, tile_object.width, tile_object.height)
+            for tile_object in self._tmx_map.objects
+            if tile_object.name == object_name
+        ]
+
+        if solid_layer_name is not None:
+            rects += self.solid_tiles_rects(solid_layer_name, solid_gids)
+
+        collision_rects = mesh_rects(rects)
+        tmp_cache_path = cache_path.with_suffix(".tmp")
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(tmp_cache_path, "w") as cache_file:
+            json.dump(
+                {
+                    "source": source_key(self._map_path),
+                    "arguments": arguments,
+                    "rects": [[*rect] for rect in collision_rects],
+                },
+                cache_file,
+            )
+
+        os.replace(tmp_cache_path, cache_path)  # a cache is never read half written
+
+        return collision_rects
+
+    def collision_rects_cache_path(self, cache_dir: Path = ASSETS_CACHE_DIR) -> Path:
+        """
+        Path of the collision rects cache of the map: named after the map file and a digest of its folder.
+        """
+        return cache_dir.joinpath(f"{self._map_path.stem}-{folder_digest(self._map_path.parent)}.collisions.json")
+
     def build_map(self, clear_color: Tuple[int, int, int] = CLEAR_DISPLAY_RGB) -> Surface:
         tmp = Surface((self.total_map_width, self.total_map_height))
         tmp.fill(clear_color)
         self.render_on(tmp)
 
         return tmp
+
+
+def layer_parallax(layer: pytmx.TiledTileLayer) -> float:
+    """
+    Parallax factor of a tile layer: the fraction of the camera speed at which the layer scrolls. Layers with
+    factors below 1 look farther away and above 1, closer.
+    """
+    return float(layer.properties.get(TMX_LAYER_PARALLAX_PROPERTY, 1))
+
+
+def layer_repeat_x(layer: pytmx.TiledTileLayer) -> bool:
+    return str(layer.properties.get(TMX_LAYER_REPEAT_X_PROPERTY, False)).lower() in ("true", "1")
+
+
+class ParallaxStrip:
+    """
+    Parallax tile layer rendered once into a strip surface which covers only the bounding box of the layer's tiles
+    (e.g., a band of mountains) rather than the whole map. On each frame, the strip is blitted with the camera offset
+    scaled by the layer's parallax factor and only its visible slice is drawn. If the layer repeats horizontally, its
+    tiles are one period of the pattern and the strip is tiled along the x axis.
+    """
+
+    _surface: Surface
+    _rect: Rect  # strip position and size in map pixels
+    _factor: float
+    _repeat_x: bool
+
+    def __init__(self, tiled_map: TiledMap, layer: pytmx.TiledTileLayer, tiles_rect: Rect) -> None:
+        tmx_map = tiled_map.tmx_map
+
+        self._rect = Rect(
+            tiles_rect.x * tmx_map.tilewidth,
+            tiles_rect.y * tmx_map.tileheight,
+            tiles_rect.width * tmx_map.tilewidth,
+            tiles_rect.height * tmx_map.tileheight,
+        )
+        self._surface = Surface(self._rect.size, pygame.SRCALPHA)
+        self._factor = layer_parallax(layer)
+        self._repeat_x = layer_repeat_x(layer)
+
+        tiled_map.render_tiles_on(self._surface, tiles_rect, [layer])
+
+    @property
+    def rect(self) -> Rect:
+        return self._rect
+
+    @property
+    def factor(self) -> float:
+        return self._factor
+
+    @property
+    def repeat_x(self) -> bool:
+        return self._repeat_x
+
+    @property
+    def memory_size(self) -> int:
+        return self._rect.width * self._rect.height * self._surface.get_bytesize()
+
+    def render_on(self, raw_display: Surface, offset: Tuple[int, int]) -> None:
+        """
+        Blits the visible slice(s) of the strip on the raw display (only inside its clip area) for the camera offset.
+        """
+        clip = raw_display.get_clip()
+        width, height = self._rect.size
+        x = self._rect.x + round(offset[0] * self._factor)
+        y = self._rect.y + round(offset[1] * self._factor)
+
+        if self._repeat_x:
+            x = clip.left - (clip.left - x) % width  # first copy of the strip touching the clip's left edge
+
+        while x < clip.right:
+            visible_rect = clip.clip((x, y, width, height))
+
+            if visible_rect.width and visible_rect.height:
+                raw_display.blit(self._surface, visible_rect.topleft, visible_rect.move(-x, -y))
+
+            if not self._repeat_x:
+                break
+
+            x += width
+
+
+def build_parallax_strips(tiled_map: TiledMap) -> Tuple[List[ParallaxStrip], List[ParallaxStrip]]:
+    """
+    Builds the strips of the parallax layers of a map: the ones before its first scrolling layer are drawn behind
+    the map (background) and the others in front of the map and the sprites (foreground). Empty layers are skipped.
+    """
+    background_strips: List[ParallaxStrip] = []
+    foreground_strips: List[ParallaxStrip] = []
+    strips = background_strips
+
+    for layer in tiled_map.tile_layers:
+        if layer_parallax(layer) == 1:
+            strips = foreground_strips
+            continue
+
+        tiles = [(x, y) for x, y, gid in layer.iter_data() if gid]
+
+        if tiles:
+            xs, ys = [x for x, _ in tiles], [y for _, y in tiles]
+            tiles_rect = Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+            strips.append(ParallaxStrip(tiled_map, layer, tiles_rect))
+
+    return background_strips, foreground_strips
+
+
+class ChunkedMapRenderer:
+    """
+    Renders a tiled map split into fixed-size chunks of tiles. Each chunk is rendered only once (the first time it
+    is needed or on prerender) and, on each frame, only the chunks that intersect the camera view are blitted. Thus,
+    the per frame cost depends on the display size rather than on the map size.
+
+    Parallax layers are not part of the chunks: they are rendered as parallax strips, behind the chunks (which are
+    then transparent) or in front of them (see render_foreground_on).
+
+    Animated tiles are indexed by gid and chunk: whenever the frame of an animated gid changes (see animate), only
+    its tiles inside the rendered chunks are redrawn.
+    """
+
+    _tiled_map: TiledMap
+    _clear_color: Tuple[int, int, int]
+    _chunk_width: int  # pixels
+    _chunk_height: int  # pixels
+    _chunk_size: int  # tiles
+    _columns: int
+    _rows: int
+    _chunks: Dict[ChunkKey, Surface]
+    _background_strips: List[ParallaxStrip]
+    _foreground_strips: List[ParallaxStrip]
+    _animated_tiles: Dict[int, Dict[ChunkKey, List[Tuple[int, int]]]]  # animated gid -> chunk -> tiles (x, y)
+
+    def __init__(
+        self,
+        tiled_map: TiledMap,
+        chunk_size: int = MAP_CHUNK_SIZE,
+        clear_color: Tuple[int, int, int] = CLEAR_DISPLAY_RGB,
+    ) -> None:
+        tmx_map = tiled_map.tmx_map
+
+        self._tiled_map = tiled_map
+        self._clear_color = clear_color
+        self._chunk_size = chunk_size
+        self._chunk_width = chunk_size * tmx_map.tilewidth
+        self._chunk_height = chunk_size * tmx_map.tileheight
+        self._columns = -(-tmx_map.width // chunk_size)  # ceil division
+        self._rows = -(-tmx_map.height // chunk_size)
+        self._chunks = {}
+        self._background_strips, self._foreground_strips = build_parallax_strips(tiled_map)
+        self._animated_tiles = self._index_animated_tiles()
+
+    @property
+    def chunk_width(self) -> int:
+        return self._chunk_width
+
+    @property
+    def chunk_height(self) -> int:
+        return self._chunk_height
+
+    @property
+    def rendered_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def memory_size(self) -> int:
+        """
+        Bytes of pixels held by the rendered chunks and the parallax strips.
+        """
+        chunks_size = sum(
+            chunk.get_width() * chunk.get_height() * chunk.get_bytesize() for chunk in self._chunks.values()
+        )
+        strips_size = sum(strip.memory_size for strip in self._background_strips + self._foreground_strips)
+
+        return chunks_size + strips_size
+
+    @property
+    def background_strips(self) -> List[ParallaxStrip]:
+        return self._background_strips
+
+    @property
+    def foreground_strips(self) -> List[ParallaxStrip]:
+        return self._foreground_strips
+
+    def prerender(self) -> None:
+        """
+        Renders all the chunks of the map up front so that no chunk is rendered during the game loop.
+        """
+        for row in range(self._rows):
+            for column in range(self._columns):
+                self._get_chunk((column, row))
+
+    def visible_chunks(self, view_rect: Rect) -> Iterator[ChunkKey]:
+        """
+        Yields the keys of the chunks that intersect the view_rect (in map pixels).
+        """
+        first_column = max(0, view_rect.left // self._chunk_width)
+        first_row = max(0, view_rect.top // self._chunk_height)
+        last_column = min(self._columns - 1, (view_rect.right - 1) // self._chunk_width)
+        last_row = min(self._rows - 1, (view_rect.bottom - 1) // self._chunk_height)
+
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                yield column, row
+
+    @profiled("ChunkedMapRenderer.render_on")
+    def render_on(self, raw_display: Surface, offset: Tuple[int, int]) -> None:
+        """
+        Blits only the visible chunks on the raw_display. The offset is the camera offset (Camera.rect.topleft) which
+        is applied to the chunks' map positions. If the raw_display has a clip area, only the chunks visible inside
+        it are blitted. Background parallax layers are drawn first.
+        """
+        offset_x, offset_y = int(offset[0]), int(offset[1])
+        view_rect = raw_display.get_clip().move(-offset_x, -offset_y)
+
+        for strip in self._background_strips:
+            strip.render_on(raw_display, (offset_x, offset_y))
+
+        for column, row in self.visible_chunks(view_rect):
+            chunk = self._get_chunk((column, row))
+            raw_display.blit(chunk, (column * self._chunk_width + offset_x, row * self._chunk_height + offset_y))
+
+    def render_foreground_on(self, raw_display: Surface, offset: Tuple[int, int]) -> None:
+        """
+        Blits the foreground parallax layers on the raw_display. Called after the sprites are drawn.
+        """
+        for strip in self._foreground_strips:
+            strip.render_on(raw_display, (int(offset[0]), int(offset[1])))
+
+    def animate(self, dt: float) -> List[Rect]:
+        """
+        Advances the tile animations by dt seconds and redraws, inside the rendered chunks, only the tiles whose frame
+        has changed. Returns the rects (in map pixels) of the redrawn tiles.
+        """
+        tmx_map = self._tiled_map.tmx_map
+        tile_width, tile_height = tmx_map.tilewidth, tmx_map.tileheight
+        scrolling_layers = self._tiled_map.scrolling_layers
+        changed_rects = []
+
+        for gid in self._tiled_map.animations.update(dt):
+            for (column, row), tiles in self._animated_tiles.get(gid, {}).items():
+                chunk = self._chunks.get((column, row))
+
+                if chunk is None:
+                    continue  # rendered with the current frames once needed
+
+                for x, y in tiles:
+                    chunk_x, chunk_y = x - column * self._chunk_size, y - row * self._chunk_size
+                    tile_rect = Rect(chunk_x * tile_width, chunk_y * tile_height, tile_width, tile_height)
+                    chunk.fill((0, 0, 0, 0) if self._background_strips else self._clear_color, tile_rect)
+                    self._tiled_map.render_tiles_on(chunk.subsurface(tile_rect), Rect(x, y, 1, 1), scrolling_layers)
+
+                    changed_rects.append(Rect(x * tile_width, y * tile_height, tile_width, tile_height))
+
+        return changed_rects
+
+    def _index_animated_tiles(self) -> Dict[int, Dict[ChunkKey, List[Tuple[int, int]]]]:
+        """
+        Indexes the positions of the animated tiles of the scrolling layers by gid and chunk.
+        """
+        animated_gids = set(self._tiled_map.animations.gids)
+        animated_tiles: Dict[int, Dict[ChunkKey, List[Tuple[int, int]]]] = {}
+
+        for layer in self._tiled_map.scrolling_layers:
+            for x, y, gid in layer.iter_data():
+                if gid in animated_gids:
+                    chunk_key = (x // self._chunk_size, y // self._chunk_size)
+                    tiles = animated_tiles.setdefault(gid, {}).setdefault(chunk_key, [])
+
+                    if (x, y) not in tiles:  # same tile on many layers
+                        tiles.append((x, y))
+
+        return animated_tiles
+
+    def _get_chunk(self, chunk_key: ChunkKey) -> Surface:
+        """
+        Fetches a chunk surface from the cache, rendering it first if it has not been rendered yet.
+        """
+        chunk = self._chunks.get(chunk_key)
+
+        if chunk is None:
+            column, row = chunk_key
+            tiles_rect = Rect(column * self._chunk_size, row * self._chunk_size, self._chunk_size, self._chunk_size)
+            tmx_map = self._tiled_map.tmx_map
+            tiles_rect = tiles_rect.clip(Rect(0, 0, tmx_map.width, tmx_map.height))
+
+            chunk_size = (tiles_rect.width * tmx_map.tilewidth, tiles_rect.height * tmx_map.tileheight)
+
+            if self._background_strips:
+                chunk = Surface(chunk_size, pygame.SRCALPHA)  # transparent so that the background shows through
+            else:
+                chunk = Surface(chunk_size)
+                chunk.fill(self._clear_color)
+
+            self._tiled_map.render_tiles_on(chunk, tiles_rect, self._tiled_map.scrolling_layers)
+
+            self._chunks[chunk_key] = chunk
+
+        return chunk
@@ -0,0 +1,294 @@
+"""
+Module with the physics world: gravity, velocities and collisions of all the dynamic bodies of a level.
+"""
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from pygame.rect import Rect
+
+from src.collidables import CollidablesGroup
+from src.collidables import sweep_x
+from src.collidables import sweep_y
+from src.profiler import profiled
+from src.settings import GRAVITY
+from src.settings import MAX_VELOCITY_Y
+from src.settings import SWEPT_COLLISIONS
+
+# contacts of a body on its last step (bit flags)
+CONTACT_TOP = 1
+CONTACT_BOTTOM = 2
+CONTACT_LEFT = 4
+CONTACT_RIGHT = 8
+
+
+class World:
+    """
+    Holds the state of all the dynamic bodies (positions, velocities, pending impulses and contacts) in numpy arrays
+    (struct of arrays). Each step integrates gravity and velocities of all the bodies at once and then resolves each
+    moving body against the static collidables, testing only the collidables near it.
+
+    Velocities are in pixels per second and gravity in pixels per second squared, so bodies move the same way whatever
+    the step's dt (the tick rate only affects the accuracy). On each step, a body either receives its pending vertical
+    impulse (e.g., a jump) or gravity, then its vertical velocity is clamped to MAX_VELOCITY_Y and it moves by its
+    velocities times dt.
+
+    Sleeping bodies (e.g., of entities far from the camera) are skipped by the steps: they keep their velocities and
+    pending impulses until they're woken up or stepped on their own (e.g., by entities updated at a reduced rate).
+    """
+
+    _collidables: CollidablesGroup
+    _swept: bool
+    _positions: np.ndarray  # (capacity, 2)
+    _velocities: np.ndarray  # (capacity, 2)
+    _impulses_y: np.ndarray  # (capacity,)
+    _gravity_scales: np.ndarray  # (capacity,)
+    _contacts: np.ndarray  # (capacity,) CONTACT_* flags
+    _active: np.ndarray  # (capacity,) slots in use
+    _sleeping: np.ndarray  # (capacity,) frozen bodies
+    _rects: List[Optional[Rect]]
+    _size: int  # slots in use, including freed ones
+    _free_slots: List[int]
+
+    def __init__(self, collidables: CollidablesGroup, capacity: int = 256, swept: bool = SWEPT_COLLISIONS) -> None:
+        self._collidables = collidables
+        self._swept = swept
+        self._positions = np.zeros((capacity, 2))
+        self._velocities = np.zeros((capacity, 2))
+        self._impulses_y = np.zeros(capacity)
+        self._gravity_scales = np.zeros(capacity)
+        self._contacts = np.zeros(capacity, dtype=np.uint8)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._sleeping = np.zeros(capacity, dtype=bool)
+        self._rects = [None] * capacity
+        self._size = 0
+        self._free_slots = []
+
+    def __len__(self) -> int:
+        return self._size - len(self._free_slots)
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[: self._size]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._velocities[: self._size]
+
+    @property
+    def impulses_y(self) -> np.ndarray:
+        return self._impulses_y[: self._size]
+
+    @property
+    def contacts(self) -> np.ndarray:
+        return self._contacts[: self._size]
+
+    def add_body(self, x: float, y: float, width: int, height: int, gravity_scale: float = 1) -> "Body":
+        """
+        Adds a dynamic body to the world and returns its handle.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size == len(self._active):
+                self._grow()
+
+            slot = self._size
+            self._size += 1
+
+        self._positions[slot] = x, y
+        self._velocities[slot] = 0, 0
+        self._impulses_y[slot] = 0
+        self._gravity_scales[slot] = gravity_scale
+        self._contacts[slot] = 0
+        self._active[slot] = True
+        self._sleeping[slot] = False
+        self._rects[slot] = Rect(round(x), round(y), width, height)
+
+        return Body(self, slot)
+
+    def remove_body(self, body: "Body") -> None:
+        """
+        Removes a body from the world, freeing its slot for another body.
+        """
+        self._active[body.slot] = False
+        self._rects[body.slot] = None
+        self._free_slots.append(body.slot)
+
+    def is_sleeping(self, slot: int) -> bool:
+        return bool(self._sleeping[slot])
+
+    def set_sleeping(self, slot: int, sleeping: bool) -> None:
+        self._sleeping[slot] = sleeping
+
+    def rect(self, slot: int) -> Rect:
+        rect = self._rects[slot]
+        assert rect is not None, "Body was removed from the world"
+
+        return rect
+
+    @profiled("World.step")
+    def step(self, dt: float) -> None:
+        """
+        Advances all the awake bodies by one step of dt seconds.
+        """
+        size = self._size
+        self._step_slots(np.flatnonzero(self._active[:size] & ~self._sleeping[:size]), dt)
+
+    def step_body(self, slot: int, dt: float) -> None:
+        """
+        Advances a single body by dt seconds, even if it's sleeping: e.g., the body of an entity updated at a reduced
+        rate, by the time elapsed since its last update.
+        """
+        self._step_slots(np.array([slot]), dt)
+
+    def _step_slots(self, slots: np.ndarray, dt: float) -> None:
+        """
+        Integrates the bodies of the slots at once (impulse or gravity, then clamping) and then resolves each one.
+        """
+        impulses_y = self._impulses_y[slots]
+        accelerations_y = np.where(impulses_y != 0, impulses_y, GRAVITY * dt * self._gravity_scales[slots])
+        self._velocities[slots, 1] = np.minimum(self._velocities[slots, 1] + accelerations_y, MAX_VELOCITY_Y)
+        self._impulses_y[slots] = 0
+
+        targets = (self._positions[slots] + self._velocities[slots] * dt).tolist()  # python floats: faster per body
+        resolved = [self._resolve(slot, *target) for slot, target in zip(slots.tolist(), targets)]
+
+        if resolved:
+            resolved_array = np.array(resolved)
+            self._positions[slots] = resolved_array[:, :2]
+            self._contacts[slots] = resolved_array[:, 2]
+
+    @profiled("World._resolve")
+    def _resolve(self, slot: int, target_x: float, target_y: float) -> Tuple[float, float, int]:
+        """
+        Moves a body's rect towards its target position, axis by axis, stopping it at the collidables on its way.
+        Returns the body's resolved position and its contacts.
+        """
+        rect = self._rects[slot]
+        assert rect is not None
+        contacts = 0
+
+        # x axis handling
+        dx = round(target_x) - rect.x
+
+        if dx and self._move_axis(rect, dx, 0):
+            contacts |= CONTACT_RIGHT if dx > 0 else CONTACT_LEFT
+            target_x = rect.x
+
+        # y axis handling
+        dy = round(target_y) - rect.y
+
+        if dy and self._move_axis(rect, 0, dy):
+            contacts |= CONTACT_BOTTOM if dy > 0 else CONTACT_TOP
+            target_y = rect.y
+
+        return target_x, target_y, contacts
+
+    def _move_axis(self, rect: Rect, dx: int, dy: int) -> bool:
+        """
+        Moves the rect along one axis (either dx or dy is zero). Returns whether a collidable was hit.
+        """
+        if self._swept:
+            candidates = self._collidables.movement_candidates(rect, dx, dy)
+
+            if dx:
+                allowed_dx, hit = sweep_x(rect, dx, candidates)
+                rect.x += allowed_dx
+            else:
+                allowed_dy, hit = sweep_y(rect, dy, candidates)
+                rect.y += allowed_dy
+
+            return hit is not None
+
+        # discrete: teleports the rect and then pushes it out of the collidables it overlaps
+        rect.move_ip(dx, dy)
+        collided = self._collidables.collide(rect)
+
+        for collided_tile in collided:
+            if dx > 0:
+                rect.right = collided_tile.rect.left
+            elif dx < 0:
+                rect.left = collided_tile.rect.right
+            elif dy > 0:
+                rect.bottom = collided_tile.rect.top
+            elif dy < 0:
+                rect.top = collided_tile.rect.bottom
+
+        return bool(collided)
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of the world arrays.
+        """
+        capacity = len(self._active)
+
+        self._positions = np.concatenate([self._positions, np.zeros((capacity, 2))])
+        self._velocities = np.concatenate([self._velocities, np.zeros((capacity, 2))])
+        self._impulses_y = np.concatenate([self._impulses_y, np.zeros(capacity)])
+        self._gravity_scales = np.concatenate([self._gravity_scales, np.zeros(capacity)])
+        self._contacts = np.concatenate([self._contacts, np.zeros(capacity, dtype=np.uint8)])
+        self._active = np.concatenate([self._active, np.zeros(capacity, dtype=bool)])
+        self._sleeping = np.concatenate([self._sleeping, np.zeros(capacity, dtype=bool)])
+        self._rects += [None] * capacity
+
+
+class Body:
+    """
+    Lightweight handle to a dynamic body of a World. Its rect is kept in sync with the body's position by the world,
+    so sprites can share it as their own rect.
+    """
+
+    __slots__ = ("_world", "_slot")
+
+    _world: World
+    _slot: int
+
+    def __init__(self, world: World, slot: int) -> None:
+        self._world = world
+        self._slot = slot
+
+    @property
+    def slot(self) -> int:
+        return self._slot
+
+    @property
+    def rect(self) -> Rect:
+        return self._world.rect(self._slot)
+
+    @property
+    def sleeping(self) -> bool:
+        return self._world.is_sleeping(self._slot)
+
+    @sleeping.setter
+    def sleeping(self, sleeping: bool) -> None:
+        self._world.set_sleeping(self._slot, sleeping)
+
+    def step(self, dt: float) -> None:
+        """
+        Advances this body by dt seconds, even if it's sleeping.
+        """
+        self._world.step_body(self._slot, dt)
+
+    @property
+    def velocity_x(self) -> float:
+        return float(self._world.velocities[self._slot, 0])
+
+    @velocity_x.setter
+    def velocity_x(self, velocity_x: float) -> None:
+        self._world.velocities[self._slot, 0] = velocity_x
+
+    @property
+    def velocity_y(self) -> float:
+        return float(self._world.velocities[self._slot, 1])
+
+    @property
+    def contacts(self) -> int:
+        return int(self._world.contacts[self._slot])
+
+    def apply_impulse_y(self, impulse_y: float) -> None:
+        """
+        Adds a vertical impulse (pixels per second) which replaces gravity on the next step (e.g., a jump).
+        """
+        self._world.impulses_y[self._slot] += impulse_y
@@ -0,0 +1,258 @@
+"""
+Module with the frame profiler: instrumentation scopes of the hot paths, rolling frame time histograms, an optional
+on-screen overlay and Chrome trace dumps (chrome://tracing or https://ui.perfetto.dev).
+"""
+import atexit
+import json
+from collections import deque
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+import numpy as np
+import pygame
+from pygame.surface import Surface
+
+from src.settings import GAME_FPS
+from src.settings import PROFILER_ENABLED
+from src.settings import PROFILER_HISTORY_FRAMES
+from src.settings import PROFILER_TRACE_EVENTS
+
+TraceEvent = Tuple[str, float, float]  # scope name, start and end (perf_counter seconds)
+ScopeRecorder = Callable[[str, float, float], None]  # records a measured scope: name, start and end
+F = TypeVar("F", bound=Callable)
+
+OVERLAY_SIZE = (120, 40)
+OVERLAY_BACKGROUND_RGB = (0, 0, 0)
+OVERLAY_BAR_RGB = (80, 220, 80)
+OVERLAY_SLOW_BAR_RGB = (230, 70, 70)  # frames slower than the frame budget
+OVERLAY_TEXT_RGB = (255, 255, 255)
+
+
+class Profiler:
+    """
+    Collects how long the instrumented scopes take (e.g., a main loop phase, Camera.update) frame by frame. The last
+    frames are kept in rolling windows from which histograms and percentiles are built, and the last scopes are kept
+    as trace events which can be dumped as a Chrome trace.
+
+    When disabled, scopes are no-op context managers and profiled functions call straight through, so the hot paths
+    can always be instrumented.
+    """
+
+    _enabled: bool
+    _overlay: bool
+    _frame_times: Deque[float]  # seconds, last frames
+    _scope_times: Dict[str, Deque[float]]  # seconds of each of the last frames, per scope
+    _frame_scopes: Dict[str, float]  # seconds of the current frame, per scope
+    _trace_events: Deque[TraceEvent]
+    _frame_start: Optional[float]
+    _overlay_surface: Optional[Surface]
+    _overlay_font: Optional[pygame.font.Font]
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        history_frames: int = PROFILER_HISTORY_FRAMES,
+        trace_events: int = PROFILER_TRACE_EVENTS,
+    ) -> None:
+        self._enabled = enabled
+        self._overlay = False
+        self._frame_times = deque(maxlen=history_frames)
+        self._scope_times = {}
+        self._frame_scopes = {}
+        self._trace_events = deque(maxlen=trace_events)
+        self._frame_start = None
+        self._overlay_surface = None
+        self._overlay_font = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def overlay(self) -> bool:
+        return self._enabled and self._overlay
+
+    @property
+    def frame_times(self) -> List[float]:
+        return [*self._frame_times]
+
+    @property
+    def trace_events(self) -> List[TraceEvent]:
+        return [*self._trace_events]
+
+    def enable(self, overlay: bool = False, trace_path: Optional[Path] = None) -> None:
+        """
+        Starts profiling. If a trace path is given, the Chrome trace is written to it when the process exits.
+        """
+        self._enabled = True
+        self._overlay = overlay
+
+        if trace_path is not None:
+            atexit.register(self.write_chrome_trace, trace_path)
+
+    def disable(self) -> None:
+        self._enabled = False
+        self._frame_start = None
+
+    def scope(self, name: str) -> "TimingScope":
+        """
+        Returns a context manager that measures the time spent inside it as a scope of the current frame.
+        """
+        return TimingScope(self.add, name) if self._enabled else NULL_TIMING_SCOPE
+
+    def add(self, name: str, start: float, end: float) -> None:
+        self._frame_scopes[name] = self._frame_scopes.get(name, 0) + end - start
+        self._trace_events.append((name, start, end))
+
+    def end_frame(self) -> None:
+        """
+        Stores the current frame time (since the last end_frame) and its scope timings in the rolling windows.
+        """
+        if not self._enabled:
+            return
+
+        now = perf_counter()
+
+        if self._frame_start is not None:
+            self._frame_times.append(now - self._frame_start)
+            self._trace_events.append(("frame", self._frame_start, now))
+
+        for name in self._frame_scopes.keys() - self._scope_times.keys():
+            self._scope_times[name] = deque(maxlen=self._frame_times.maxlen)  # scopes that ran for the first time
+
+        for name, durations in self._scope_times.items():
+            durations.append(self._frame_scopes.get(name, 0.0))
+
+        self._frame_scopes = {}
+        self._frame_start = now
+
+    def histogram(self, name: Optional[str] = None, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the histogram (counts and bin edges, in seconds) of the last frame times or, if a name is given, of
+        the last frame timings of that scope.
+        """
+        durations = self._frame_times if name is None else self._scope_times.get(name, ())
+
+        return np.histogram(np.fromiter(durations, float), bins=bins)
+
+    def percentiles(self, name: Optional[str] = None, percentiles: Tuple[int, ...] = (50, 95, 99)) -> Tuple[float, ...]:
+        durations = self._frame_times if name is None else self._scope_times.get(name, ())
+
+        if not durations:
+            return tuple(0.0 for _ in percentiles)
+
+        return tuple(np.percentile(np.fromiter(durations, float), percentiles))
+
+    def render_overlay_on(self, raw_display: Surface) -> None:
+        """
+        Draws the overlay on the top-left corner of the raw display: a bar per recent frame (red when over the frame
+        budget) and the p50/p99 frame times.
+        """
+        if self._overlay_surface is None:
+            self._overlay_surface = Surface(OVERLAY_SIZE)
+
+        overlay = self._overlay_surface
+        width, height = OVERLAY_SIZE
+        budget = 1 / GAME_FPS
+        overlay.fill(OVERLAY_BACKGROUND_RGB)
+
+        frame_times = [*self._frame_times][-width:]
+        bars_height = height - 12
+
+        for x, frame_time in enumerate(frame_times, start=width - len(frame_times)):
+            bar_height = min(bars_height, max(1, round(frame_time / (2 * budget) * bars_height)))  # 2 budgets: full
+            color = OVERLAY_SLOW_BAR_RGB if frame_time > budget else OVERLAY_BAR_RGB
+            overlay.fill(color, (x, height - bar_height, 1, bar_height))
+
+        if pygame.font.get_init():
+            if self._overlay_font is None:
+                self._overlay_font = pygame.font.Font(None, 12)
+
+            p50, p99 = self.percentiles(percentiles=(50, 99))
+            text = self._overlay_font.render(f"p50 {p50 * 1000:.1f} p99 {p99 * 1000:.1f} ms", False, OVERLAY_TEXT_RGB)
+            overlay.blit(text, (2, 1))
+
+        raw_display.blit(overlay, (0, 0))
+
+    def write_chrome_trace(self, trace_path: Path) -> None:
+        """
+        Writes the trace events as a Chrome trace (complete events with microsecond timestamps).
+        """
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": (end - start) * 1e6, "pid": 0, "tid": 0}
+            for name, start, end in self._trace_events
+        ]
+
+        with open(trace_path, "w") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+
+class TimingScope:
+    """
+    Context manager that measures a scope (e.g., a profiler scope or a frame phase) and hands it to its recorder.
+    """
+
+    __slots__ = ("_record", "_name", "_start")
+
+    def __init__(self, record: ScopeRecorder, name: str) -> None:
+        self._record = record
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._record(self._name, self._start, perf_counter())
+
+
+class NullTimingScope(TimingScope):
+    """
+    Timing scope that measures nothing: used while nothing is being measured (e.g., the profiler is disabled).
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+NULL_TIMING_SCOPE = NullTimingScope()
+PROFILER = Profiler(PROFILER_ENABLED)  # profiler of the game: used by the profiled functions
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """
+    Decorator which measures every call of the function as a scope of the game profiler. While the profiler is
+    disabled, the only overhead is checking whether it's enabled.
+    """
+
+    def decorator(function: F) -> F:
+        @wraps(function)
+        def profiled_function(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+
+            start = perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                PROFILER.add(name, start, perf_counter())
+
+        return profiled_function  # type: ignore
+
+    return decorator
@@ -0,0 +1,283 @@
+"""
+Module with rendering utilities used by the main game loop.
+"""
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pygame
+from pygame.rect import Rect
+from pygame.sprite import Group
+from pygame.sprite import Sprite
+from pygame.surface import Surface
+
+from src.maps import ChunkedMapRenderer
+from src.profiler import PROFILER
+from src.settings import CLEAR_DISPLAY_RGB
+from src.settings import DISPLAY_SCALER
+
+SCALERS = ("nearest", "scale2x", "smooth")
+SpriteDraw = Tuple[Sprite, Surface, Tuple[int, int]]  # sprite, its image and its position on the display
+
+
+class CameraGroup(Group):
+    """
+    Group of sprites rendered through the camera. On each frame, only the sprites inside the view are drawn (culling)
+    and all of them are submitted in a single Surface.blits call. Display positions are computed from the sprites'
+    rects and the camera offset without allocating rects.
+
+    Sprites with a previous_topleft (their position before the last simulation step) are drawn interpolated between
+    it and their current position. If layered, sprites are drawn ordered by their layer attribute (default 0).
+    """
+
+    _layered: bool
+
+    def __init__(self, *sprites: Sprite, layered: bool = False) -> None:
+        self._layered = layered
+
+        super().__init__(*sprites)
+
+    def visible_draws(self, view_size: Tuple[int, int], offset: Tuple[int, int], alpha: float = 1) -> List[SpriteDraw]:
+        """
+        Returns the draws (sprite, image, display position) of the sprites inside the view: the display area of the
+        given size shifted by the camera offset.
+        """
+        offset_x, offset_y = offset
+        view_left, view_top = -offset_x, -offset_y
+        view_right, view_bottom = view_left + view_size[0], view_top + view_size[1]
+        draws = []
+
+        for sprite in self.sprites():
+            rect = sprite.rect
+            previous_topleft = getattr(sprite, "previous_topleft", None)
+
+            if previous_topleft is None:
+                x, y = rect.x, rect.y
+            else:
+                x = round(previous_topleft[0] + (rect.x - previous_topleft[0]) * alpha)
+                y = round(previous_topleft[1] + (rect.y - previous_topleft[1]) * alpha)
+
+            if x < view_right and x + rect.width > view_left and y < view_bottom and y + rect.height > view_top:
+                draws.append((sprite, sprite.image, (x + offset_x, y + offset_y)))
+
+        if self._layered:
+            draws.sort(key=lambda draw: getattr(draw[0], "layer", 0))  # only the visible ones, stable inside layers
+
+        return draws
+
+    def render_on(self, raw_display: Surface, offset: Tuple[int, int], alpha: float = 1) -> None:
+        """
+        Draws the visible sprites on the raw display with a single blits call.
+        """
+        draws = self.visible_draws(raw_display.get_size(), offset, alpha)
+        raw_display.blits([(image, position) for _, image, position in draws], doreturn=False)
+
+
+class DirtyRectRenderer:
+    """
+    Renders the map and the sprites on the raw display redrawing only the regions that have changed since the last
+    frame (dirty rects): the previous and the current rects of the sprites whose image or position have changed.
+    Whenever the camera offset changes, everything changes, so the whole display is redrawn instead. Regions of the
+    map that have changed (e.g., animated tiles) are also redrawn once they're invalidated.
+
+    Drawing is measured with the given phase scopes (e.g., FrameTimings.phase) as the same "map blit" and "sprite
+    blits" phases of the full redraws of the game loop, plus the "dirty rects" phase for finding what has changed.
+    """
+
+    _map_renderer: ChunkedMapRenderer
+    _clear_color: Tuple[int, int, int]
+    _phase: Callable[[str], ContextManager[None]]
+    _previous_offset: Optional[Tuple[int, int]]
+    _previous_draws: Dict[Sprite, Tuple[Surface, Tuple[int, int]]]
+    _invalid_map_rects: List[Rect]  # map pixels
+
+    def __init__(
+        self,
+        map_renderer: ChunkedMapRenderer,
+        clear_color: Tuple[int, int, int] = CLEAR_DISPLAY_RGB,
+        phase: Callable[[str], ContextManager[None]] = PROFILER.scope,
+    ) -> None:
+        self._map_renderer = map_renderer
+        self._clear_color = clear_color
+        self._phase = phase
+        self._previous_offset = None  # forces a full redraw on the first frame
+        self._previous_draws = {}
+        self._invalid_map_rects = []
+
+    def invalidate(self) -> None:
+        """
+        Forces a full redraw on the next frame (e.g., after something else has drawn on the raw display).
+        """
+        self._previous_offset = None
+
+    def invalidate_map_rects(self, map_rects: List[Rect]) -> None:
+        """
+        Marks regions of the map (in map pixels) to be redrawn on the next frame.
+        """
+        self._invalid_map_rects += map_rects
+
+    def render_on(self, raw_display: Surface, offset: Tuple[int, int], draws: List[SpriteDraw]) -> Optional[List[Rect]]:
+        """
+        Renders the frame on the raw display. Returns the dirty rects that were redrawn or None if the whole display
+        was redrawn.
+        """
+        current_draws = {sprite: (image, position) for sprite, image, position in draws}
+        invalid_map_rects, self._invalid_map_rects = self._invalid_map_rects, []
+
+        if offset != self._previous_offset:
+            with self._phase("map blit"):
+                raw_display.fill(self._clear_color)
+                self._map_renderer.render_on(raw_display, offset)
+
+            with self._phase("sprite blits"):
+                raw_display.blits([(image, position) for _, image, position in draws], doreturn=False)
+                self._map_renderer.render_foreground_on(raw_display, offset)
+
+            self._previous_offset = offset
+            self._previous_draws = current_draws
+
+            return None
+
+        with self._phase("dirty rects"):
+            dirty_rects = self._find_dirty_rects(current_draws, invalid_map_rects, offset, raw_display.get_rect())
+
+        for dirty_rect in dirty_rects:
+            raw_display.set_clip(dirty_rect)  # the background and the sprites are only redrawn inside the dirty rect
+
+            with self._phase("map blit"):
+                raw_display.fill(self._clear_color)
+                self._map_renderer.render_on(raw_display, offset)
+
+            with self._phase("sprite blits"):
+                raw_display.blits(
+                    [
+                        (image, position)
+                        for _, image, position in draws
+                        if dirty_rect.colliderect((position, image.get_size()))
+                    ],
+                    doreturn=False,
+                )
+                self._map_renderer.render_foreground_on(raw_display, offset)
+
+        raw_display.set_clip(None)
+        self._previous_draws = current_draws
+
+        return dirty_rects
+
+    def _find_dirty_rects(
+        self,
+        current_draws: Dict[Sprite, Tuple[Surface, Tuple[int, int]]],
+        invalid_map_rects: List[Rect],
+        offset: Tuple[int, int],
+        display_rect: Rect,
+    ) -> List[Rect]:
+        """
+        Finds the rects of the display that have changed: the previous and current rects of the sprites which were
+        added, removed, moved or had their image changed plus the invalidated map regions. Overlapping dirty rects
+        are merged.
+        """
+        dirty_rects = [map_rect.move(offset).clip(display_rect) for map_rect in invalid_map_rects]
+
+        for sprite in current_draws.keys() | self._previous_draws.keys():
+            current_draw = current_draws.get(sprite)
+            previous_draw = self._previous_draws.get(sprite)
+
+            if current_draw is not None and previous_draw is not None:
+                if current_draw[0] is previous_draw[0] and current_draw[1] == previous_draw[1]:
+                    continue  # same image on the same position: nothing changed
+
+            for draw in (current_draw, previous_draw):
+                if draw is not None:
+                    image, position = draw
+                    dirty_rects.append(Rect(position, image.get_size()).clip(display_rect))
+
+        return merge_rects([dirty_rect for dirty_rect in dirty_rects if dirty_rect.width and dirty_rect.height])
+
+
+def merge_rects(rects: List[Rect]) -> List[Rect]:
+    """
+    Merges overlapping rects into their union until no rects overlap.
+    """
+    merged_rects: List[Rect] = []
+
+    for rect in rects:
+        rect = Rect(rect)
+        overlapping_index = rect.collidelist(merged_rects)
+
+        while overlapping_index != -1:
+            rect.union_ip(merged_rects.pop(overlapping_index))
+            overlapping_index = rect.collidelist(merged_rects)
+
+        merged_rects.append(rect)
+
+    return merged_rects
+
+
+class Presenter:
+    """
+    Presents the raw display on the screen, scaling it straight into the screen surface (or subsurfaces of it for
+    dirty rects) so that no intermediate surface is allocated per frame. Scalers:
+
+    - nearest: nearest neighbour scaling (pixel art friendly), works for any ratio
+    - scale2x: pygame's scale2x (smooths pixel art edges), only when the screen is exactly 2x the raw display
+    - smooth: bilinear filtering (blurry pixel art), works for any ratio
+
+    Selecting scale2x for other ratios falls back to nearest.
+    """
+
+    _screen: Surface
+    _scaler: str
+
+    def __init__(self, screen: Surface, raw_size: Tuple[int, int], scaler: str = DISPLAY_SCALER) -> None:
+        assert scaler in SCALERS, f"Unknown scaler: {scaler}"
+
+        if scaler == "scale2x" and screen.get_size() != (raw_size[0] * 2, raw_size[1] * 2):
+            scaler = "nearest"
+
+        self._screen = screen
+        self._scaler = scaler
+
+    @property
+    def scaler(self) -> str:
+        return self._scaler
+
+    def present(self, raw_display: Surface) -> None:
+        """
+        Scales the whole raw display onto the screen.
+        """
+        self._scale_into(raw_display, self._screen)
+
+    def present_rects(self, raw_display: Surface, raw_rects: List[Rect]) -> List[Rect]:
+        """
+        Scales only the given rects of the raw display onto the screen. Returns the rects of the screen that were
+        drawn. With the smooth scaler, the edges of the rects aren't filtered with their neighbour pixels.
+        """
+        screen_width, screen_height = self._screen.get_size()
+        raw_width, raw_height = raw_display.get_size()
+        screen_rects = []
+
+        for raw_rect in raw_rects:
+            if self._scaler == "scale2x":
+                screen_rect = Rect(raw_rect.x * 2, raw_rect.y * 2, raw_rect.width * 2, raw_rect.height * 2)
+            else:
+                # edges are scaled (instead of sizes) so that adjacent rects don't leave gaps between them
+                left, right = raw_rect.left * screen_width // raw_width, raw_rect.right * screen_width // raw_width
+                top, bottom = raw_rect.top * screen_height // raw_height, raw_rect.bottom * screen_height // raw_height
+                screen_rect = Rect(left, top, right - left, bottom - top)
+
+            if screen_rect.width and screen_rect.height:
+                self._scale_into(raw_display.subsurface(raw_rect), self._screen.subsurface(screen_rect))
+                screen_rects.append(screen_rect)
+
+        return screen_rects
+
+    def _scale_into(self, source: Surface, destination: Surface) -> None:
+        if self._scaler == "scale2x":
+            pygame.transform.scale2x(source, destination)
+        elif self._scaler == "smooth":
+            pygame.transform.smoothscale(source, destination.get_size(), destination)
+        else:
+            pygame.transform.scale(source, destination.get_size(), destination)
@@ -0,0 +1,122 @@
+"""
+Module with the recording and replaying of play sessions.
+
+A recording is a compact binary log with, for each frame of a session, the player inputs captured on the frame, the
+frame time (dt) fed to the simulation and the player position at the end of the frame. Replaying it feeds the same
+inputs and frame times to the game loop, so the simulation runs exactly as it did, and compares the player positions
+to detect behavior drift.
+
+Recording layout:
+
+    | magic (4 bytes) | version (uint16) | tick rate (uint32) | frames (inputs uint8, dt float64, x int32, y int32) |
+"""
+import struct
+from dataclasses import fields
+from pathlib import Path
+from typing import BinaryIO
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from src.inputs import CapturedInput
+from src.settings import SIMULATION_TICK_RATE
+
+RECORDING_MAGIC = b"PLRC"
+RECORDING_VERSION = 1
+RECORDING_HEADER = struct.Struct("<4sHI")
+RECORDING_FRAME = struct.Struct("<Bdii")
+INPUT_FIELDS = [field.name for field in fields(CapturedInput)]  # bit i of the inputs byte is INPUT_FIELDS[i]
+
+RecordedFrame = Tuple[CapturedInput, float, Tuple[int, int]]  # inputs, frame time and player position
+
+
+def pack_input(captured_input: CapturedInput) -> int:
+    return sum(1 << i for i, name in enumerate(INPUT_FIELDS) if getattr(captured_input, name))
+
+
+def unpack_input(bits: int) -> CapturedInput:
+    return CapturedInput(**{name: bool(bits & (1 << i)) for i, name in enumerate(INPUT_FIELDS)})
+
+
+class InputRecorder:
+    """
+    Writes the frames of a play session to a recording file.
+    """
+
+    _file: BinaryIO
+    _frames: int
+
+    def __init__(self, recording_path: Path, tick_rate: int = SIMULATION_TICK_RATE) -> None:
+        recording_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._file = open(recording_path, "wb")
+        self._file.write(RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, tick_rate))
+        self._frames = 0
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    def record(self, captured_input: CapturedInput, frame_time: float, position: Tuple[int, int]) -> None:
+        self._file.write(RECORDING_FRAME.pack(pack_input(captured_input), frame_time, *position))
+        self._frames += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Replay:
+    """
+    Frames of a recording to be fed to the game loop. While replaying, the player positions are checked against the
+    recorded ones and the first frame in which they differ (the drift) is kept.
+    """
+
+    _frames: List[RecordedFrame]
+    _drift_frame: Optional[int]
+
+    def __init__(self, recording_path: Path, tick_rate: int = SIMULATION_TICK_RATE) -> None:
+        recording = recording_path.read_bytes()
+
+        if len(recording) < RECORDING_HEADER.size:
+            raise ValueError(f"Invalid recording: {recording_path}")
+
+        magic, version, recorded_tick_rate = RECORDING_HEADER.unpack_from(recording)
+
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"Invalid recording: {recording_path}")
+
+        if recorded_tick_rate != tick_rate:
+            raise ValueError(f"Recording simulated at {recorded_tick_rate} ticks per second instead of {tick_rate}")
+
+        frames_offset = RECORDING_HEADER.size
+        self._frames = [
+            (unpack_input(bits), frame_time, (x, y))
+            for bits, frame_time, x, y in RECORDING_FRAME.iter_unpack(memoryview(recording)[frames_offset:])
+        ]
+        self._drift_frame = None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def drift_frame(self) -> Optional[int]:
+        return self._drift_frame
+
+    def frame(self, frame: int) -> Tuple[CapturedInput, float]:
+        """
+        Returns the inputs and the frame time of a frame.
+        """
+        captured_input, frame_time, _ = self._frames[frame]
+
+        return captured_input, frame_time
+
+    def check(self, frame: int, position: Tuple[int, int]) -> bool:
+        """
+        Checks the player position at the end of a frame against the recorded one. Returns whether they match.
+        """
+        matches = self._frames[frame][2] == tuple(position)
+
+        if not matches and self._drift_frame is None:
+            self._drift_frame = frame
+
+        return matches
@@ -6,26 +6,65 @@ from typing import Tuple
 
 # project settings
 ROOT_DIR: Path = Path(__file__).resolve().parent.parent  # root of the project (same level as 'src')
+ASSETS_CACHE_DIR: Path = ROOT_DIR.joinpath(".cache", "assets")  # compiled assets (e.g., animation packs)
 
 # window settings
 WINDOW_TITLE = "Pygame Lab!"
 WINDOW_SIZE: Tuple[int, int] = (600, 400)
 RAW_DISPLAY_SIZE: Tuple[int, int] = (300, 200)
 CLEAR_DISPLAY_RGB: Tuple[int, int, int] = (128, 163, 224)
+DISPLAY_SCALER = "nearest"  # raw display to window scaling: nearest, scale2x (2x windows only) or smooth
+DIRTY_RECT_RENDERING = True  # while the camera is still, only the changed regions of the display are redrawn
 
 # game settings
-GAME_FPS = 60
+GAME_FPS = 60  # rendering rate cap
+SIMULATION_TICK_RATE = 60  # fixed simulation steps per second (only affects the accuracy of the physics)
+MAX_SIMULATION_STEPS = 5  # max catch-up steps per rendered frame
 TILE_SIZE = 16
+TIME_BASED_ANIMATIONS = True  # animations advance by elapsed time (aseprite durations) instead of rendered frames
+
+# profiling: scopes of the hot paths (see src/profiler.py), also enabled with the --profile argument
+PROFILER_ENABLED = False
+PROFILER_HISTORY_FRAMES = 300  # frames kept for the frame time histograms
+PROFILER_TRACE_EVENTS = 200_000  # last scopes kept for the chrome trace
+PROFILER_TRACE_PATH: Path = ROOT_DIR.joinpath(".cache", "profile.trace.json")  # chrome trace written on exit
+
+# maps rendering (chunk side length in tiles)
+MAP_CHUNK_SIZE = 16
+
+# static objects (e.g., decorations): stored as compact records, promoted to sprites only near the camera
+STATIC_OBJECTS_CELL_SIZE = 256  # pixels, side of the grid cells which index the static objects
+STATIC_OBJECTS_MARGIN = 64  # pixels around the camera view in which static objects are promoted
+
+# entities activation: only entities near the camera are updated on every simulation step
+ACTIVATION_REGION_TILES = 16  # side of the regions the level is partitioned into, in map tiles
+ACTIVATION_MARGIN = 128  # pixels around the camera view in which entities are awake
+ACTIVATION_SLEEP_TICK_INTERVAL = 8  # steps between the updates of sleeping entities (0 freezes them)
+
+# levels streaming: loaded levels kept in memory (least recently used ones are evicted first)
+LEVELS_CACHE_SIZE = 3
+LEVELS_MEMORY_BUDGET = 64 * 2**20  # bytes of rendered chunks
+
+# assets registry: unreferenced assets are kept while the resident ones fit the budget (least recently used evicted)
+ASSETS_MEMORY_BUDGET = 16 * 2**20  # bytes of pixels
 
 # player
-GRAVITY = 100
-VELOCITY_X = 200
-JUMP_VELOCITY_Y = 1000
-MAX_VELOCITY_Y = 3
+GRAVITY = 6000  # pixels/s²
+VELOCITY_X = 200  # pixels/s
+JUMP_VELOCITY_Y = 1000  # pixels/s
+MAX_VELOCITY_Y = 180  # pixels/s
+SWEPT_COLLISIONS = True  # continuous collisions: no tunneling through thin collidables at high velocities
 
 # scrolling (gives smooth scrolling effect) -> set 1 for simple scrolling
 SCROLLING_OFFSET_FRACTION = 0.05
+CAMERA_FOLLOW = "lerp"  # lerp, deadzone or lookahead
+CAMERA_DEADZONE_SIZE = (64, 48)  # zone at the center of the view where the target moves without moving the camera
+CAMERA_LOOKAHEAD_DISTANCE = 48  # how far ahead of the target (on its moving direction) the camera looks
 
 # maps tags
 TMX_OBJECT_PLAYER_NAME = "player"
 TMX_OBJECT_COLLIDABLE_NAME = "collidable"
+TMX_OBJECT_DECORATION_TYPE = "decoration"  # objects with this name or type are static objects
+TMX_TILE_SOLID_PROPERTY = "solid"  # tileset tiles with this property set are collidable
+TMX_LAYER_PARALLAX_PROPERTY = "parallax"  # tile layers scroll at this fraction of the camera speed (default 1)
+TMX_LAYER_REPEAT_X_PROPERTY = "repeat_x"  # parallax layers with this property set are repeated horizontally
@@ -0,0 +1,44 @@
+"""
+Module with the fixed timestep used to decouple the simulation rate from the rendering rate.
+"""
+
+
+class FixedTimestep:
+    """
+    Accumulates the (variable) time of the rendered frames and converts it into a number of fixed simulation steps.
+    The time left in the accumulator after the steps is exposed as alpha: the fraction of a step which the rendering
+    should interpolate between the previous and the current simulation states.
+
+    If the rendering falls too far behind (e.g., a slow machine), at most max_steps are run per frame and the rest of
+    the accumulated time is dropped: the game slows down instead of spiraling into ever more steps per frame.
+    """
+
+    _step_dt: float
+    _max_steps: int
+    _accumulator: float
+
+    def __init__(self, tick_rate: int, max_steps: int) -> None:
+        self._step_dt = 1 / tick_rate
+        self._max_steps = max_steps
+        self._accumulator = 0
+
+    @property
+    def step_dt(self) -> float:
+        return self._step_dt
+
+    @property
+    def alpha(self) -> float:
+        return self._accumulator / self._step_dt
+
+    def advance(self, frame_time: float) -> int:
+        """
+        Adds the time of the last frame (seconds) to the accumulator and returns how many simulation steps must run.
+        """
+        self._accumulator += frame_time
+        steps = min(int(self._accumulator / self._step_dt), self._max_steps)
+        self._accumulator -= steps * self._step_dt
+
+        if steps == self._max_steps:
+            self._accumulator = min(self._accumulator, self._step_dt * 0.999)  # drops what can't be caught up
+
+        return steps
@@ -1,16 +1,66 @@
 """
 Module with some utilities.
 """
-import pygame
+import hashlib
+from pathlib import Path
+from typing import Dict
+from typing import Union
+
 from pygame.surface import Surface
 
 from src.settings import ROOT_DIR
 
+SourceKey = Dict[str, Union[int, str]]  # identifies the contents of a source file: mtime, size and sha256
+
 
 def load_image_asset(image_path: str, assets_dir="assets/") -> Surface:
     """
-    Loads an image from disk with Pygame. Returns a pygame Surface.
+    Loads an image from disk with Pygame, converted to the display format and shared through the asset registry (see
+    src/assets.py). Returns a pygame Surface which is kept for as long as the game runs (never evicted).
     """
+    from src.assets import ASSET_REGISTRY  # src.assets builds its keys with this module's source keys
+
     img_asset_path = ROOT_DIR.joinpath(assets_dir, image_path)
 
-    return pygame.image.load(img_asset_path)
+    return ASSET_REGISTRY.load_image(img_asset_path)
+
+
+def source_key(source_path: Path) -> SourceKey:
+    """
+    Builds the key which identifies the current contents of a source file.
+    """
+    stat = source_path.stat()
+
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha256": _sha256(source_path)}
+
+
+def is_source_unchanged(source_key: SourceKey, source_path: Path) -> bool:
+    """
+    Checks whether a source file still matches its key. Files with the same mtime and size are assumed unchanged,
+    otherwise (e.g., a fresh checkout) their contents are hashed and compared.
+    """
+    if not source_path.exists():
+        return False
+
+    stat = source_path.stat()
+
+    if stat.st_mtime_ns == source_key["mtime"] and stat.st_size == source_key["size"]:
+        return True
+
+    return _sha256(source_path) == source_key["sha256"]
+
+
+def folder_digest(folder_path: Path) -> str:
+    """
+    Short digest of a resolved folder: names the cached files compiled from sources of the same name in different
+    folders apart.
+    """
+    return hashlib.sha256(str(folder_path.resolve()).encode()).hexdigest()[:12]
+
+
+def _sha256(source_path: Path) -> str:
+    """
+    Hashes the contents of a file.
+    """
+    with open(source_path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
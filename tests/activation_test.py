@@ -0,0 +1,122 @@
+"""
+Module with entities activation tests.
+"""
+from pygame.rect import Rect
+from pygame.sprite import Sprite
+
+from src.activation import ActivationSystem
+from src.collidables import CollidablesGroup
+from src.physics import World
+
+
+class RecordingEntity(Sprite):
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__()
+
+        self.rect = Rect(x, y, 8, 8)
+        self.dts = []
+        self.events = []
+
+    def update(self, *args, **kwargs) -> None:
+        self.dts.append(args[-1])
+
+    def sleep(self) -> None:
+        self.events.append("sleep")
+
+    def slow(self) -> None:
+        self.events.append("slow")
+
+    def wake(self) -> None:
+        self.events.append("wake")
+
+
+class WalkingEntity(Sprite):
+    def __init__(self, x: int, world: World) -> None:
+        super().__init__()
+
+        self.body = world.add_body(x, 10, 8, 8, gravity_scale=0)
+        self.rect = self.body.rect
+
+    def update(self, *args, **kwargs) -> None:
+        self.body.velocity_x = 60
+
+        if self.body.sleeping:
+            self.body.step(args[-1])
+
+    def slow(self) -> None:
+        self.body.sleeping = True
+
+    def wake(self) -> None:
+        self.body.sleeping = False
+
+
+def test_should_update_sleeping_entities_at_a_reduced_rate():
+    # arrange - regions of 64 pixels, view of the first region only
+    activation = ActivationSystem((16, 16), Rect(0, 0, 64, 64), region_tiles=4, margin=0, sleep_tick_interval=4)
+    near_entity, far_entity = RecordingEntity(10, 10), RecordingEntity(1000, 10)
+    activation.add(near_entity)
+    activation.add(far_entity)
+
+    # act
+    for _ in range(8):
+        activation.update(Rect(0, 0, 64, 64), 0.5)
+
+    # assert - same elapsed time, in fewer updates (region (15, 0) takes its turn on the 4th step of each interval)
+    assert near_entity.dts == [0.5] * 8
+    assert far_entity.dts == [2.0, 2.0]
+    assert near_entity.events == [] and far_entity.events == ["slow"]
+
+
+def test_should_move_bodies_of_slowed_down_entities_as_far_as_awake_ones():
+    # arrange - regions of 256 pixels, view of the first region only
+    world = World(CollidablesGroup())
+    activation = ActivationSystem((16, 16), Rect(0, 0, 64, 64), region_tiles=16, margin=0, sleep_tick_interval=4)
+    near_entity, far_entity = WalkingEntity(0, world), WalkingEntity(800, world)
+    activation.add(near_entity)
+    activation.add(far_entity)
+
+    # act - two seconds
+    for _ in range(8):
+        activation.update(Rect(0, 0, 64, 64), 0.25)
+        world.step(0.25)
+
+    # assert - the far body is only moved on its entity's updates, by their elapsed time
+    assert near_entity.rect.x == 120
+    assert far_entity.rect.x == 920 and far_entity.body.sleeping
+
+
+def test_should_freeze_sleeping_entities_and_wake_them_up_near_the_view():
+    # arrange
+    activation = ActivationSystem((16, 16), Rect(0, 0, 64, 64), region_tiles=4, margin=16, sleep_tick_interval=0)
+    entity = RecordingEntity(1000, 10)
+    activation.add(entity)
+
+    # act
+    for _ in range(10):
+        activation.update(Rect(0, 0, 64, 64), 0.5)
+
+    frozen_dts = [*entity.dts]
+    activation.update(Rect(950, 0, 64, 64), 0.5)
+
+    # assert - frozen time is skipped
+    assert frozen_dts == []
+    assert entity.dts == [0.5]
+    assert activation.is_awake(entity) and entity.events == ["sleep", "wake"]
+
+
+def test_should_move_updated_entities_between_regions():
+    # arrange
+    activation = ActivationSystem((16, 16), Rect(0, 0, 64, 64), region_tiles=4, margin=0, sleep_tick_interval=0)
+    entity = RecordingEntity(10, 10)
+    activation.add(entity)
+    activation.update(Rect(0, 0, 64, 64), 0.5)
+
+    # act - the entity walks out of the view
+    entity.rect.x = 200
+    activation.update(Rect(0, 0, 64, 64), 0.5)
+    activation.update(Rect(0, 0, 64, 64), 0.5)
+
+    # assert
+    assert not activation.is_awake(entity)
+    assert len(entity.dts) == 2
+    assert entity.events == ["sleep"]
@@ -0,0 +1,107 @@
+"""
+Module with animation packs tests.
+"""
+import os
+
+import pygame
+
+from src.animation_packs import animation_pack_path
+from src.animation_packs import load_animation_repository
+from src.animation_packs import read_animation_pack
+from src.animations import SpriteSheetParser
+from src.settings import ROOT_DIR
+
+
+def test_should_load_same_repository_from_pack(tmp_path):
+    # arrange
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    expected_repository = parser.build_animation_repository()
+
+    # act - first load compiles the pack, second load reads it
+    load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+    animation_repository = read_animation_pack(
+        animation_pack_path("hero-idle-test", "tests/resources/", tmp_path),
+        ROOT_DIR.joinpath("tests/resources/hero-idle-test.png"),
+        ROOT_DIR.joinpath("tests/resources/hero-idle-test.json"),
+    )
+
+    # assert
+    assert animation_repository is not None
+    assert [*animation_repository.keys()] == [*expected_repository.keys()]
+
+    for action_name, action_image_list in expected_repository.items():
+        for expected_frames, image_frames in zip(action_image_list, animation_repository[action_name]):
+            assert image_frames["image_id"] == expected_frames["image_id"]
+            assert image_frames["frames"] == expected_frames["frames"]
+            assert pygame.image.tobytes(image_frames["image"], "RGBA") == pygame.image.tobytes(
+                expected_frames["image"], "RGBA"
+            )
+
+
+def test_should_discard_pack_of_changed_source(tmp_path):
+    # arrange
+    json_path = tmp_path.joinpath("hero-idle-test.json")
+    png_path = ROOT_DIR.joinpath("tests/resources/hero-idle-test.png")
+    json_path.write_text(ROOT_DIR.joinpath("tests/resources/hero-idle-test.json").read_text())
+
+    load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)  # pack of the original sources
+    pack_path = animation_pack_path("hero-idle-test", "tests/resources/", tmp_path)
+
+    # act - same contents with a new mtime is still valid, different contents are not
+    os.utime(json_path, ns=(0, 0))
+    touched_repository = read_animation_pack(pack_path, png_path, json_path)
+
+    json_path.write_text(json_path.read_text().replace('"duration": 200', '"duration": 100'))
+    changed_repository = read_animation_pack(pack_path, png_path, json_path)
+
+    # assert
+    assert touched_repository is not None
+    assert changed_repository is None
+
+
+def test_should_load_writable_frames_from_pack(tmp_path):
+    # arrange - no display: frames aren't converted
+    load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+
+    # act
+    animation_repository = load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+    first_frame = animation_repository["idle"][0]["image"]
+    first_frame.fill((255, 0, 0, 255))
+
+    # assert - frames own their pixels
+    assert first_frame.get_at((0, 0)) == (255, 0, 0, 255)
+
+
+def test_should_keep_packs_of_same_named_spritesheets_apart(tmp_path):
+    # act
+    pack_path = animation_pack_path("hero", "assets/spritesheets/", tmp_path)
+    other_pack_path = animation_pack_path("hero", "tests/resources/", tmp_path)
+    same_pack_path = animation_pack_path("hero", "tests/../assets/spritesheets", tmp_path)
+
+    # assert
+    assert pack_path != other_pack_path
+    assert pack_path == same_pack_path
+
+
+def test_should_rebuild_truncated_or_corrupt_packs(tmp_path):
+    # arrange
+    png_path = ROOT_DIR.joinpath("tests/resources/hero-idle-test.png")
+    json_path = ROOT_DIR.joinpath("tests/resources/hero-idle-test.json")
+    pack_path = animation_pack_path("hero-idle-test", "tests/resources/", tmp_path)
+    load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+    pack_bytes = pack_path.read_bytes()
+
+    # act
+    pack_path.write_bytes(pack_bytes[:-100])
+    truncated_repository = read_animation_pack(pack_path, png_path, json_path)
+
+    pack_path.write_bytes(pack_bytes[:20] + b"\xff" * 8 + pack_bytes[28:])
+    corrupt_repository = read_animation_pack(pack_path, png_path, json_path)
+
+    animation_repository = load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+
+    # assert - the pack is compiled again
+    assert truncated_repository is None and corrupt_repository is None
+    assert [*animation_repository.keys()] == ["idle", "run"]
+    assert pack_path.read_bytes() == pack_bytes
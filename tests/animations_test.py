@@ -2,6 +2,8 @@
 Module with animations tests.
 """
 
+from src.animations import Animator
+from src.animations import AnimatorPool
 from src.animations import SpriteSheetParser
 
 
@@ -65,3 +67,121 @@ def test_should_build_animation_repository():
 
     assert animation_repository["run"][1]["frames"] == 30
     assert animation_repository["run"][1]["image_id"] == "hero-run-1"
+
+
+def test_should_return_cached_flipped_images():
+    # arrange
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    animator = Animator("idle", parser.build_animation_repository())
+
+    # act
+    flipped_image = animator.image_for(True, False)
+
+    # assert - same surface is returned on each call and the original image is kept unflipped
+    assert flipped_image is animator.image_for(True, False)
+    assert animator.image_for(False, False) is animator.image
+    assert flipped_image.get_at((0, 0)) == animator.image.get_at((15, 0))
+
+
+def test_should_build_animation_repository_with_spritesheet_views():
+    # arrange
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+
+    # act
+    animation_repository = parser.build_animation_repository(copy_frames=False)
+
+    # assert - images are views of the spritesheet at their frame offset
+    idle_image = animation_repository["idle"][2]["image"]
+
+    assert idle_image.get_parent() is parser.spritesheet_image
+    assert idle_image.get_offset() == (32, 0)
+    assert idle_image.get_at((3, 7)) == parser.spritesheet_image.get_at((35, 7))
+
+    # assert - frames beyond the test spritesheet png (64x16) are still copied
+    assert animation_repository["run"][1]["image"].get_parent() is None
+
+
+def test_should_advance_animation_by_elapsed_time():
+    # arrange - idle durations are 200, 200, 200 and 400 ms
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    animation_repository = parser.build_animation_repository()
+    animator = Animator("idle", animation_repository, time_based=True)
+    idle_images = [image_frames["image"] for image_frames in animation_repository["idle"]]
+
+    # act - same elapsed time in frames of different durations
+    positions = []
+
+    for dt in [0.1, 0.15, 0.2, 0.35, 0.005, 0.2]:
+        animator.update(dt)
+        positions.append(idle_images.index(animator.image))
+
+    # assert - 100, 250, 450, 800, 805 and 1005 (wraps to 5) ms
+    assert positions == [0, 1, 2, 3, 3, 0]
+
+
+def test_should_advance_pooled_animators_like_time_based_animators():
+    # arrange
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    animation_repository = parser.build_animation_repository()
+
+    pool = AnimatorPool(animation_repository, capacity=1)  # forces the pool to grow
+    animators = [Animator("idle", animation_repository, time_based=True) for _ in range(3)]
+    handles = [pool.add("idle") for _ in range(3)]
+
+    animators[2].change_action("run")
+    handles[2].change_action("run")
+
+    # act
+    for dt in [0.1, 0.15, 0.2, 0.35, 0.005, 0.2]:
+        pool.update(dt)
+
+        for animator in animators:
+            animator.update(dt)
+
+        # assert
+        assert [handle.image for handle in handles] == [animator.image for animator in animators]
+        assert [handle.image_for(True, False) for handle in handles] == [
+            animator.image_for(True, False) for animator in animators
+        ]
+
+
+def test_should_stick_pooled_animators_to_first_image_of_actions_without_durations():
+    # arrange
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    animation_repository = parser.build_animation_repository()
+    animation_repository["still"] = [
+        {**image_frames, "duration": 0} for image_frames in animation_repository["idle"][:2]
+    ]
+
+    pool = AnimatorPool(animation_repository)
+    handle = pool.add("still")
+    animator = Animator("still", animation_repository, time_based=True)
+
+    # act
+    pool.update(0.1)
+    animator.update(0.1)
+
+    # assert
+    assert handle.image is animator.image is animation_repository["still"][0]["image"]
+
+
+def test_should_reuse_removed_animator_slots():
+    # arrange
+    parser = SpriteSheetParser()
+    parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    pool = AnimatorPool(parser.build_animation_repository())
+    handle = pool.add("idle")
+    pool.add("idle")
+
+    # act
+    pool.remove(handle)
+    new_handle = pool.add("run")
+
+    # assert
+    assert len(pool) == 2
+    assert new_handle.slot == handle.slot
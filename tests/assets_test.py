@@ -0,0 +1,176 @@
+"""
+Module with asset loading tests.
+"""
+import os
+
+import pygame
+
+from src.animation_packs import load_animation_repository
+from src.animations import SpriteSheetParser
+from src.assets import ASSET_REGISTRY
+from src.assets import COLORKEY_RGB
+from src.assets import AssetRegistry
+from src.assets import convert_for_display
+from src.assets import surface_memory_size
+from src.maps import TiledMap
+from src.settings import ROOT_DIR
+
+
+def build_image(alpha_at_corner: int, color=(10, 20, 30)) -> pygame.Surface:
+    image = pygame.Surface((4, 4), pygame.SRCALPHA)
+    image.fill((*color, 255))
+    image.set_at((0, 0), (*color, alpha_at_corner))
+
+    return image
+
+
+def rendered(image: pygame.Surface) -> bytes:
+    """
+    Pixels of the image blitted on a background: images that look the same have the same rendered pixels.
+    """
+    background = pygame.Surface(image.get_size())
+    background.fill((1, 2, 3))
+    background.blit(image, (0, 0))
+
+    return pygame.image.tobytes(background, "RGB")
+
+
+def test_should_convert_images_according_to_their_transparency(display):
+    # act
+    opaque = convert_for_display(build_image(255))
+    with_holes = convert_for_display(build_image(0))
+    translucent = convert_for_display(build_image(128))
+    using_colorkey_color = convert_for_display(build_image(0, COLORKEY_RGB))
+
+    # assert - images with holes are keyed out (RLE) and still look the same
+    assert opaque.get_colorkey() is None and not opaque.get_flags() & pygame.SRCALPHA
+    assert with_holes.get_colorkey() == (*COLORKEY_RGB, 255) and with_holes.get_flags() & pygame.RLEACCELOK
+    assert rendered(with_holes) == rendered(build_image(0))
+    assert translucent.get_flags() & pygame.SRCALPHA
+    assert using_colorkey_color.get_flags() & pygame.SRCALPHA and using_colorkey_color.get_colorkey() is None
+
+
+def test_should_not_convert_images_without_display():
+    # arrange
+    image = build_image(0)
+
+    # act
+    converted = convert_for_display(image)
+
+    # assert
+    assert converted is image
+
+
+def test_should_share_images_by_canonical_path_and_content(display, tmp_path):
+    # arrange
+    asset_registry = AssetRegistry()
+    image_path = ROOT_DIR.joinpath("assets/maps/tilemap.png")
+    copied_image_path = tmp_path.joinpath("copied-tilemap.png")
+    copied_image_path.write_bytes(image_path.read_bytes())
+
+    # act
+    handle = asset_registry.acquire_image(image_path)
+    same_path_handle = asset_registry.acquire_image(ROOT_DIR.joinpath("assets/maps/../maps/tilemap.png"))
+    same_content_handle = asset_registry.acquire_image(copied_image_path)
+
+    # assert
+    stats = asset_registry.stats()
+
+    assert same_path_handle.surface is handle.surface and same_content_handle.surface is handle.surface
+    assert len(asset_registry) == 1
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert stats.bytes_resident == stats.bytes_referenced == surface_memory_size(handle.surface)
+    assert handle.surface.get_bitsize() == pygame.display.get_surface().get_bitsize()
+
+
+def test_should_evict_unreferenced_assets_least_recently_used_first(display):
+    # arrange - the budget fits two assets
+    asset_size = surface_memory_size(pygame.Surface((4, 4)))
+    asset_registry = AssetRegistry(memory_budget=2 * asset_size)
+
+    def acquire(name: str):
+        return asset_registry.acquire(("test", name), lambda: pygame.Surface((4, 4)))
+
+    first, second = acquire("first"), acquire("second")
+    first.release()
+    second.release()
+    acquire("first").release()  # second is now the least recently used
+
+    # act
+    third = acquire("third")
+    fourth = acquire("fourth")
+
+    # assert - referenced assets are never evicted, even over the budget
+    stats = asset_registry.stats()
+
+    assert (stats.evictions, stats.resident_assets) == (2, 2)
+    assert stats.bytes_resident == stats.bytes_referenced == 2 * asset_size
+
+    third.release()
+    third.release()  # releasing twice has no effect
+    fourth.release()
+    asset_registry.clear()
+
+    assert asset_registry.stats().bytes_resident == 0
+
+
+def test_should_hash_changed_images_again(display, tmp_path):
+    # arrange
+    asset_registry = AssetRegistry()
+    image_path = tmp_path.joinpath("image.png")
+    pygame.image.save(build_image(255, (10, 20, 30)), image_path)
+    handle = asset_registry.acquire_image(image_path)
+
+    # act
+    pygame.image.save(build_image(255, (40, 50, 60)), image_path)
+    os.utime(image_path, ns=(0, 0))  # the mtime changes, even on coarse filesystem clocks
+    changed_handle = asset_registry.acquire_image(image_path)
+
+    # assert
+    assert changed_handle.surface is not handle.surface
+    assert changed_handle.surface.get_at((1, 1)) == (40, 50, 60, 255)
+
+
+def test_should_release_spritesheets_of_built_repositories(display):
+    # act
+    spritesheet_parser = SpriteSheetParser()
+    spritesheet_parser.load_spritesheet("hero-idle-test", "tests/resources/")
+    spritesheet_parser.build_animation_repository()
+    spritesheet_parser.release_spritesheet()
+
+    ASSET_REGISTRY.clear()  # evicts the unreferenced assets
+
+    # assert - the spritesheet was evicted: acquiring it again loads it again
+    handle = ASSET_REGISTRY.acquire_image(ROOT_DIR.joinpath("tests/resources/hero-idle-test.png"), rle=False)
+
+    assert handle.surface is not spritesheet_parser.spritesheet_image
+
+    handle.release()
+
+
+def test_should_share_tiles_between_maps(display):
+    # act
+    tiled_map = TiledMap("tiled-level-01.tmx")
+    same_tiled_map = TiledMap("tiled-level-01.tmx")
+
+    # assert
+    gid = next(gid for gid, image in enumerate(tiled_map.tmx_map.images) if image)
+
+    assert same_tiled_map.tmx_map.images[gid] is tiled_map.tmx_map.images[gid]
+
+    tiled_map.release_assets()
+    same_tiled_map.release_assets()
+
+
+def test_should_keep_transparency_of_converted_frames_in_packs(display, tmp_path):
+    # arrange
+    spritesheet = pygame.image.load(ROOT_DIR.joinpath("tests/resources/hero-idle-test.png"))
+
+    # act - first load compiles the pack from converted frames, second load reads it
+    load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+    animation_repository = load_animation_repository("hero-idle-test", "tests/resources/", tmp_path)
+
+    # assert
+    first_frame = animation_repository["idle"][0]["image"]
+
+    assert rendered(first_frame) == rendered(spritesheet.subsurface((0, 0, 16, 16)))
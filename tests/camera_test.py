@@ -0,0 +1,103 @@
+"""
+Module with camera tests.
+"""
+import numpy as np
+from pygame.rect import Rect
+
+from src.camera import Camera
+from src.camera import DeadzoneFollow
+from src.camera import FollowStrategy
+from src.camera import LerpFollow
+from src.camera import LookaheadFollow
+
+
+def test_should_update_camera_in_place_and_clamp_it_to_map():
+    # arrange
+    camera = Camera(1000, 500, view_size=(300, 200), follow=FollowStrategy())
+    camera_rect, view_rect = camera.rect, camera.view_rect
+
+    # act
+    camera.update(Rect(500, 250, 16, 16))
+    centered_offset = camera.offset
+    camera.update(Rect(10, 10, 16, 16))
+    top_left_offset = camera.offset
+    camera.update(Rect(990, 490, 16, 16))
+    bottom_right_offset = camera.offset
+
+    # assert - rects are updated in place
+    assert camera.rect is camera_rect and camera.view_rect is view_rect
+    assert centered_offset == (-350, -150)
+    assert top_left_offset == (0, 0)
+    assert bottom_right_offset == (-700, -300)
+    assert camera.view_rect == Rect(700, 300, 300, 200)
+
+
+def test_should_clamp_camera_to_custom_bounds():
+    # arrange
+    camera = Camera(1000, 500, view_size=(300, 200), follow=FollowStrategy(), bounds=Rect(100, 0, 500, 500))
+
+    # act
+    camera.update(Rect(0, 0, 16, 16))
+    left_offset = camera.offset
+    camera.update(Rect(900, 0, 16, 16))
+
+    # assert
+    assert left_offset == (-100, 0)
+    assert camera.offset == (-300, 0)
+
+
+def test_should_lerp_towards_target():
+    # arrange
+    camera = Camera(1000, 500, view_size=(300, 200), follow=LerpFollow(0.5))
+
+    # act
+    camera.update(Rect(450, 200, 16, 16))
+
+    # assert - halfway towards (-300, -100)
+    assert camera.offset == (-150, -50)
+
+
+def test_should_only_move_camera_when_target_leaves_deadzone():
+    # arrange
+    camera = Camera(1000, 500, view_size=(300, 200), follow=DeadzoneFollow((100, 100)))  # zone: (100, 50) to (200, 150)
+
+    # act
+    camera.update(Rect(150, 100, 10, 10))
+    inside_offset = camera.offset
+    camera.update(Rect(250, 100, 10, 10))
+
+    # assert - just enough for the target's right to reach the zone's right
+    assert inside_offset == (0, 0)
+    assert camera.offset == (-60, 0)
+
+
+def test_should_look_ahead_of_target_moving_direction():
+    # arrange
+    camera = Camera(1000, 500, view_size=(300, 200), follow=LookaheadFollow(distance=50, fraction=1))
+    target = Rect(400, 200, 16, 16)
+
+    # act
+    camera.update(target)
+    target.x += 2
+    camera.update(target)
+
+    # assert - target is 50 pixels left of the center
+    assert camera.offset == (-402 + 150 - 50, -100)
+
+
+def test_should_transform_world_positions_to_screen():
+    # arrange
+    camera = Camera(1000, 500, view_size=(300, 200), follow=FollowStrategy())
+    camera.update(Rect(500, 250, 16, 16))
+    positions = np.array([[350, 150], [400, 200]])
+    rect = Rect(360, 160, 16, 16)
+
+    # act
+    screen_positions = camera.world_to_screen(positions)
+    camera.world_to_screen(positions, out=positions)
+    camera.apply_offset_ip(rect)
+
+    # assert
+    assert screen_positions.tolist() == [[0, 0], [50, 50]]
+    assert positions.tolist() == [[0, 0], [50, 50]]
+    assert rect == Rect(10, 10, 16, 16)
@@ -0,0 +1,82 @@
+"""
+Module with collidables tests.
+"""
+from pygame.rect import Rect
+
+from src.collidables import Collidable
+from src.collidables import CollidablesGroup
+from src.collidables import sweep_x
+from src.collidables import sweep_y
+
+
+def test_should_only_collide_with_overlapping_collidables():
+    # arrange
+    collidables = CollidablesGroup(cell_size=16)
+    floor = Collidable(0, 100, 160, 16, collidables)  # spans 10 cells
+    wall = Collidable(40, 60, 16, 40, collidables)
+    Collidable(500, 500, 16, 16, collidables)  # far away
+
+    # act
+    collisions = collidables.collide(Rect(30, 90, 16, 16))
+
+    # assert
+    assert collisions == [wall, floor] or collisions == [floor, wall]
+    assert collidables.collide(Rect(200, 0, 16, 16)) == []
+
+
+def test_should_return_unique_movement_candidates():
+    # arrange
+    collidables = CollidablesGroup(cell_size=16)
+    floor = Collidable(0, 100, 160, 16, collidables)
+    Collidable(500, 500, 16, 16, collidables)
+
+    # act
+    candidates = collidables.movement_candidates(Rect(0, 0, 16, 16), 64, 96)
+
+    # assert
+    assert candidates == [floor]
+
+
+def test_should_unindex_removed_collidables():
+    # arrange
+    collidables = CollidablesGroup(cell_size=16)
+    floor = Collidable(0, 100, 160, 16, collidables)
+
+    # act
+    floor.kill()
+
+    # assert
+    assert len(collidables) == 0
+    assert collidables.collide(Rect(0, 100, 16, 16)) == []
+
+
+def test_should_stop_fast_rect_at_first_collidable_hit():
+    # arrange - thin platforms far below the rect, moving further than them in a single step
+    collidables = CollidablesGroup(cell_size=16)
+    near_platform = Collidable(0, 100, 64, 2, collidables)
+    Collidable(0, 200, 64, 2, collidables)
+    rect = Rect(10, 0, 8, 8)
+
+    # act
+    allowed_dy, hit = sweep_y(rect, 500, collidables.movement_candidates(rect, 0, 500))
+
+    # assert
+    assert hit is near_platform
+    assert allowed_dy == 92  # rect.bottom touches the platform top
+
+
+def test_should_sweep_freely_without_collidables_ahead():
+    # arrange - a wall behind the rect (already left behind) and one out of its vertical range
+    collidables = CollidablesGroup(cell_size=16)
+    Collidable(0, 0, 4, 16, collidables)
+    Collidable(100, 50, 4, 16, collidables)
+    rect = Rect(10, 0, 8, 8)
+
+    # act
+    allowed_dx, hit = sweep_x(rect, 200, collidables.movement_candidates(rect, 200, 0))
+    allowed_back_dx, back_hit = sweep_x(rect, -50, collidables.movement_candidates(rect, -50, 0))
+
+    # assert
+    assert (allowed_dx, hit) == (200, None)
+    assert allowed_back_dx == -6
+    assert back_hit is not None
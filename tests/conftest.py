@@ -0,0 +1,19 @@
+"""
+Module with shared pytest fixtures.
+"""
+import os
+
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # no window is opened by the tests
+
+
+@pytest.fixture
+def display():
+    """
+    Initializes a (dummy) display which is required for converting surfaces, such as tiles loaded by pytmx.
+    """
+    pygame.display.init()
+    yield pygame.display.set_mode((1, 1))
+    pygame.display.quit()
@@ -0,0 +1,64 @@
+"""
+Module with entity factory and static objects tests.
+"""
+from types import SimpleNamespace
+
+import pygame
+from pygame.rect import Rect
+from pygame.sprite import Group
+from pygame.sprite import Sprite
+
+from src.entities import EntityFactory
+from src.entities import StaticObjects
+
+
+def build_tiled_object(name=None, type=None, x=0, y=0, image=None) -> SimpleNamespace:
+    return SimpleNamespace(name=name, type=type, x=x, y=y, width=16, height=16, image=image)
+
+
+def test_should_build_entities_by_object_name_or_type():
+    # arrange
+    entity_factory = EntityFactory()
+    entity_factory.register("player", lambda tiled_object: Sprite())
+    entity_factory.register("enemy", lambda tiled_object: Sprite())
+    entity_factory.register_static("decoration")
+    static_objects = StaticObjects()
+    tiled_objects = [
+        build_tiled_object(name="player"),
+        build_tiled_object(name="slime", type="enemy"),
+        build_tiled_object(name="bush", type="decoration", x=32),
+        build_tiled_object(name="rock", x=48, image=pygame.Surface((16, 16))),  # unregistered tile object
+        build_tiled_object(name="collidable"),  # unregistered: left to others
+    ]
+
+    # act
+    entities = entity_factory.build(tiled_objects, static_objects)
+
+    # assert
+    assert len(entities) == 2
+    assert len(static_objects) == 2
+    assert (static_objects.kind_of(0), static_objects.rect_of(0)) == ("decoration", Rect(32, 0, 16, 16))
+    assert static_objects.kind_of(1) == "rock" and static_objects.image_of(1) is tiled_objects[3].image
+
+
+def test_should_promote_static_objects_only_near_the_view():
+    # arrange
+    group = Group()
+    static_objects = StaticObjects(group, cell_size=64, margin=16)
+    image = pygame.Surface((16, 16))
+    near_index = static_objects.add("decoration", 10, 10, 16, 16, image)
+    far_index = static_objects.add("decoration", 1000, 10, 16, 16, image)
+    static_objects.add("trigger", 20, 20, 16, 16)  # no image: promoted but not drawn
+
+    # act
+    static_objects.update(Rect(0, 0, 100, 100))
+    near_sprites = static_objects.promoted_sprites
+
+    static_objects.update(Rect(900, 0, 100, 100))
+    far_sprites = static_objects.promoted_sprites
+
+    # assert
+    assert [sprite.index for sprite in near_sprites] == [near_index, 2]
+    assert [sprite.index for sprite in far_sprites] == [far_index]
+    assert group.sprites() == far_sprites
+    assert not near_sprites[0].alive()
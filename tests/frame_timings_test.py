@@ -0,0 +1,69 @@
+"""
+Module with frame timings tests.
+"""
+from unittest import mock
+
+import pytest
+
+from src.frame_timings import FrameTimings
+
+
+@mock.patch("src.profiler.perf_counter")  # phases are measured by timing scopes
+def test_should_sum_phase_durations_per_frame(mock_perf_counter):
+    # arrange - each scope takes 1 ms, except the second frame's render which takes 3 ms
+    mock_perf_counter.side_effect = [0, 0.001, 0, 0.001, 0, 0.001, 0, 0.003]
+    timings = FrameTimings()
+
+    # act - update runs twice on the first frame, but only render runs on the second
+    for _ in range(2):
+        with timings.phase("update"):
+            pass
+
+    with timings.phase("render"):
+        pass
+
+    timings.end_frame()
+
+    with timings.phase("render"):
+        pass
+
+    timings.end_frame()
+
+    # assert
+    assert timings.frames == 2
+    assert timings.percentiles("update")[0] == pytest.approx(0.001)  # p50 of [2 ms, 0 ms]
+    assert timings.percentiles("render")[2] == pytest.approx(0.00298)  # p99 of [1 ms, 3 ms]
+
+
+def test_should_collect_nothing_when_disabled():
+    # arrange
+    timings = FrameTimings(enabled=False)
+
+    # act
+    with timings.phase("update"):
+        pass
+
+    timings.end_frame()
+
+    # assert
+    assert timings.frames == 0
+
+
+def test_should_write_per_frame_trace(tmp_path):
+    # arrange
+    timings = FrameTimings()
+    timings.add("update", 0.001)
+    timings.add("render", 0.002)
+    timings.end_frame()
+    timings.add("render", 0.004)
+    timings.end_frame()
+
+    # act
+    timings.write_trace(tmp_path.joinpath("trace.csv"))
+
+    # assert
+    assert tmp_path.joinpath("trace.csv").read_text().splitlines() == [
+        "frame,update,render,total",
+        "0,1.000,2.000,3.000",
+        "1,0.000,4.000,4.000",
+    ]
@@ -8,7 +8,9 @@ from pygame.constants import K_SPACE
 from pygame.constants import KEYDOWN
 from pygame.event import Event
 
+from src.inputs import CapturedInput
 from src.inputs import capture_player_inputs
+from src.inputs import merge_captured_inputs
 
 
 @mock.patch("src.inputs.pygame.event.get")
@@ -32,3 +34,27 @@ def test_should_capture_right_keydown(mock_pygame_get):
     assert captured_inputs.moving_left is False
     assert captured_inputs.moving_right is True
     assert captured_inputs.has_jumped is True
+
+
+def test_should_merge_captured_inputs():
+    # arrange
+    first_input = CapturedInput(moving_right=True)
+    second_input = CapturedInput(has_jumped=True, moving_right_stop=True)
+
+    # act
+    merged_input = merge_captured_inputs(first_input, second_input)
+
+    # assert - the newer stop wins
+    assert merged_input == CapturedInput(moving_right_stop=True, has_jumped=True)
+
+
+def test_should_keep_newer_press_over_pending_stop():
+    # arrange - released on a frame without simulation steps, pressed again on the next one
+    pending_input = CapturedInput(moving_left=True, moving_right_stop=True)
+    new_input = CapturedInput(moving_right=True)
+
+    # act
+    merged_input = merge_captured_inputs(pending_input, new_input)
+
+    # assert
+    assert merged_input == CapturedInput(moving_left=True, moving_right=True)
@@ -0,0 +1,93 @@
+"""
+Module with levels streaming tests.
+"""
+import shutil
+from pathlib import Path
+from xml.etree.ElementTree import ParseError
+
+import pytest
+
+from src.levels import LevelManager
+from src.settings import ROOT_DIR
+
+
+@pytest.fixture
+def maps_folder(tmp_path):
+    """
+    Folder with copies of the first level (and its tileset) under different level names.
+    """
+    shutil.copy(ROOT_DIR.joinpath("assets/maps/tilemap.png"), tmp_path)
+
+    for level_name in ["level-a.tmx", "level-b.tmx", "level-c.tmx"]:
+        shutil.copy(ROOT_DIR.joinpath("assets/maps/tiled-level-01.tmx"), tmp_path.joinpath(level_name))
+
+    return str(tmp_path)
+
+
+def test_should_hand_over_preloaded_level(display, maps_folder):
+    # arrange
+    level_manager = LevelManager(maps_folder)
+
+    # act
+    level_manager.preload("level-a.tmx")
+    level = level_manager.load("level-a.tmx")
+
+    # assert - the level is loaded with all its chunks and is cached
+    assert level.tiled_map.total_map_width == 480
+    assert level.map_renderer.rendered_chunks == 4
+    assert level_manager.get("level-a.tmx") is level
+
+    level_manager.shutdown()
+
+
+def test_should_load_level_again_after_failed_load(display, maps_folder):
+    # arrange
+    level_manager = LevelManager(maps_folder)
+    level_path = Path(maps_folder).joinpath("level-a.tmx")
+    level_contents = level_path.read_text()
+    level_path.write_text("not a tmx file")
+
+    # act
+    with pytest.raises(ParseError):
+        level_manager.load("level-a.tmx")
+
+    level_path.write_text(level_contents)  # fixed
+    level = level_manager.load("level-a.tmx")
+
+    # assert
+    assert level.tiled_map.total_map_width == 480
+
+    level_manager.shutdown()
+
+
+def test_should_evict_least_recently_used_levels(display, maps_folder):
+    # arrange
+    level_manager = LevelManager(maps_folder, max_levels=2)
+
+    # act
+    level_a = level_manager.load("level-a.tmx")
+    level_manager.load("level-b.tmx")
+    level_manager.load("level-a.tmx")  # level-b becomes the least recently used
+    level_manager.load("level-c.tmx")
+
+    # assert
+    assert level_manager.loaded_levels == 2
+    assert level_manager.is_ready("level-b.tmx") is False
+    assert level_manager.get("level-a.tmx") is level_a
+
+    level_manager.shutdown()
+
+
+def test_should_keep_only_most_recent_level_beyond_memory_budget(display, maps_folder):
+    # arrange
+    level_manager = LevelManager(maps_folder, memory_budget=1)
+
+    # act
+    level_manager.load("level-a.tmx")
+    level_b = level_manager.load("level-b.tmx")
+
+    # assert
+    assert level_manager.loaded_levels == 1
+    assert level_manager.memory_size == level_b.memory_size
+
+    level_manager.shutdown()
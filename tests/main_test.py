@@ -0,0 +1,14 @@
+"""
+Module with main game loop tests.
+"""
+from src.__main__ import main
+
+
+def test_should_run_headless_game_loop_and_time_its_phases():
+    # act
+    timings = main(headless=True, frames=120)
+
+    # assert
+    assert timings.frames == 120
+    assert "player update" in timings.report()
+    assert "scale" in timings.report()
@@ -0,0 +1,235 @@
+"""
+Module with maps tests.
+"""
+import shutil
+
+import pygame
+import pytest
+from pygame.rect import Rect
+
+from src.maps import ChunkedMapRenderer
+from src.maps import TiledMap
+from src.maps import mesh_rects
+from src.settings import ROOT_DIR
+
+
+@pytest.fixture
+def parallax_maps_folder(tmp_path):
+    """
+    Folder with copies of the first level whose platforms layer (drawn first) is a parallax layer: at half the
+    camera speed and at twice the camera speed repeated horizontally.
+    """
+    shutil.copy(ROOT_DIR.joinpath("assets/maps/tilemap.png"), tmp_path)
+    tmx = ROOT_DIR.joinpath("assets/maps/tiled-level-01.tmx").read_text()
+
+    for level_name, factor, repeat_x in [("parallax.tmx", 0.5, "false"), ("parallax-repeat.tmx", 2, "true")]:
+        properties = (
+            f'<properties><property name="parallax" type="float" value="{factor}"/>'
+            f'<property name="repeat_x" type="bool" value="{repeat_x}"/></properties>'
+        )
+        tmp_path.joinpath(level_name).write_text(
+            tmx.replace(
+                'name="platforms" width="30" height="30">', f'name="platforms" width="30" height="30">{properties}'
+            )
+        )
+
+    return str(tmp_path)
+
+
+@pytest.fixture
+def animated_maps_folder(tmp_path):
+    """
+    Folder with a copy of the first level whose floating platform tiles (tile 21) are animated: they alternate with
+    tile 3 every 100 ms.
+    """
+    shutil.copy(ROOT_DIR.joinpath("assets/maps/tilemap.png"), tmp_path)
+    tmx = ROOT_DIR.joinpath("assets/maps/tiled-level-01.tmx").read_text()
+    image = '<image source="tilemap.png" width="128" height="128"/>'
+    frames = '<frame tileid="21" duration="100"/><frame tileid="3" duration="100"/>'
+    animation = f'<tile id="21"><animation>{frames}</animation></tile>'
+    tmp_path.joinpath("animated.tmx").write_text(tmx.replace(image, image + animation))
+
+    return str(tmp_path)
+
+
+def render_layers(level: TiledMap, layers, tiles_rect: Rect) -> pygame.Surface:
+    surface = pygame.Surface((tiles_rect.width * 16, tiles_rect.height * 16), pygame.SRCALPHA)
+    level.render_tiles_on(surface, tiles_rect, layers)
+
+    return surface
+
+
+def test_should_yield_only_chunks_intersecting_view(display):
+    # arrange
+    level = TiledMap("tiled-level-01.tmx")  # 30x30 tiles of 16x16
+    renderer = ChunkedMapRenderer(level, chunk_size=8)  # 4x4 chunks of 128x128
+
+    # act
+    chunks = [*renderer.visible_chunks(Rect(100, 130, 300, 200))]
+
+    # assert
+    assert chunks == [(0, 1), (1, 1), (2, 1), (3, 1), (0, 2), (1, 2), (2, 2), (3, 2)]
+
+
+def test_should_render_same_pixels_as_whole_map(display):
+    # arrange
+    level = TiledMap("tiled-level-01.tmx")
+    renderer = ChunkedMapRenderer(level, chunk_size=8)
+    offset = (-70, -230)
+
+    expected_display = pygame.Surface((300, 200))
+    expected_display.blit(level.build_map(), offset)
+    chunked_display = pygame.Surface((300, 200))
+
+    # act
+    renderer.render_on(chunked_display, offset)
+
+    # assert - only the visible chunks were rendered
+    assert renderer.rendered_chunks == 9
+    assert pygame.image.tostring(chunked_display, "RGB") == pygame.image.tostring(expected_display, "RGB")
+
+
+def test_should_mesh_adjacent_and_overlapping_rects():
+    # arrange - a row of tiles, a column of tiles below its end and a rect inside the row
+    row_tiles = [Rect(x * 16, 0, 16, 16) for x in range(10)]
+    column_tiles = [Rect(144, y * 16, 16, 16) for y in range(1, 6)]
+
+    # act
+    meshed_rects = mesh_rects(row_tiles + column_tiles + [Rect(20, 2, 8, 8)])
+
+    # assert - same area covered by 2 rects
+    assert len(meshed_rects) == 2
+    assert sum(rect.width * rect.height for rect in meshed_rects) == 15 * 16 * 16
+    assert all(any(rect.contains(tile) for rect in meshed_rects) for tile in row_tiles + column_tiles)
+
+
+def test_should_build_and_cache_merged_collision_rects(display, tmp_path):
+    # arrange
+    level = TiledMap("tiled-level-01.tmx")
+    platform_gid = level.tmx_map.get_layer_by_name("platforms").data[6][16]  # floating platform tile
+
+    # act
+    collision_rects = level.collision_rects(
+        solid_layer_name="platforms", solid_gids=frozenset([platform_gid]), cache_dir=tmp_path
+    )
+    cached_collision_rects = level.collision_rects(
+        solid_layer_name="platforms", solid_gids=frozenset([platform_gid]), cache_dir=tmp_path
+    )
+
+    # assert - the 24 collidable objects plus the solid tiles are merged into fewer rects
+    solid_tiles_rects = level.solid_tiles_rects("platforms", frozenset([platform_gid]))
+
+    assert Rect(256, 96, 16, 16) in solid_tiles_rects
+    assert len(collision_rects) < 24 + len(solid_tiles_rects)
+    assert cached_collision_rects == collision_rects
+    assert level.collision_rects_cache_path(tmp_path).exists()
+    assert [*tmp_path.iterdir()] == [level.collision_rects_cache_path(tmp_path)]  # no temporary files left behind
+
+
+def test_should_keep_collision_caches_of_same_named_maps_apart(display, tmp_path):
+    # arrange - copy of the map (same name, mtime and size) in another folder
+    maps_folder, cache_dir = tmp_path.joinpath("maps"), tmp_path.joinpath("cache")
+    maps_folder.mkdir()
+    shutil.copy(ROOT_DIR.joinpath("assets/maps/tilemap.png"), maps_folder)
+    shutil.copy2(ROOT_DIR.joinpath("assets/maps/tiled-level-01.tmx"), maps_folder)
+    level, other_level = TiledMap("tiled-level-01.tmx"), TiledMap("tiled-level-01.tmx", str(maps_folder))
+
+    # act
+    level.collision_rects(cache_dir=cache_dir)
+    other_level.collision_rects(cache_dir=cache_dir)
+
+    # assert - each map has its own cache
+    assert level.collision_rects_cache_path(cache_dir) != other_level.collision_rects_cache_path(cache_dir)
+    assert len([*cache_dir.iterdir()]) == 2
+
+
+def test_should_render_parallax_layer_behind_map(display, parallax_maps_folder):
+    # arrange
+    level = TiledMap("parallax.tmx", parallax_maps_folder)
+    renderer = ChunkedMapRenderer(level, chunk_size=8)
+    platforms = level.tmx_map.get_layer_by_name("platforms")
+    offset = (-70, -230)
+
+    parallax_display = pygame.Surface((300, 200))
+    expected_display = pygame.Surface((300, 200))
+    expected_display.blit(render_layers(level, [platforms], Rect(0, 0, 30, 30)), (-35, -115))  # half the offset
+    expected_display.blit(render_layers(level, level.scrolling_layers, Rect(0, 0, 30, 30)), offset)
+
+    # act
+    renderer.render_on(parallax_display, offset)
+
+    # assert - the strip covers only the layer's tiles
+    assert renderer.background_strips[0].rect == Rect(0, 96, 480, 384)
+    assert level.scrolling_layers == [level.tmx_map.get_layer_by_name("platforms-front")]
+    assert not renderer.foreground_strips
+    assert pygame.image.tobytes(parallax_display, "RGB") == pygame.image.tobytes(expected_display, "RGB")
+
+
+def test_should_repeat_parallax_strip_horizontally(display, parallax_maps_folder):
+    # arrange
+    level = TiledMap("parallax-repeat.tmx", parallax_maps_folder)
+    renderer = ChunkedMapRenderer(level, chunk_size=8)
+    strip = renderer.background_strips[0]
+    strip_tiles_rect = Rect(strip.rect.x // 16, strip.rect.y // 16, strip.rect.width // 16, strip.rect.height // 16)
+    strip_surface = render_layers(level, [level.tmx_map.get_layer_by_name("platforms")], strip_tiles_rect)
+    offset = (-180, -230)
+
+    parallax_display = pygame.Surface((300, 200))
+    expected_display = pygame.Surface((300, 200))
+
+    for copy in range(-2, 3):
+        expected_display.blit(strip_surface, (strip.rect.x - 360 + copy * strip.rect.width, strip.rect.y - 460))
+
+    expected_display.blit(render_layers(level, level.scrolling_layers, Rect(0, 0, 30, 30)), offset)
+
+    # act
+    renderer.render_on(parallax_display, offset)
+
+    # assert - the next copy of the strip is visible
+    assert strip.repeat_x and strip.factor == 2
+    assert strip.rect.right - 360 < 300
+    assert pygame.image.tobytes(parallax_display, "RGB") == pygame.image.tobytes(expected_display, "RGB")
+
+
+def test_should_share_frame_clock_of_animated_gid(display, animated_maps_folder):
+    # arrange
+    level = TiledMap("animated.tmx", animated_maps_folder)
+    platform_gid = level.tmx_map.get_layer_by_name("platforms").data[6][16]
+    first_frame, second_frame = level.tmx_map.get_tile_properties_by_gid(platform_gid)["frames"]
+
+    # act
+    first_changes = level.animations.update(0.05)
+    second_changes = level.animations.update(0.06)
+
+    # assert
+    assert level.animations.gids == [platform_gid]
+    assert first_frame.gid == platform_gid
+    assert first_changes == []
+    assert second_changes == [platform_gid]
+    assert level.animations.current_gids[platform_gid] == second_frame.gid
+
+
+def test_should_redraw_only_animated_tiles_of_rendered_chunks(display, animated_maps_folder):
+    # arrange
+    level = TiledMap("animated.tmx", animated_maps_folder)
+    renderer = ChunkedMapRenderer(level, chunk_size=8)
+    platforms = level.tmx_map.get_layer_by_name("platforms")
+    platform_gid = platforms.data[6][16]
+    offset = (0, 0)
+    chunked_display = pygame.Surface((300, 200))  # only the chunks of the first 16 rows are rendered
+    renderer.render_on(chunked_display, offset)
+
+    # act
+    changed_rects = renderer.animate(0.1)
+    renderer.render_on(chunked_display, offset)
+
+    # assert - same pixels as the whole map rendered with the new frames
+    expected_display = pygame.Surface((300, 200))
+    expected_display.blit(level.build_map(), offset)
+    expected_changed_rects = [
+        Rect(x * 16, y * 16, 16, 16) for x, y, gid in platforms.iter_data() if gid == platform_gid and y < 16
+    ]
+
+    assert expected_changed_rects
+    assert sorted(changed_rects) == sorted(expected_changed_rects)
+    assert pygame.image.tobytes(chunked_display, "RGB") == pygame.image.tobytes(expected_display, "RGB")
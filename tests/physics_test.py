@@ -0,0 +1,117 @@
+"""
+Module with physics world tests.
+"""
+import pytest
+
+from src.collidables import Collidable
+from src.collidables import CollidablesGroup
+from src.physics import CONTACT_BOTTOM
+from src.physics import CONTACT_RIGHT
+from src.physics import World
+
+
+@pytest.mark.parametrize("swept", [True, False])
+def test_should_drop_bodies_onto_the_floor(swept):
+    # arrange
+    collidables = CollidablesGroup()
+    Collidable(0, 100, 200, 16, collidables)
+    world = World(collidables, capacity=1, swept=swept)  # forces the world to grow
+    bodies = [world.add_body(x, 0, 8, 8) for x in (10, 50, 90)]
+
+    # act
+    for _ in range(120):
+        world.step(1 / 60)
+
+    # assert
+    assert [body.rect.bottom for body in bodies] == [100, 100, 100]
+    assert all(body.contacts == CONTACT_BOTTOM for body in bodies)
+    assert world.positions[:, 1].tolist() == [92, 92, 92]
+
+
+def test_should_move_and_stop_body_against_wall():
+    # arrange
+    collidables = CollidablesGroup()
+    Collidable(0, 100, 200, 16, collidables)
+    Collidable(40, 0, 16, 100, collidables)
+    world = World(collidables)
+    body = world.add_body(10, 92, 8, 8)
+
+    # act
+    for _ in range(30):
+        body.velocity_x = 180
+        world.step(1 / 60)
+
+    # assert
+    assert body.rect.right == 40
+    assert body.contacts & CONTACT_RIGHT
+
+
+def test_should_replace_gravity_by_impulse_for_a_step():
+    # arrange
+    world = World(CollidablesGroup())
+    body = world.add_body(0, 100, 8, 8)
+
+    # act
+    body.apply_impulse_y(-600)
+    world.step(1 / 60)
+
+    # assert
+    assert body.velocity_y == -600
+    assert body.rect.y == 90
+    assert world.impulses_y[body.slot] == 0
+
+
+@pytest.mark.parametrize("tick_rate", [30, 60, 120])
+def test_should_move_bodies_the_same_way_whatever_the_tick_rate(tick_rate):
+    # arrange
+    world = World(CollidablesGroup())
+    falling_body, running_body = world.add_body(0, 0, 8, 8), world.add_body(0, 0, 8, 8, gravity_scale=0)
+
+    # act - one second of simulation
+    for _ in range(tick_rate):
+        running_body.velocity_x = 180
+        world.step(1 / tick_rate)
+
+    # assert
+    assert falling_body.rect.y == pytest.approx(178, abs=3)
+    assert running_body.rect.topleft == (180, 0)
+
+
+def test_should_reuse_removed_body_slots():
+    # arrange
+    world = World(CollidablesGroup())
+    body = world.add_body(0, 0, 8, 8)
+    world.add_body(0, 0, 8, 8)
+
+    # act
+    world.remove_body(body)
+    world.step(1 / 60)
+    new_body = world.add_body(5, 5, 8, 8)
+
+    # assert
+    assert len(world) == 2
+    assert new_body.slot == body.slot
+    assert new_body.rect.topleft == (5, 5)
+
+
+def test_should_freeze_sleeping_bodies_until_woken_up():
+    # arrange
+    collidables = CollidablesGroup()
+    Collidable(0, 100, 200, 16, collidables)
+    world = World(collidables)
+    sleeping_body, awake_body = world.add_body(10, 0, 8, 8), world.add_body(50, 0, 8, 8)
+    sleeping_body.sleeping = True
+
+    # act
+    for _ in range(120):
+        world.step(1 / 60)
+
+    frozen_y, frozen_velocity_y = sleeping_body.rect.y, sleeping_body.velocity_y
+    sleeping_body.sleeping = False
+
+    for _ in range(120):
+        world.step(1 / 60)
+
+    # assert
+    assert frozen_y == 0 and frozen_velocity_y == 0
+    assert sleeping_body.rect.bottom == awake_body.rect.bottom == 100
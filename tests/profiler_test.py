@@ -0,0 +1,113 @@
+"""
+Module with profiler tests.
+"""
+import json
+from unittest import mock
+
+import pygame
+import pytest
+
+from src.profiler import NULL_TIMING_SCOPE
+from src.profiler import PROFILER
+from src.profiler import Profiler
+from src.profiler import profiled
+
+
+@profiled("profiled_sum")
+def profiled_sum(a: int, b: int) -> int:
+    return a + b
+
+
+def test_should_measure_nothing_while_disabled():
+    # arrange
+    profiler = Profiler()
+
+    # act
+    scope = profiler.scope("update")
+
+    with scope:
+        pass
+
+    profiler.end_frame()
+
+    # assert
+    assert scope is NULL_TIMING_SCOPE
+    assert profiler.frame_times == []
+    assert profiler.trace_events == []
+
+
+@mock.patch("src.profiler.perf_counter")
+def test_should_keep_rolling_frame_and_scope_timings(mock_perf_counter):
+    # arrange - frames end at 0, 10, 30 and 60 ms and the update scope of each frame takes 1 ms
+    mock_perf_counter.side_effect = [0, 0.001, 0.002, 0.010, 0.011, 0.012, 0.030, 0.031, 0.032, 0.060]
+    profiler = Profiler(enabled=True, history_frames=2)
+
+    # act
+    profiler.end_frame()
+
+    for _ in range(3):
+        with profiler.scope("update"):
+            pass
+
+        profiler.end_frame()
+
+    # assert - only the last 2 frames are kept
+    counts, edges = profiler.histogram(bins=2)
+
+    assert profiler.frame_times == pytest.approx([0.020, 0.030])
+    assert counts.tolist() == [1, 1]
+    assert profiler.percentiles("update", percentiles=(50,)) == pytest.approx((0.001,))
+    assert len(profiler.trace_events) == 6  # 3 update scopes and 3 frames
+
+
+def test_should_profile_decorated_functions_only_while_enabled():
+    # act
+    disabled_result = profiled_sum(1, 2)
+    PROFILER.enable()
+
+    try:
+        enabled_result = profiled_sum(2, 3)
+        events = [name for name, _, _ in PROFILER.trace_events]
+    finally:
+        PROFILER.disable()
+
+    # assert
+    assert disabled_result == 3 and enabled_result == 5
+    assert events.count("profiled_sum") == 1
+
+
+def test_should_write_chrome_trace(tmp_path):
+    # arrange
+    profiler = Profiler(enabled=True)
+    profiler.add("render", 1.0, 1.002)
+
+    # act
+    profiler.write_chrome_trace(tmp_path.joinpath("trace.json"))
+
+    # assert
+    trace = json.loads(tmp_path.joinpath("trace.json").read_text())
+
+    assert trace["traceEvents"] == [
+        {"name": "render", "ph": "X", "ts": 1_000_000.0, "dur": pytest.approx(2000), "pid": 0, "tid": 0}
+    ]
+
+
+@mock.patch("src.profiler.perf_counter")
+def test_should_render_overlay_with_slow_frames_in_red(mock_perf_counter):
+    # arrange - a fast frame (5 ms) and a slow frame (100 ms)
+    mock_perf_counter.side_effect = [0, 0.005, 0.105]
+    profiler = Profiler()
+    profiler.enable(overlay=True)
+
+    for _ in range(3):
+        profiler.end_frame()
+
+    raw_display = pygame.Surface((300, 200))
+
+    # act
+    profiler.render_overlay_on(raw_display)
+
+    # assert - the last bars are on the right edge of the overlay
+    assert profiler.overlay
+    assert raw_display.get_at((118, 39)) == (80, 220, 80, 255)
+    assert raw_display.get_at((119, 39)) == (230, 70, 70, 255)
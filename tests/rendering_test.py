@@ -0,0 +1,188 @@
+"""
+Module with rendering tests.
+"""
+from typing import Tuple
+
+import pygame
+from pygame.rect import Rect
+from pygame.sprite import Sprite
+
+from src.frame_timings import FrameTimings
+from src.maps import ChunkedMapRenderer
+from src.maps import TiledMap
+from src.rendering import CameraGroup
+from src.rendering import DirtyRectRenderer
+from src.rendering import Presenter
+from src.rendering import merge_rects
+
+
+def test_should_merge_overlapping_rects():
+    # act
+    merged_rects = merge_rects([Rect(0, 0, 10, 10), Rect(50, 50, 5, 5), Rect(5, 5, 10, 10), Rect(12, 12, 40, 40)])
+
+    # assert
+    assert merged_rects == [Rect(0, 0, 55, 55)]
+
+
+def build_sprite(x: int, y: int, color: Tuple[int, int, int], layer: int = 0) -> Sprite:
+    sprite = Sprite()
+    sprite.image = pygame.Surface((10, 10))
+    sprite.image.fill(color)
+    sprite.rect = sprite.image.get_rect(topleft=(x, y))
+    sprite.layer = layer
+
+    return sprite
+
+
+def test_should_cull_sprites_outside_camera_view():
+    # arrange
+    inside, partially_inside = build_sprite(50, 50, (255, 0, 0)), build_sprite(5, 5, (0, 255, 0))
+    outside = build_sprite(200, 50, (0, 0, 255))
+    camera_group = CameraGroup(inside, partially_inside, outside)
+
+    # act - view of 100x100 starting at world (10, 10)
+    draws = camera_group.visible_draws((100, 100), (-10, -10))
+
+    # assert
+    assert sorted(draws, key=lambda draw: draw[2]) == [
+        (partially_inside, partially_inside.image, (-5, -5)),
+        (inside, inside.image, (40, 40)),
+    ]
+
+
+def test_should_interpolate_sprites_with_previous_topleft():
+    # arrange
+    sprite = build_sprite(20, 10, (255, 0, 0))
+    sprite.previous_topleft = (10, 10)
+    camera_group = CameraGroup(sprite)
+
+    # act
+    draws = camera_group.visible_draws((100, 100), (0, 0), alpha=0.5)
+
+    # assert
+    assert draws == [(sprite, sprite.image, (15, 10))]
+
+
+def test_should_render_sprites_ordered_by_layer():
+    # arrange
+    foreground, background = build_sprite(0, 0, (255, 0, 0), layer=1), build_sprite(5, 5, (0, 0, 255), layer=0)
+    camera_group = CameraGroup(foreground, background, layered=True)
+    raw_display = pygame.Surface((20, 20))
+
+    # act
+    camera_group.render_on(raw_display, (0, 0))
+
+    # assert - the foreground sprite is drawn over the background one despite being added first
+    assert raw_display.get_at((7, 7)) == (255, 0, 0, 255)
+    assert raw_display.get_at((12, 12)) == (0, 0, 255, 255)
+
+
+def test_should_redraw_only_dirty_rects_of_static_camera(display):
+    # arrange
+    map_renderer = ChunkedMapRenderer(TiledMap("tiled-level-01.tmx"))
+    dirty_renderer = DirtyRectRenderer(map_renderer)
+    raw_display = pygame.Surface((300, 200))
+    offset = (-60, -250)
+
+    moving_sprite, still_sprite = Sprite(), Sprite()
+    image = pygame.Surface((16, 16))
+    image.fill((255, 0, 0))
+
+    # act
+    full_redraw = dirty_renderer.render_on(
+        raw_display,
+        offset,
+        [(moving_sprite, image, (10, 10)), (still_sprite, image, (100, 100))],
+    )
+    dirty_rects = dirty_renderer.render_on(
+        raw_display,
+        offset,
+        [(moving_sprite, image, (14, 10)), (still_sprite, image, (100, 100))],
+    )
+
+    # assert - only the moved sprite is redrawn and the result is the same as a full redraw
+    expected_display = pygame.Surface((300, 200))
+    DirtyRectRenderer(map_renderer).render_on(
+        expected_display,
+        offset,
+        [(moving_sprite, image, (14, 10)), (still_sprite, image, (100, 100))],
+    )
+
+    assert full_redraw is None
+    assert dirty_rects == [Rect(10, 10, 20, 16)]
+    assert pygame.image.tobytes(raw_display, "RGB") == pygame.image.tobytes(expected_display, "RGB")
+
+
+def test_should_present_raw_display_into_screen():
+    # arrange
+    raw_display = pygame.Surface((30, 20))
+    raw_display.fill((10, 20, 30))
+    raw_display.fill((200, 100, 50), Rect(5, 5, 10, 4))
+
+    for scaler in ["nearest", "scale2x", "smooth"]:
+        screen = pygame.Surface((60, 40))
+        presenter = Presenter(screen, raw_display.get_size(), scaler)
+
+        # act
+        presenter.present(raw_display)
+
+        # assert
+        assert presenter.scaler == scaler
+        assert screen.get_at((0, 0)) == (10, 20, 30, 255)
+        assert screen.get_at((14, 12)) == (200, 100, 50, 255)
+
+
+def test_should_present_only_rects_and_fall_back_from_scale2x():
+    # arrange
+    raw_display = pygame.Surface((30, 20))
+    raw_display.fill((200, 100, 50))
+    screen = pygame.Surface((90, 60))
+    presenter = Presenter(screen, raw_display.get_size(), "scale2x")  # 3x screen: no scale2x
+
+    # act
+    screen_rects = presenter.present_rects(raw_display, [Rect(5, 5, 10, 4)])
+
+    # assert
+    assert presenter.scaler == "nearest"
+    assert screen_rects == [Rect(15, 15, 30, 12)]
+    assert screen.get_at((15, 15)) == (200, 100, 50, 255)
+    assert screen.get_at((14, 15)) == (0, 0, 0, 255)
+
+
+def test_should_redraw_invalidated_map_rects(display):
+    # arrange
+    map_renderer = ChunkedMapRenderer(TiledMap("tiled-level-01.tmx"))
+    dirty_renderer = DirtyRectRenderer(map_renderer)
+    raw_display = pygame.Surface((300, 200))
+    offset = (-60, -250)
+    dirty_renderer.render_on(raw_display, offset, [])
+    raw_display.fill((255, 0, 0), Rect(0, 0, 50, 50))  # stale region
+
+    # act
+    dirty_renderer.invalidate_map_rects([Rect(60, 250, 50, 50), Rect(1000, 1000, 16, 16)])
+    dirty_rects = dirty_renderer.render_on(raw_display, offset, [])
+    no_dirty_rects = dirty_renderer.render_on(raw_display, offset, [])
+
+    # assert - only the visible invalidated rect is redrawn and only once
+    expected_display = pygame.Surface((300, 200))
+    DirtyRectRenderer(map_renderer).render_on(expected_display, offset, [])
+
+    assert dirty_rects == [Rect(0, 0, 50, 50)]
+    assert no_dirty_rects == []
+    assert pygame.image.tobytes(raw_display, "RGB") == pygame.image.tobytes(expected_display, "RGB")
+
+
+def test_should_measure_dirty_rendering_as_map_and_sprite_blits(display):
+    # arrange
+    timings = FrameTimings()
+    dirty_renderer = DirtyRectRenderer(ChunkedMapRenderer(TiledMap("tiled-level-01.tmx")), phase=timings.phase)
+    raw_display = pygame.Surface((300, 200))
+    sprite, image = Sprite(), pygame.Surface((16, 16))
+
+    # act - a full redraw and a dirty one
+    dirty_renderer.render_on(raw_display, (-60, -250), [(sprite, image, (10, 10))])
+    dirty_renderer.render_on(raw_display, (-60, -250), [(sprite, image, (14, 10))])
+    timings.end_frame()
+
+    # assert
+    assert all(timings.percentiles(phase)[0] > 0 for phase in ("map blit", "sprite blits", "dirty rects"))
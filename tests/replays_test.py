@@ -0,0 +1,71 @@
+"""
+Module with play session recording and replaying tests.
+"""
+import pytest
+
+from src.__main__ import main
+from src.inputs import CapturedInput
+from src.replays import RECORDING_FRAME
+from src.replays import RECORDING_HEADER
+from src.replays import InputRecorder
+from src.replays import Replay
+from src.replays import pack_input
+from src.replays import unpack_input
+
+
+def test_should_pack_inputs_into_bits():
+    # arrange
+    captured_input = CapturedInput(moving_right=True, has_jumped=True)
+
+    # act
+    bits = pack_input(captured_input)
+
+    # assert
+    assert bits < 256
+    assert unpack_input(bits) == captured_input
+
+
+def test_should_replay_recorded_session_without_drift(tmp_path):
+    # arrange
+    recording_path = tmp_path.joinpath("session.rec")
+    recorder = InputRecorder(recording_path)
+    main(headless=True, frames=150, recorder=recorder)
+
+    # act
+    replay = Replay(recording_path)
+    timings = main(headless=True, replay=replay)
+
+    # assert - one compact record per frame
+    assert recorder.frames == 150
+    assert recording_path.stat().st_size == RECORDING_HEADER.size + 150 * RECORDING_FRAME.size
+    assert timings.frames == 150
+    assert replay.drift_frame is None
+
+
+def test_should_detect_drift_of_altered_session(tmp_path):
+    # arrange - the recorded player runs right, but the replay makes it turn left on the 10th frame
+    recording_path = tmp_path.joinpath("session.rec")
+    main(headless=True, frames=60, recorder=InputRecorder(recording_path))
+
+    recording = bytearray(recording_path.read_bytes())
+    recording[RECORDING_HEADER.size + 10 * RECORDING_FRAME.size] = pack_input(
+        CapturedInput(moving_right_stop=True, moving_left=True)
+    )
+    recording_path.write_bytes(recording)
+    replay = Replay(recording_path)
+
+    # act
+    main(headless=True, replay=replay)
+
+    # assert
+    assert replay.drift_frame is not None and replay.drift_frame >= 10
+
+
+def test_should_reject_recording_of_other_tick_rate(tmp_path):
+    # arrange
+    recording_path = tmp_path.joinpath("session.rec")
+    InputRecorder(recording_path, tick_rate=30).close()
+
+    # act / assert
+    with pytest.raises(ValueError):
+        Replay(recording_path)
@@ -0,0 +1,31 @@
+"""
+Module with fixed timestep tests.
+"""
+import pytest
+
+from src.timestep import FixedTimestep
+
+
+def test_should_run_steps_and_keep_remaining_time():
+    # arrange
+    timestep = FixedTimestep(tick_rate=100, max_steps=5)
+
+    # act
+    steps = [timestep.advance(frame_time) for frame_time in [0.025, 0.004, 0.011]]
+
+    # assert - 25 ms: 2 steps (5 left), 9 ms: 0 steps, 20 ms: 2 steps
+    assert steps == [2, 0, 2]
+    assert timestep.alpha == pytest.approx(0)
+
+
+def test_should_drop_time_beyond_max_steps():
+    # arrange
+    timestep = FixedTimestep(tick_rate=100, max_steps=3)
+
+    # act
+    steps = timestep.advance(1)
+
+    # assert
+    assert steps == 3
+    assert timestep.alpha < 1
+    assert timestep.advance(0) == 0